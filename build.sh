@@ -7,6 +7,9 @@ pip install -r requirements.txt
 
 cd todo_project || exit 1
 
+# Vendor, trim and minify the CSS bundle linked by base.html
+python manage.py build_assets
+
 # Convert static asset files
 python manage.py collectstatic --no-input
 
@@ -0,0 +1,139 @@
+"""
+Async variants of the sign-in and sign-up views for ASGI deployments.
+
+Checking a password on sign-in and hashing it on sign-up are the most expensive
+steps of any request in the application. These views run them (together with the
+ORM work around them) on the bounded hashing pool of `hashing.py`, so the event
+loop keeps serving todo requests during a burst of logins, and answer
+`503 Service Unavailable` with `Retry-After` when the pool's queue is full.
+
+`urls.py` routes to these views instead of the sync ones when
+`settings.TODO_ASYNC_VIEWS` is enabled.
+"""
+
+import asyncio
+
+from django.contrib import messages
+from django.contrib.auth import alogin
+from django.contrib.auth.views import LoginView
+from django.http import HttpResponseRedirect
+from django.shortcuts import redirect, render
+from django.utils.cache import add_never_cache_headers
+from django.views import View
+
+from .hashing import HashingBusy, run_hashing
+from .views import RegisterView
+
+
+class HashingBackpressureMixin:
+    """
+    Turns a full hashing queue into a `503` response asking the client to retry.
+
+    Attributes:
+        busy_message (str): The error message shown on the re-rendered form.
+        retry_after (int): The `Retry-After` delay in seconds.
+    """
+
+    busy_message = "Too many requests at the moment, please try again in a few seconds."
+    retry_after = 1
+
+    def busy(self, response):
+        response.status_code = 503
+        response["Retry-After"] = str(self.retry_after)
+        return response
+
+
+class AsyncLoginView(HashingBackpressureMixin, LoginView):
+    """
+    Async variant of `LoginView` that checks the credentials on the hashing pool.
+
+    `LoginView.dispatch` is wrapped in sync-only decorators, so `dispatch` applies
+    their effects itself: POST parameters are marked sensitive for error reports
+    and the response is marked uncacheable. The CSRF check is done by
+    `CsrfViewMiddleware`.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.sensitive_post_parameters = "__ALL__"
+        request.user = await request.auser()
+        if self.redirect_authenticated_user and request.user.is_authenticated:
+            redirect_to = self.get_success_url()
+            if redirect_to == request.path:
+                raise ValueError(
+                    "Redirection loop for authenticated user detected. Check that "
+                    "your LOGIN_REDIRECT_URL doesn't point to a login page."
+                )
+            return HttpResponseRedirect(redirect_to)
+        response = await View.dispatch(self, request, *args, **kwargs)
+        add_never_cache_headers(response)
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form()
+        try:
+            # `is_valid()` authenticates: it loads the user and checks the password.
+            valid = await run_hashing(form.is_valid)
+        except HashingBusy:
+            messages.error(request, self.busy_message)
+            form = self.get_form_class()(
+                request, initial={"username": request.POST.get("username", "")}
+            )
+            return self.busy(self.render_to_response(self.get_context_data(form=form)))
+        if not valid:
+            return self.form_invalid(form)
+        await alogin(request, form.get_user())
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def put(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
+
+
+class AsyncRegisterView(HashingBackpressureMixin, RegisterView):
+    """
+    Async variant of `RegisterView` that validates and saves the form on the
+    hashing pool (`save()` hashes the password).
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        response = super().dispatch(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    async def get(self, request):
+        return render(request, self.template_name, {"form": self.from_class})
+
+    async def post(self, request):
+        form = self.from_class(request.POST)
+        try:
+            created = await run_hashing(self.register, form)
+        except HashingBusy:
+            messages.error(request, self.busy_message)
+            form = self.from_class(
+                initial={
+                    name: request.POST.get(name, "") for name in ("username", "email")
+                }
+            )
+            return self.busy(render(request, self.template_name, {"form": form}))
+        if not created:
+            return render(request, self.template_name, {"form": form})
+        username = form.cleaned_data.get("username")
+        messages.success(request, f"Success! Account created for {username}!")
+        return redirect(to="app_auth:signin")
+
+    @staticmethod
+    def register(form):
+        """
+        Validates the registration form and creates the user if it is valid.
+
+        Returns:
+            bool: True if the user was created.
+        """
+        if not form.is_valid():
+            return False
+        form.save()
+        return True
@@ -1,10 +1,14 @@
 from django.forms import (
     CharField,
+    Form,
+    IntegerField,
     TextInput,
     EmailInput,
     EmailField,
     PasswordInput,
 )
+from django.contrib.auth import password_validation
+from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 
 from .models import CustomUser
@@ -92,3 +96,55 @@ class LoginForm(AuthenticationForm):
     class Meta:
         model = CustomUser
         fields = ("username", "password")
+
+
+class ProvisionUserForm(Form):
+    """
+    Validates one user record of a bulk provisioning file (see `provision_users`).
+
+    The username and email follow the same rules as `RegisterForm`, so provisioned
+    users can sign in with `LoginForm`, and a given password has to pass the
+    `AUTH_PASSWORD_VALIDATORS` like on registration. Uniqueness is not checked here:
+    the provisioning checks a whole batch against the database with one query.
+
+    Attributes:
+        username (CharField): Required, 3 to 16 characters.
+        email (EmailField): Required, at most 30 characters.
+        password (CharField): Optional; without one the account gets an unusable
+                              password.
+        first_name (CharField): Optional.
+        last_name (CharField): Optional.
+        cards_per_page (IntegerField): Optional page size of the todo list, stored
+                                       in the user's `UserSettings`.
+
+    Example:
+        form = ProvisionUserForm(data={"username": "alice", "email": "alice@example.com"})
+        form.is_valid()  # True
+    """
+
+    username = CharField(max_length=16, min_length=3)
+    email = EmailField(max_length=30)
+    password = CharField(required=False, strip=False)
+    first_name = CharField(max_length=150, required=False)
+    last_name = CharField(max_length=150, required=False)
+    cards_per_page = IntegerField(min_value=1, required=False)
+
+    def clean_username(self):
+        username = self.cleaned_data["username"]
+        CustomUser.username_validator(username)
+        return username
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("password") and "username" in cleaned_data:
+            user = CustomUser(
+                **{
+                    name: cleaned_data.get(name, "")
+                    for name in ("username", "email", "first_name", "last_name")
+                }
+            )
+            try:
+                password_validation.validate_password(cleaned_data["password"], user)
+            except ValidationError as error:
+                self.add_error("password", error)
+        return cleaned_data
@@ -0,0 +1,74 @@
+"""
+A bounded thread pool for the password hashing of the async sign-in and sign-up views.
+
+Checking or setting a password runs the configured hasher (PBKDF2 by default), which
+costs hundreds of milliseconds of CPU by design. Run inline in an async view it
+blocks the event loop, and with one thread per request a burst of logins occupies
+every core, so unrelated todo requests queue behind the hashing.
+
+`run_hashing` runs such work on a fixed number of worker threads
+(`TODO_AUTH_HASHING_WORKERS`). The hashers release the GIL while hashing, so the
+threads hash in parallel and the event loop keeps serving other requests. At most
+`TODO_AUTH_HASHING_QUEUE` further calls may wait for a worker; beyond that the
+call fails right away with `HashingBusy` and the view answers `503` with
+`Retry-After`, instead of letting the backlog (and its latency) grow without bound.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.TODO_AUTH_HASHING_WORKERS,
+    thread_name_prefix="auth-hashing",
+)
+_slots = threading.BoundedSemaphore(
+    settings.TODO_AUTH_HASHING_WORKERS + settings.TODO_AUTH_HASHING_QUEUE
+)
+
+
+class HashingBusy(Exception):
+    """
+    Raised by `run_hashing` when every worker is busy and the queue is full.
+    """
+
+
+def _call(func, *args, **kwargs):
+    # The workers outlive requests, so they manage their database connections the
+    # way the request handler does: drop unusable or expired ones around each call.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_hashing(func, *args, **kwargs):
+    """
+    Runs `func(*args, **kwargs)` on the hashing pool and returns its result.
+
+    `func` may use the ORM (e.g. `authenticate()` looks the user up before checking
+    the password); it runs in a worker thread, outside the event loop.
+
+    Args:
+        func (callable): The sync function doing the hashing.
+        *args: Positional arguments for `func`.
+        **kwargs: Keyword arguments for `func`.
+
+    Returns:
+        The return value of `func`.
+
+    Raises:
+        HashingBusy: If `TODO_AUTH_HASHING_QUEUE` calls are already waiting.
+    """
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy
+    future = _executor.submit(partial(_call, func, *args, **kwargs))
+    # The slot is freed when the work is done, not when the awaiting request is,
+    # so requests cancelled by disconnecting clients cannot overfill the pool.
+    future.add_done_callback(lambda _: _slots.release())
+    return await asyncio.wrap_future(future)
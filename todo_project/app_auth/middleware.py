@@ -0,0 +1,134 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from todo_app.repository import (
+    attach_user_settings,
+    get_user_settings,
+    user_settings_snapshot,
+)
+
+
+def user_cache_key(user_id):
+    """
+    Returns the cache key under which the snapshot of a user is stored.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"auth:user:{user_id}"
+
+
+def user_snapshot(user):
+    """
+    Returns a picklable snapshot of a user and their settings.
+
+    The password hash is left out; the snapshot keeps the session auth hash derived
+    from it instead, which is all that is needed to verify a session.
+
+    Args:
+        user (User): The authenticated user.
+
+    Returns:
+        dict: The user's field values, session auth hash and `UserSettings` values.
+    """
+    return {
+        "fields": {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname != "password"
+        },
+        "session_hash": user.get_session_auth_hash(),
+        "settings": user_settings_snapshot(get_user_settings(user)),
+    }
+
+
+def get_cached_user(request):
+    """
+    Returns the user of the request's session, from the cache when possible.
+
+    The snapshot is keyed by the user id stored in the session and is only used if
+    the session's auth hash matches the one in the snapshot, so a password change
+    still ends the other sessions of the user. Anything else (no user in the
+    session, a cache miss, a hash mismatch, e.g. after rotating `SECRET_KEY`) goes
+    through `django.contrib.auth.get_user()`, which verifies the session and
+    flushes it if needed, and a successfully loaded user is cached again.
+
+    The returned user carries its `UserSettings`, so `get_user_settings()` needs no
+    further lookups. Its password is deferred and loaded only if accessed.
+
+    Args:
+        request (HttpRequest): The request, with its session loaded.
+
+    Returns:
+        User | AnonymousUser: The user of the session.
+    """
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+    if user_id is None or session.get(BACKEND_SESSION_KEY) not in (
+        settings.AUTHENTICATION_BACKENDS
+    ):
+        return auth.get_user(request)
+    user_model = auth.get_user_model()
+    key = user_cache_key(user_model._meta.pk.to_python(user_id))
+    snapshot = cache.get(key)
+    if snapshot is not None and constant_time_compare(
+        session.get(HASH_SESSION_KEY) or "", snapshot["session_hash"]
+    ):
+        fields = snapshot["fields"]
+        user = user_model.from_db(None, list(fields), list(fields.values()))
+        attach_user_settings(user, snapshot["settings"])
+        return user
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user_snapshot(user), settings.TODO_USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = get_cached_user(request)
+    return request._cached_user
+
+
+async def auser(request):
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await sync_to_async(get_cached_user)(request)
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    `AuthenticationMiddleware` that loads `request.user` from a cached snapshot.
+
+    The stock middleware reads the user row on every authenticated request, and the
+    todo views then read the user's `UserSettings` as well. This middleware serves
+    both from one cache entry (see `get_cached_user`), which the `post_save` and
+    `post_delete` signals of the user and `UserSettings` models delete (see
+    `todo_app/signals.py`). `TODO_USER_CACHE_TIMEOUT` bounds how long a change made
+    without signals (e.g. `QuerySet.update()`) can go unnoticed.
+
+    The signals only reach the other worker processes through a shared cache, so
+    without `TODO_SHARED_CACHE` the middleware behaves like the stock one: a worker
+    would otherwise keep serving a deactivated or demoted user from its own cache.
+
+    Like the stock middleware, the user is loaded lazily, and `request.auser()`
+    loads it for async views.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        if not settings.TODO_SHARED_CACHE:
+            return
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(auser, request)
@@ -1,3 +1,114 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import hashing
+from .async_views import AsyncLoginView, AsyncRegisterView
+from .forms import LoginForm
+
+
+class CachedAuthenticationMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="alice", email="alice@example.com", password="password"
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("main")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        table = get_user_model()._meta.db_table
+        return [
+            q["sql"] for q in queries.captured_queries if f'FROM "{table}"' in q["sql"]
+        ]
+
+    def test_user_is_cached(self):
+        self.assertNotEqual(self.user_queries(), [])
+        self.assertEqual(self.user_queries(), [])
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    @override_settings(TODO_SHARED_CACHE=False)
+    def test_user_is_loaded_unless_the_cache_is_shared(self):
+        self.user_queries()
+        self.assertNotEqual(self.user_queries(), [])
+        # Another worker's change, which this worker's cache would not see.
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class HashingBackpressureTests(TestCase):
+    """
+    The async sign-in and sign-up views with every hashing worker busy and the
+    queue full.
+    """
+
+    def setUp(self):
+        slots = mock.patch.object(hashing._slots, "acquire", return_value=False)
+        self.addCleanup(slots.stop)
+        slots.start()
+        submit = mock.patch.object(hashing._executor, "submit")
+        self.addCleanup(submit.stop)
+        self.submit = submit.start()
+
+    def post(self, view, url, data):
+        self.request = request = AsyncRequestFactory().post(url, data)
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+
+        async def auser():
+            return AnonymousUser()
+
+        request.auser = auser
+        response = async_to_sync(view)(request)
+        self.submit.assert_not_called()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertContains(
+            response, "please try again in a few seconds", status_code=503
+        )
+        return response
+
+    def test_signup(self):
+        response = self.post(
+            AsyncRegisterView.as_view(),
+            reverse("app_auth:signup"),
+            {
+                "username": "alice",
+                "email": "alice@example.com",
+                "password1": "a-long-password",
+                "password2": "a-long-password",
+            },
+        )
+        self.assertContains(response, 'value="alice"', status_code=503)
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_signin(self):
+        get_user_model().objects.create_user(
+            username="alice", email="alice@example.com", password="password"
+        )
+        view = AsyncLoginView.as_view(
+            template_name="app_auth/login.html", form_class=LoginForm
+        )
+        response = self.post(
+            view,
+            reverse("app_auth:signin"),
+            {"username": "alice", "password": "password"},
+        )
+        self.assertContains(response, 'value="alice"', status_code=503)
+        self.assertNotIn("_auth_user_id", self.request.session)
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from django.contrib.auth.views import LoginView, LogoutView
 from . import views
+from .async_views import AsyncLoginView, AsyncRegisterView
 from .forms import LoginForm
 
 app_name = "app_auth"
@@ -33,12 +35,21 @@ or views.
     - Purpose: Logs out the user and redirects them to the logout confirmation page.
 
 Each URL pattern is named, allowing for easy reference using `reverse()` or in template tags.
+
+When `settings.TODO_ASYNC_VIEWS` is enabled (ASGI deployments), signup and signin are
+served by the async variants from `async_views.py`, which hash passwords on a
+bounded thread pool.
 """
+if settings.TODO_ASYNC_VIEWS:
+    register_view, login_view = AsyncRegisterView, AsyncLoginView
+else:
+    register_view, login_view = views.RegisterView, LoginView
+
 urlpatterns = [
-    path("signup/", views.RegisterView.as_view(), name="signup"),  # app_auth:signup
+    path("signup/", register_view.as_view(), name="signup"),  # app_auth:signup
     path(
         "signin/",
-        LoginView.as_view(
+        login_view.as_view(
             template_name="app_auth/login.html",
             form_class=LoginForm,
             redirect_authenticated_user=True,
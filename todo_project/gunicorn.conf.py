@@ -0,0 +1,31 @@
+"""
+gunicorn settings, read automatically when gunicorn is started from this directory.
+
+The workers share their Prometheus metrics (see `todo_app/metrics.py`) through
+files in `PROMETHEUS_MULTIPROC_DIR`, which defaults to `<tmp>/todo_metrics`. The
+variable is set here, in the master, so every worker has it before it imports
+`prometheus_client`.
+"""
+
+import glob
+import os
+import tempfile
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "todo_metrics")
+)
+
+
+def on_starting(server):
+    # The counters of a previous run must not be added to this one's.
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(path, exist_ok=True)
+    for name in glob.glob(os.path.join(path, "*.db")):
+        os.remove(name)
+
+
+def child_exit(server, worker):
+    # Drops the in-flight gauge of a worker that exited; its counters stay.
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,32 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from .api_views import TodoViewSet
+
+app_name = "api-v1"
+
+router = DefaultRouter()
+router.register("todos", TodoViewSet, basename="todo")
+
+"""
+URL patterns for version 1 of the JSON API.
+
+1. **token**:
+    - Path: "/api/v1/token/"
+    - View: `TokenObtainPairView.as_view()`
+    - Purpose: Exchanges a username and password for a JWT access/refresh pair.
+2. **token_refresh**:
+    - Path: "/api/v1/token/refresh/"
+    - View: `TokenRefreshView.as_view()`
+    - Purpose: Exchanges a refresh token for a new access token.
+3. **todos**:
+    - Path: "/api/v1/todos/", "/api/v1/todos/<pk>/", "/api/v1/todos/bulk/"
+    - View: `TodoViewSet`
+    - Purpose: Lists, creates, updates and deletes the user's Todo items, one at a time or in bulk.
+"""
+urlpatterns = [
+    path("token/", TokenObtainPairView.as_view(), name="token"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("", include(router.urls)),
+]
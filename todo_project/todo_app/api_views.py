@@ -0,0 +1,173 @@
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Todo
+from .pagination import KeysetPaginator
+from .repository import create_todos, delete_todos, update_todos
+from .serializers import TodoBulkUpdateSerializer, TodoIdsSerializer, TodoSerializer
+
+
+class TodoCursorPagination(BasePagination):
+    """
+    Cursor pagination for the API, backed by the same `KeysetPaginator` as the
+    HTML list, so every page is a `(published, id)` range scan without a count.
+
+    Attributes:
+        page_size (int): The default number of items per page.
+        max_page_size (int): The upper limit for the `page_size` query parameter.
+        cursor_query_param (str): The name of the cursor query parameter.
+        page_size_query_param (str): The name of the page size query parameter.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(
+            queryset, self.get_page_size(request), with_count=False
+        )
+        try:
+            self.page = paginator.page(
+                request.query_params.get(self.cursor_query_param)
+            )
+        except InvalidPage as e:
+            raise NotFound(str(e))
+        return list(self.page)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+                "results": data,
+            }
+        )
+
+
+class TodoViewSet(viewsets.ModelViewSet):
+    """
+    A JSON API for the Todo items of the authenticated user.
+
+    Besides the usual list/create/retrieve/update/destroy endpoints, `bulk/`
+    creates (POST), patches (PATCH) or deletes (DELETE) up to
+    `settings.TODO_API_BULK_LIMIT` Todo items in one request and one transaction,
+    using `bulk_create`, `bulk_update` and a single DELETE.
+
+    Attributes:
+        serializer_class (Serializer): The serializer for Todo items (`TodoSerializer`).
+        pagination_class (BasePagination): Keyset cursor pagination (`TodoCursorPagination`).
+        permission_classes (list): Only authenticated users may use the API.
+
+    Methods:
+        get_queryset(): Returns the user's Todo items (as `values()` rows when listing).
+        perform_create(serializer): Assigns the new Todo item to the current user.
+        bulk(request): Dispatches bulk create, update and delete requests.
+
+    Example:
+        POST /api/v1/todos/bulk/   [{"title": "A", "description": "B"}, ...]
+        PATCH /api/v1/todos/bulk/  [{"id": 1, "completed": true}, ...]
+        DELETE /api/v1/todos/bulk/ {"ids": [1, 2, 3]}
+    """
+
+    serializer_class = TodoSerializer
+    pagination_class = TodoCursorPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Todo.objects.for_user(self.request.user)
+        if self.action == "list":
+            # Serializing plain rows skips model instantiation for every item.
+            return queryset.values(*TodoSerializer.Meta.fields)
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def check_bulk_size(self, items):
+        """
+        Rejects bulk payloads above `settings.TODO_API_BULK_LIMIT` before validating them.
+        """
+        if isinstance(items, list) and len(items) > settings.TODO_API_BULK_LIMIT:
+            raise ValidationError(
+                f"At most {settings.TODO_API_BULK_LIMIT} items per request."
+            )
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request):
+        """
+        Creates, updates or deletes many Todo items in one request.
+        """
+        if request.method == "POST":
+            return self.bulk_create(request)
+        if request.method == "PATCH":
+            return self.bulk_update(request)
+        return self.bulk_destroy(request)
+
+    def bulk_create(self, request):
+        self.check_bulk_size(request.data)
+        serializer = TodoSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        todos = create_todos(
+            [Todo(user=request.user, **item) for item in serializer.validated_data]
+        )
+        return Response(
+            TodoSerializer(todos, many=True).data, status=status.HTTP_201_CREATED
+        )
+
+    def bulk_update(self, request):
+        self.check_bulk_size(request.data)
+        serializer = TodoBulkUpdateSerializer(
+            data=request.data, many=True, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+        ids = [item["id"] for item in items]
+        with transaction.atomic():
+            todos = Todo.objects.for_user(request.user).in_bulk(ids)
+            missing = sorted(set(ids) - set(todos))
+            if missing:
+                raise NotFound(f"Unknown todo ids: {missing}")
+            fields = set()
+            for item in items:
+                todo = todos[item["id"]]
+                for name, value in item.items():
+                    if name != "id":
+                        setattr(todo, name, value)
+                        fields.add(name)
+            if fields:
+                update_todos(list(todos.values()), fields)
+        return Response(TodoSerializer([todos[i] for i in ids], many=True).data)
+
+    def bulk_destroy(self, request):
+        if isinstance(request.data, dict):
+            self.check_bulk_size(request.data.get("ids"))
+        serializer = TodoIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        deleted = delete_todos(request.user, ids)
+        return Response({"deleted": deleted})
@@ -0,0 +1,332 @@
+"""
+Builds the self-hosted CSS bundle that replaces the Bootstrap and Font Awesome CDNs.
+
+`python manage.py build_assets` downloads pinned releases of Bootstrap's CSS and
+Font Awesome's CSS plus its solid webfont, drops every rule whose classes the
+templates never use, appends `todo_app/css/main.css`, minifies the result and
+writes it to `static/bundle/`. `collectstatic` then fingerprints the bundle and
+the font (`CompressedManifestStaticFilesStorage`) and pre-compresses them with
+gzip and Brotli, and WhiteNoise serves the fingerprinted files as immutable.
+
+`base.html` links the bundle when it has been built and falls back to the CDNs
+otherwise (e.g. in a fresh checkout).
+"""
+
+import base64
+import hashlib
+import re
+import urllib.request
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+BUNDLE_CSS = "bundle/app.css"
+# The webfonts referenced by the bundle, by file stem, relative to `BUNDLE_CSS`.
+BUNDLE_FONTS = {"fa-solid-900": "webfonts/fa-solid-900.woff2"}
+# At-rules whose blocks contain rules, trimmed recursively.
+NESTED_AT_RULES = ("@media", "@supports", "@layer", "@container")
+
+CLASS_ATTRIBUTE = re.compile(r"""class(?:\s*=\s*|["']\s*:\s*)(["'])(.*?)\1""", re.S)
+CLASS_NAME = re.compile(r"[A-Za-z_-][\w-]*")
+# A class completed by a template variable, e.g. `alert-{{ message.tags }}`.
+CLASS_PREFIX = re.compile(r"([A-Za-z_-][\w-]*-)\{\{")
+SELECTOR_CLASS = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+# Arguments of functional pseudo-classes (`:not(.disabled)`) and attribute
+# selectors do not have to match for the rule to apply.
+SELECTOR_IGNORED = re.compile(
+    r":(?:not|is|where|has)\((?:[^()]|\([^()]*\))*\)|\[[^\]]*\]"
+)
+CSS_TOKEN = re.compile(r"""(/\*.*?\*/)|("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", re.S)
+
+
+class AssetError(Exception):
+    """
+    Raised when a vendored asset cannot be downloaded or fails its integrity check.
+    """
+
+
+@dataclass(frozen=True)
+class VendorAsset:
+    """
+    A pinned third-party file.
+
+    Attributes:
+        url (str): The versioned CDN URL.
+        integrity (str): The expected Subresource Integrity hash (`sha384-...`),
+                         or `""` if the release publishes none.
+    """
+
+    url: str
+    integrity: str = ""
+
+    @property
+    def name(self):
+        return self.url.rsplit("/", 1)[-1]
+
+
+BOOTSTRAP_CSS = VendorAsset(
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css",
+    "sha384-QWTKZyjpPEjISv5WaRU9OFeRpok6YctnYmDr5pNlyT2bRjXh0JMhjY6hW+ALEwIH",
+)
+FONTAWESOME_CSS = VendorAsset(
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css"
+)
+FONTAWESOME_SOLID_FONT = VendorAsset(
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/webfonts/"
+    "fa-solid-900.woff2"
+)
+
+
+def sri_hash(content):
+    """
+    Returns the `sha384-...` Subresource Integrity hash of `content` (bytes).
+    """
+    digest = hashlib.sha384(content).digest()
+    return "sha384-" + base64.b64encode(digest).decode()
+
+
+def fetch(asset, timeout=30):
+    """
+    Downloads a vendored asset and checks it against its pinned integrity hash.
+
+    Args:
+        asset (VendorAsset): The asset to download.
+        timeout (float): The timeout in seconds.
+
+    Returns:
+        bytes: The file content.
+
+    Raises:
+        AssetError: If the download fails or the content does not match.
+    """
+    try:
+        with urllib.request.urlopen(asset.url, timeout=timeout) as response:
+            content = response.read()
+    except OSError as e:
+        raise AssetError(f"Could not download {asset.url}: {e}") from e
+    if asset.integrity and sri_hash(content) != asset.integrity:
+        raise AssetError(f"{asset.url} does not match {asset.integrity}.")
+    return content
+
+
+def used_classes(root=None):
+    """
+    Collects the CSS classes used by the project's templates and Python code.
+
+    Class attributes of every `.html` file and `"class": "..."` widget attributes
+    of every `.py` file below `root` are scanned; `STATIC_ROOT` is skipped.
+
+    Args:
+        root (Path): The directory to scan, defaults to `settings.BASE_DIR`.
+
+    Returns:
+        tuple: `(classes, prefixes)`, the set of class names and the set of class
+               prefixes completed by template variables (e.g. `"alert-"`).
+    """
+    root = Path(root or settings.BASE_DIR)
+    static_root = Path(settings.STATIC_ROOT)
+    classes, prefixes = set(), set()
+    for path in [*root.rglob("*.html"), *root.rglob("*.py")]:
+        if static_root in path.parents:
+            continue
+        for _, value in CLASS_ATTRIBUTE.findall(path.read_text(encoding="utf-8")):
+            classes.update(CLASS_NAME.findall(value))
+            prefixes.update(CLASS_PREFIX.findall(value))
+    return classes, prefixes
+
+
+def _skip_string(text, start):
+    quote, i = text[start], start + 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == "\\" else 1
+    return i + 1
+
+
+def _scan(text, start, stops):
+    # Returns the index of the first character in `stops` at brace depth 0,
+    # skipping strings and comments.
+    depth, i = 0, start
+    while i < len(text):
+        char = text[i]
+        if char in "\"'":
+            i = _skip_string(text, i)
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        if depth == 0 and char in stops:
+            return i
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        i += 1
+    return len(text)
+
+
+def parse_css(text):
+    """
+    Parses a stylesheet into a list of nodes.
+
+    Nodes are tuples: `("comment", text)` for preserved `/*! ... */` comments
+    (licenses), `("statement", prelude)` for at-rules without a block (`@import`,
+    `@charset`), `("block", prelude, nodes)` for `NESTED_AT_RULES`, and
+    `("rule", prelude, declarations)` for everything else (style rules,
+    `@font-face`, `@keyframes`, ...). Other comments are dropped.
+    """
+    nodes, i = [], 0
+    while i < len(text):
+        if text[i].isspace():
+            i += 1
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            end = len(text) if end < 0 else end + 2
+            if text.startswith("/*!", i):
+                nodes.append(("comment", text[i:end]))
+            i = end
+            continue
+        brace = _scan(text, i, "{;")
+        prelude = text[i:brace].strip()
+        if brace >= len(text) or text[brace] == ";":
+            if prelude:
+                nodes.append(("statement", prelude))
+            i = brace + 1
+            continue
+        end = brace + 1 + _scan(text[brace + 1 :], 0, "}")
+        body = text[brace + 1 : end]
+        if prelude.startswith(NESTED_AT_RULES):
+            nodes.append(("block", prelude, parse_css(body)))
+        else:
+            nodes.append(("rule", prelude, body))
+        i = end + 1
+    return nodes
+
+
+def _split_selectors(prelude):
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return selectors
+
+
+def trim_css(nodes, classes, prefixes=(), fonts=None):
+    """
+    Drops the style rules that cannot match the project's markup.
+
+    A selector is kept if every class it requires is in `classes` or starts with
+    one of `prefixes`; selectors without classes (`body`, `:root`, ...) are always
+    kept. A rule is kept with its remaining selectors, at-rule blocks are trimmed
+    recursively and dropped when empty.
+
+    `@font-face` rules are kept only if all their files are in `fonts` (file stem
+    to bundled path); their `src` is rewritten to the bundled WOFF2 file, which
+    every supported browser reads.
+
+    Args:
+        nodes (list): Nodes from `parse_css`.
+        classes (set): The used class names.
+        prefixes (Iterable): Class prefixes completed at render time.
+        fonts (dict): The bundled fonts, e.g. `BUNDLE_FONTS`.
+
+    Returns:
+        list: The trimmed nodes.
+    """
+    prefixes = tuple(prefixes)
+    fonts = fonts or {}
+
+    def is_used(name):
+        return name in classes or name.startswith(prefixes)
+
+    trimmed = []
+    for node in nodes:
+        if node[0] == "block":
+            children = trim_css(node[2], classes, prefixes, fonts)
+            if children:
+                trimmed.append(("block", node[1], children))
+        elif node[0] != "rule":
+            trimmed.append(node)
+        elif node[1].startswith("@font-face"):
+            files = re.findall(r"url\(\s*['\"]?([^'\")]+)", node[2])
+            stems = {Path(file.split("?")[0]).stem for file in files}
+            if files and len(stems) == 1 and stems <= set(fonts):
+                source = f'src:url({fonts[stems.pop()]}) format("woff2")'
+                body = re.sub(r"src\s*:[^;]*", source, node[2], count=1)
+                trimmed.append(("rule", node[1], body))
+        elif node[1].startswith("@"):
+            trimmed.append(node)
+        else:
+            selectors = [
+                selector
+                for selector in _split_selectors(node[1])
+                if all(
+                    is_used(name)
+                    for name in SELECTOR_CLASS.findall(
+                        SELECTOR_IGNORED.sub("", selector)
+                    )
+                )
+            ]
+            if selectors:
+                trimmed.append(("rule", ",".join(selectors), node[2]))
+    return trimmed
+
+
+def minify(text):
+    """
+    Removes comments and insignificant whitespace from a piece of CSS.
+
+    Strings are left untouched; whitespace is only removed around `{`, `}`, `;`
+    and `,` and after `:`, where it never matters (unlike around `+` in `calc()`
+    or before `:` in selectors).
+    """
+    parts, last = [], 0
+    for match in CSS_TOKEN.finditer(text):
+        parts.append(_minify_plain(text[last : match.start()]))
+        if match.group(2):
+            parts.append(match.group(2))
+        last = match.end()
+    parts.append(_minify_plain(text[last:]))
+    return "".join(parts).strip()
+
+
+def _minify_plain(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,])\s*", r"\1", text)
+    return re.sub(r":\s+", ":", text)
+
+
+def serialize_css(nodes):
+    """
+    Writes nodes from `parse_css` back as minified CSS.
+    """
+    parts = []
+    for node in nodes:
+        if node[0] == "comment":
+            parts.append(node[1] + "\n")
+        elif node[0] == "statement":
+            parts.append(minify(node[1]) + ";")
+        elif node[0] == "block":
+            parts.append(minify(node[1]) + "{" + serialize_css(node[2]) + "}")
+        else:
+            body = minify(node[2]).rstrip(";")
+            parts.append(minify(node[1]) + "{" + body + "}")
+    return "".join(parts)
+
+
+@lru_cache
+def bundle_built():
+    """
+    Returns whether `build_assets` has written the bundle (checked once per process).
+    """
+    return finders.find(BUNDLE_CSS) is not None
@@ -0,0 +1,215 @@
+"""
+Async variants of the Todo CRUD views for ASGI deployments.
+
+They reuse the configuration and helpers of the sync views in `views.py` but
+authenticate with `request.auser()` and talk to the database only through the async
+ORM (`afirst`, `aget`, `asave`, `adelete`, `async for`), so a request handled by
+uvicorn does not hop to a worker thread for every step. Templates are rendered
+from fully evaluated data, which keeps them free of lazy queries.
+
+`urls.py` routes to these views instead of the sync ones when
+`settings.TODO_ASYNC_VIEWS` is enabled.
+"""
+
+import asyncio
+
+from django.contrib.auth.views import redirect_to_login
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+
+from .cache import aget_list_fragment, aget_list_state, aset_list_fragment
+from .cards import arender_cards
+from .conditional import is_cacheable, not_modified, page_etag, set_validators
+from .models import Todo
+from .pagination import CountedPaginator, KeysetPaginator
+from .repository import aget_todo_counter, aget_user_settings, aset_cards_per_page
+from .views import TodoCreateView, TodoDeleteView, TodoListView, TodoUpdateView
+
+
+class AsyncLoginRequiredMixin:
+    """
+    Async replacement for `login_required` / `LoginRequiredMixin`.
+
+    It loads the user with `request.auser()` and stores the result on
+    `request.user`, so later code (the sync mixins up the MRO, context processors,
+    templates) sees a plain user object instead of a lazy one that would query the
+    database synchronously.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        request.user = user
+        response = super().dispatch(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+
+class AsyncTodoObjectMixin:
+    """
+    Loads the Todo item of the URL with the async ORM, scoped to the current user.
+    """
+
+    async def aget_object(self):
+        try:
+            return await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except (Todo.DoesNotExist, ValueError):
+            raise Http404("No todo found matching the query.")
+
+
+class AsyncTodoListView(AsyncLoginRequiredMixin, TodoListView):
+    """
+    Async variant of `TodoListView`, with the same pagination modes, fragment cache
+    and conditional responses.
+
+    Methods:
+        get(request, *args, **kwargs): Serves the cached list fragment or renders it.
+        apaginate(queryset, page_size): Async counterpart of `paginate_queryset`.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Handles GET requests, serving the list fragment from the cache when possible.
+
+        Like the sync view, it answers with a 304 before touching the queryset when
+        the client's copy of the page is current.
+        """
+        user = request.user
+        self.cards_per_page = (await aget_user_settings(user)).cards_per_page
+        self.cards_per_page = self.get_data()
+        await aset_cards_per_page(user, self.cards_per_page)
+        # The session was loaded by `auser()`, so checking for messages is sync-safe.
+        if response := self.check_not_modified(*await aget_list_state(user.pk)):
+            return response
+        self.object_list = self.get_queryset()
+        fragment = await aget_list_fragment(self.fragment_key)
+        if fragment is None:
+            paginator, page = await self.apaginate(
+                self.object_list, self.cards_per_page
+            )
+            cards = await arender_cards(page.object_list)
+            fragment = render_to_string(
+                self.fragment_template_name,
+                self.get_fragment_context(paginator, page, cards),
+                request,
+            )
+            if self.fragment_is_current():
+                await aset_list_fragment(self.fragment_key, fragment)
+        return self.list_response(fragment)
+
+    async def apaginate(self, queryset, page_size):
+        """
+        Paginates the queryset with the async ORM.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            page_size (int): The number of items per page.
+
+        Returns:
+            tuple: `(paginator, page)` with the page's objects already fetched.
+        """
+        count = None
+        if self.pagination_mode != "keyset" or self.pagination_count:
+            if self.get_search_query():
+                count = await queryset.acount()
+            else:
+                counter = await aget_todo_counter(self.request.user)
+                count = getattr(counter, self.status_counts[self.get_status()])
+        try:
+            if self.pagination_mode == "keyset":
+                paginator = KeysetPaginator(
+                    queryset,
+                    page_size,
+                    ordering=self.get_ordering(),
+                    with_count=self.pagination_count,
+                    count=count,
+                )
+                return paginator, await paginator.apage(self.request.GET.get("cursor"))
+            paginator = CountedPaginator(queryset, page_size, count=count)
+            number = self.request.GET.get("page") or 1
+            if number == "last":
+                number = paginator.num_pages
+            number = paginator.validate_number(number)
+        except InvalidPage as e:
+            raise Http404(str(e))
+        bottom = (number - 1) * paginator.per_page
+        rows = [todo async for todo in queryset[bottom : bottom + paginator.per_page]]
+        return paginator, paginator._get_page(rows, number, paginator)
+
+
+class AsyncTodoCreateView(AsyncLoginRequiredMixin, TodoCreateView):
+    """
+    Async variant of `TodoCreateView`.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object = None
+        return render(request, self.template_name, self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = None
+        form = self.get_form()
+        if not form.is_valid():
+            return render(request, self.template_name, self.get_context_data(form=form))
+        form.instance.user = request.user
+        await form.instance.asave()
+        return redirect(self.success_url)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
+
+
+class AsyncTodoUpdateView(
+    AsyncLoginRequiredMixin, AsyncTodoObjectMixin, TodoUpdateView
+):
+    """
+    Async variant of `TodoUpdateView`. Ownership is enforced by the user-scoped queryset.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        conditional = is_cacheable(request)
+        if conditional:
+            etag = page_etag(request, "todo", self.object.pk, self.object.updated_at)
+            modified = int(self.object.updated_at.timestamp())
+            if response := not_modified(request, etag, modified):
+                return response
+        response = render(request, self.template_name, self.get_context_data())
+        if conditional:
+            set_validators(response, etag, modified)
+        return response
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        form = self.get_form()
+        if not form.is_valid():
+            return render(request, self.template_name, self.get_context_data(form=form))
+        await form.instance.asave()
+        return redirect(self.success_url)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
+
+
+class AsyncTodoDeleteView(
+    AsyncLoginRequiredMixin, AsyncTodoObjectMixin, TodoDeleteView
+):
+    """
+    Async variant of `TodoDeleteView`. Ownership is enforced by the user-scoped queryset.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return render(request, self.template_name, self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        await self.object.adelete()
+        return redirect(self.success_url)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
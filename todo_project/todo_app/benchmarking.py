@@ -0,0 +1,153 @@
+import http.client
+import math
+import threading
+import time
+from importlib import import_module
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.utils.crypto import get_random_string
+
+
+def percentile(values, pct):
+    """
+    Returns the `pct`-th percentile of `values` (nearest-rank method).
+
+    Args:
+        values (list): The measured values.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """
+    Summarizes request latencies (in seconds) into a JSON-serializable report.
+
+    Args:
+        latencies (list): The latency of every successful request.
+        elapsed (float): The wall-clock duration of the run.
+        errors (int): The number of failed requests.
+
+    Returns:
+        dict: Request count, throughput and latency percentiles in milliseconds.
+    """
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def login_cookies(user):
+    """
+    Creates a logged-in session for `user` without going through the login form.
+
+    Args:
+        user (User): The user to log in.
+
+    Returns:
+        dict: The session and CSRF cookies to send with benchmark requests.
+    """
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return {
+        settings.SESSION_COOKIE_NAME: session.session_key,
+        settings.CSRF_COOKIE_NAME: get_random_string(32),
+    }
+
+
+class HttpLoad:
+    """
+    Drives HTTP requests against a running server from a pool of threads.
+
+    Every thread keeps one persistent connection, so the numbers reflect the
+    server rather than connection setup on the client side.
+
+    Attributes:
+        base_url (str): The server address, e.g. `http://127.0.0.1:8000`.
+        cookies (dict): Cookies sent with every request (see `login_cookies`).
+
+    Example:
+        load = HttpLoad("http://127.0.0.1:8000", login_cookies(user))
+        report = load.run([("GET", "/", None)] * 1000, concurrency=16)
+    """
+
+    def __init__(self, base_url, cookies=None):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.cookies = cookies or {}
+
+    def headers(self, body):
+        headers = {
+            "Cookie": "; ".join(f"{k}={v}" for k, v in self.cookies.items()),
+            "Host": f"{self.host}:{self.port}",
+        }
+        if settings.CSRF_COOKIE_NAME in self.cookies:
+            headers["X-CSRFToken"] = self.cookies[settings.CSRF_COOKIE_NAME]
+        if body is not None:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        return headers
+
+    def run(self, requests, concurrency=8, timeout=30):
+        """
+        Sends `requests` with `concurrency` parallel connections.
+
+        Args:
+            requests (list): `(method, path, form_data or None)` tuples.
+            concurrency (int): The number of parallel connections.
+            timeout (float): The per-request timeout in seconds.
+
+        Returns:
+            dict: The report produced by `summarize`.
+        """
+        pending = list(reversed(requests))
+        lock = threading.Lock()
+        latencies, errors = [], []
+
+        def worker():
+            connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=timeout
+            )
+            while True:
+                with lock:
+                    if not pending:
+                        break
+                    method, path, data = pending.pop()
+                body = urlencode(data) if data is not None else None
+                started = time.perf_counter()
+                try:
+                    connection.request(method, path, body, self.headers(body))
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status < 400
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                elapsed = time.perf_counter() - started
+                with lock:
+                    (latencies if ok else errors).append(elapsed)
+            connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarize(latencies, time.perf_counter() - started, len(errors))
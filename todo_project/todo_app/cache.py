@@ -0,0 +1,189 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def list_version_key(user_id):
+    """
+    Returns the cache key holding the version of a user's todo list.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"todo:list-version:{user_id}"
+
+
+def get_list_version(user_id):
+    """
+    Returns the current version of a user's todo list.
+
+    The version only ever grows: it starts from the current time in nanoseconds and is
+    incremented on every change. If the key is evicted, the new starting point is
+    again the current time, so an old version (and the fragments cached under it)
+    is never reused.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        int: The list version.
+    """
+    key = list_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+async def aget_list_version(user_id):
+    """
+    Async version of `get_list_version`.
+    """
+    key = list_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key, time.time_ns())
+    return version
+
+
+def list_modified_key(user_id):
+    """
+    Returns the cache key holding the time a user's todo list last changed.
+    """
+    return f"todo:list-modified:{user_id}"
+
+
+def get_list_state(user_id):
+    """
+    Returns the version of a user's todo list and the time it last changed.
+
+    Both values come from one `get_many()` round trip. The version identifies the
+    list exactly (it feeds fragment keys and ETags); the time, in whole seconds,
+    feeds `Last-Modified`. If the time was evicted, it restarts from now, which can
+    only make clients re-fetch.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        tuple: `(version, modified)`, where `modified` is a UNIX timestamp.
+    """
+    version_key, modified_key = list_version_key(user_id), list_modified_key(user_id)
+    state = cache.get_many([version_key, modified_key])
+    version = state.get(version_key)
+    if version is None:
+        version = get_list_version(user_id)
+    modified = state.get(modified_key)
+    if modified is None:
+        modified = int(time.time())
+        cache.add(modified_key, modified, None)
+    return version, modified
+
+
+async def aget_list_state(user_id):
+    """
+    Async version of `get_list_state`.
+    """
+    version_key, modified_key = list_version_key(user_id), list_modified_key(user_id)
+    state = await cache.aget_many([version_key, modified_key])
+    version = state.get(version_key)
+    if version is None:
+        version = await aget_list_version(user_id)
+    modified = state.get(modified_key)
+    if modified is None:
+        modified = int(time.time())
+        await cache.aadd(modified_key, modified, None)
+    return version, modified
+
+
+def bump_list_version(user_id):
+    """
+    Marks a user's todo list as changed, invalidating every cached fragment of it.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Side Effects:
+        - Increments the version stored under `list_version_key(user_id)`.
+        - Sets the time stored under `list_modified_key(user_id)` to now.
+    """
+    key = list_version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    cache.set(list_modified_key(user_id), int(time.time()), None)
+
+
+def list_fragment_key(user_id, version, **params):
+    """
+    Returns the cache key of one rendered list fragment.
+
+    Args:
+        user_id (int): The primary key of the user.
+        version (int): The list version from `get_list_version`.
+        **params: Everything else the fragment depends on (page, cursor, page size...).
+
+    Returns:
+        str: The cache key.
+    """
+    digest = hashlib.md5(
+        repr(sorted(params.items())).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"todo:list-fragment:{user_id}:{version}:{digest}"
+
+
+def list_cache_enabled():
+    """
+    Returns whether rendered list fragments are cached.
+
+    Fragments are found through the list version, which a write bumps only in the
+    cache of the worker that handled it. With a per-process cache the other workers
+    would serve their old fragments, so the cache is only used when
+    `settings.TODO_SHARED_CACHE` says all workers share it.
+    """
+    return bool(settings.TODO_LIST_CACHE_TIMEOUT and settings.TODO_SHARED_CACHE)
+
+
+def get_list_fragment(key):
+    """
+    Returns a cached list fragment, or `None` if caching is disabled or it is missing.
+    """
+    if not list_cache_enabled():
+        return None
+    return cache.get(key)
+
+
+def set_list_fragment(key, fragment):
+    """
+    Stores a rendered list fragment for `settings.TODO_LIST_CACHE_TIMEOUT` seconds.
+
+    The timeout is what bounds how stale relative dates (`naturaltime`) can get,
+    since they change without the list itself changing.
+    """
+    if list_cache_enabled():
+        cache.set(key, fragment, settings.TODO_LIST_CACHE_TIMEOUT)
+
+
+async def aget_list_fragment(key):
+    """
+    Async version of `get_list_fragment`.
+    """
+    if not list_cache_enabled():
+        return None
+    return await cache.aget(key)
+
+
+async def aset_list_fragment(key, fragment):
+    """
+    Async version of `set_list_fragment`.
+    """
+    if list_cache_enabled():
+        await cache.aset(key, fragment, settings.TODO_LIST_CACHE_TIMEOUT)
@@ -0,0 +1,116 @@
+"""
+Renders the cards of the todo list, reusing cached HTML for unchanged todos.
+
+Every card is rendered from `todo/card.html` and cached under the todo's id and
+`updated_at` (which every save and bulk action bumps), so an edited todo simply
+gets a new key and stale cards age out. The cached HTML leaves a placeholder
+where the relative date (`naturaltime`) goes: it is stored as the parts around
+the placeholder and the date is formatted on every render, so cached cards never
+show an outdated "5 minutes ago".
+
+A digest of the card template is part of the key, so a deployment that changes
+the template does not serve cards rendered by the old one.
+"""
+
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = "todo/card.html"
+# Rendered in place of the relative date and split on when caching.
+PUBLISHED_PLACEHOLDER = mark_safe("<!--published-->")
+
+
+@lru_cache
+def card_template_digest():
+    """
+    Returns a short digest of the card template's source (computed once per process).
+    """
+    source = get_template(CARD_TEMPLATE).template.source
+    return hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()[:8]
+
+
+def card_key(todo):
+    """
+    Returns the cache key of a todo's rendered card.
+
+    Args:
+        todo (Todo): A todo loaded with `for_cards()`.
+
+    Returns:
+        str: The cache key.
+    """
+    stamp = int(todo.updated_at.timestamp() * 1_000_000)
+    return f"todo:card:{card_template_digest()}:{todo.pk}:{stamp}"
+
+
+def render_card(todo):
+    """
+    Renders a todo's card, without the relative date.
+
+    Returns:
+        tuple: `(before, after)`, the HTML around the date placeholder.
+    """
+    html = render_to_string(
+        CARD_TEMPLATE, {"todo": todo, "published": PUBLISHED_PLACEHOLDER}
+    )
+    before, after = html.split(PUBLISHED_PLACEHOLDER, 1)
+    return before, after
+
+
+def _render(todos, cached):
+    # Renders the missing cards into `cached` and returns them, then stitches all
+    # cards together with their relative dates.
+    missing = {}
+    for todo in todos:
+        key = card_key(todo)
+        if key not in cached:
+            cached[key] = missing[key] = render_card(todo)
+    html = "".join(
+        before + escape(naturaltime(todo.published)) + after
+        for todo, (before, after) in ((todo, cached[card_key(todo)]) for todo in todos)
+    )
+    return mark_safe(html), missing
+
+
+def render_cards(todos):
+    """
+    Returns the HTML of the cards of `todos`, rendering only the uncached ones.
+
+    The cached cards are fetched with one `get_many()` and the newly rendered ones
+    stored with one `set_many()` for `settings.TODO_CARD_CACHE_TIMEOUT` seconds
+    (0 renders every card and caches nothing).
+
+    Args:
+        todos (Iterable[Todo]): The todos of the page, loaded with `for_cards()`.
+
+    Returns:
+        SafeString: The cards in order.
+    """
+    todos = list(todos)
+    timeout = settings.TODO_CARD_CACHE_TIMEOUT
+    cached = cache.get_many([card_key(todo) for todo in todos]) if timeout else {}
+    html, missing = _render(todos, cached)
+    if missing and timeout:
+        cache.set_many(missing, timeout)
+    return html
+
+
+async def arender_cards(todos):
+    """
+    Async version of `render_cards`.
+    """
+    todos = list(todos)
+    timeout = settings.TODO_CARD_CACHE_TIMEOUT
+    keys = [card_key(todo) for todo in todos]
+    cached = await cache.aget_many(keys) if timeout else {}
+    html, missing = _render(todos, cached)
+    if missing and timeout:
+        await cache.aset_many(missing, timeout)
+    return html
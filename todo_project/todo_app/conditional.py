@@ -0,0 +1,77 @@
+import hashlib
+
+from django.contrib import messages
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def page_etag(request, *parts):
+    """
+    Returns a weak ETag for a page of the current user built from `parts`.
+
+    Besides `parts` (e.g. a list version or a todo's `updated_at`), the ETag covers
+    the user and the CSRF secret: the pages embed a CSRF token, so a cached copy must
+    not be revalidated once the secret was rotated (e.g. by a new login). The secret
+    is created here if the request has none yet, so the first response already
+    carries the ETag its follow-up requests will produce.
+
+    Args:
+        request (HttpRequest): The incoming request.
+        *parts: The values the page content depends on.
+
+    Returns:
+        str: A weak entity tag, e.g. `W/"5d41402abc4b2a76b9719d911017c592"`.
+    """
+    get_token(request)
+    csrf_secret = request.META["CSRF_COOKIE"]
+    digest = hashlib.md5(
+        repr((request.user.pk, csrf_secret, parts)).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_cacheable(request):
+    """
+    Returns whether the page may be answered with `304 Not Modified`.
+
+    Only GET and HEAD requests qualify, and only without pending messages: those are
+    rendered into the page (and consumed) on the next full response.
+    """
+    return request.method in ("GET", "HEAD") and not messages.get_messages(request)
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Returns a `304 Not Modified` response if the client's copy is current, else `None`.
+
+    Args:
+        request (HttpRequest): The incoming request with `If-None-Match` and/or
+                               `If-Modified-Since` headers.
+        etag (str): The current ETag of the page.
+        last_modified (int): The UNIX timestamp the page last changed at.
+
+    Returns:
+        HttpResponseNotModified | None: The 304 response (with its validators), or
+                                        `None` when the page has to be rendered.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Adds `ETag`, `Last-Modified` and `Cache-Control: private, no-cache` to a response.
+
+    `no-cache` makes browsers revalidate on every use instead of guessing a
+    freshness lifetime from `Last-Modified`, and `private` keeps shared caches out.
+
+    Returns:
+        HttpResponse: The same response.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 
 from .models import Todo
 
@@ -47,3 +48,98 @@ class TodoUpdateForm(TodoForm):
 
     class Meta(TodoForm.Meta):
         fields = TodoForm.Meta.fields + ("completed",)
+
+
+class TodoRecordForm(TodoUpdateForm):
+    """
+    Validates one record of an imported file (see `transfer.import_todos`).
+
+    `published` is not editable on the model, so `save()` ignores it; the importer
+    writes it after the insert.
+
+    Attributes:
+        published (DateTimeField): The creation time of the exported Todo item
+                                   (ISO 8601, as exported). Optional.
+    """
+
+    published = forms.DateTimeField(required=False)
+
+
+class TodoImportForm(forms.Form):
+    """
+    A form for uploading a file of Todo items to import.
+
+    Attributes:
+        file (FileField): The NDJSON or CSV file to import.
+        format (ChoiceField): The file format; detected from the file extension when empty.
+    """
+
+    file = forms.FileField(widget=forms.FileInput(attrs={"class": "form-control"}))
+    format = forms.ChoiceField(
+        choices=(("", "Detect from file name"), ("ndjson", "NDJSON"), ("csv", "CSV")),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get("file")
+        if upload and not cleaned_data.get("format"):
+            extension = upload.name.rsplit(".", 1)[-1].lower()
+            if extension in ("ndjson", "jsonl"):
+                cleaned_data["format"] = "ndjson"
+            elif extension == "csv":
+                cleaned_data["format"] = "csv"
+            else:
+                self.add_error("format", "Choose the format of this file.")
+        return cleaned_data
+
+
+class TodoIdsField(forms.Field):
+    """
+    A field holding a list of Todo ids.
+
+    The ids may be sent as repeated fields (`ids=1&ids=2`, as checkboxes submit them)
+    or comma-separated (`ids=1,2,3`), which lets scripts send thousands of ids without
+    hitting `DATA_UPLOAD_MAX_NUMBER_FIELDS`. Duplicates are dropped.
+
+    Attributes:
+        max_ids (int): The maximum number of ids accepted.
+    """
+
+    widget = forms.MultipleHiddenInput
+
+    def __init__(self, *, max_ids, **kwargs):
+        self.max_ids = max_ids
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            ids = {int(item) for chunk in value for item in chunk.split(",") if item}
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Invalid todo id.", code="invalid")
+        if len(ids) > self.max_ids:
+            raise forms.ValidationError(
+                f"Select at most {self.max_ids} todos at once.", code="max_ids"
+            )
+        return sorted(ids)
+
+
+class TodoBulkActionForm(forms.Form):
+    """
+    A form applying one action to many Todo items of the list.
+
+    Attributes:
+        action (ChoiceField): `complete`, `reopen` or `delete`.
+        ids (TodoIdsField): The selected Todo ids, at most `settings.TODO_BULK_ACTION_LIMIT`.
+    """
+
+    action = forms.ChoiceField(
+        choices=(("complete", "Complete"), ("reopen", "Reopen"), ("delete", "Delete"))
+    )
+    ids = TodoIdsField(
+        max_ids=settings.TODO_BULK_ACTION_LIMIT,
+        error_messages={"required": "Select at least one todo."},
+    )
@@ -0,0 +1,338 @@
+import json
+import platform
+import random
+import resource
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from todo_app.benchmarking import summarize
+from todo_app.models import Todo
+from todo_app.repository import recount_todo_counters
+from todo_app.seeding import seed_todos, seed_users
+
+PASSWORD = "seed-password"
+SIGNUP_PASSWORD = "Bench-signup-2024!"
+CREATED_TITLE = "Bench created"
+
+
+class Command(BaseCommand):
+    """
+    Seeds a synthetic data set and reports the latency, SQL queries and memory of
+    every main view.
+
+    `--users` users with `--todos` todos each are seeded with `bulk_create` (see
+    `seeding.py`, which bypasses the per-user signals); seeding is skipped for the
+    part that already exists. Then the list, create, update, delete, sign-in and
+    sign-up views are requested `--requests` times each in-process with the test
+    `Client`, every request as a user picked with a fixed `--seed`, so two runs on
+    the same data send the same requests.
+
+    For every view the report shows the p50/p95/p99 latency, the mean number of SQL
+    queries per request and the median peak of memory allocated by a request
+    (measured with `tracemalloc` on a separate, untimed pass, since tracing slows
+    every allocation down). With `--json` the report is written to a file together
+    with the parameters and environment of the run; `--compare` prints the change
+    against such a file, e.g. one from the main branch.
+
+    Todos and users created by the run are deleted afterwards, so repeated runs
+    measure the same data.
+
+    The test `Client` keeps the database connection open across requests, so
+    connection setup is not measured by default. With `--close-connections` the
+    connection is released after every request as the server does, honouring
+    `CONN_MAX_AGE` and the connection pool (see `TODO_DB_CONN_MAX_AGE` and
+    `TODO_DB_POOL`), so their effect on latency can be compared.
+
+    Example:
+        python manage.py bench --users 100 --todos 200 --json before.json
+        python manage.py bench --users 100 --todos 200 --compare before.json
+        TODO_DB_CONN_MAX_AGE=0 python manage.py bench --views list --close-connections
+    """
+
+    help = "Seed synthetic data and report per-view latency, queries and memory."
+
+    scenarios = ("list", "create", "update", "delete", "signin", "signup")
+    expected_status = {
+        "list": 200,
+        "create": 302,
+        "update": 302,
+        "delete": 302,
+        "signin": 302,
+        "signup": 302,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument(
+            "--todos", type=int, default=100, help="Todos per seeded user."
+        )
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per view."
+        )
+        parser.add_argument(
+            "--memory-requests",
+            type=int,
+            default=10,
+            help="Requests per view traced for the memory column (0 skips it).",
+        )
+        parser.add_argument(
+            "--views", nargs="+", choices=self.scenarios, help="Only these views."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--close-connections",
+            action="store_true",
+            help="Release the database connection after every request, as the "
+            "server does.",
+        )
+        parser.add_argument("--json", help="Write the report to this file.")
+        parser.add_argument("--compare", help="A report to compare against.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as fp:
+                    baseline = json.load(fp)["views"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Cannot read {options['compare']}: {e}")
+        started = time.perf_counter()
+        users = seed_users(options["users"], prefix="bench", password=PASSWORD)
+        counts = dict(
+            Todo.objects.filter(user__in=users)
+            .values("user_id")
+            .annotate(n=Count("id"))
+            .values_list("user_id", "n")
+        )
+        for user in users:
+            missing = options["todos"] - counts.get(user.pk, 0)
+            if missing > 0:
+                seed_todos([user], missing)
+        self.stdout.write(
+            f"Seeded {len(users)} users x {options['todos']} todos in "
+            f"{time.perf_counter() - started:.1f}s."
+        )
+
+        self.rng = random.Random(options["seed"])
+        self.users = users
+        self.clients = {}
+        self.todo_ids = {
+            user.pk: list(
+                Todo.objects.for_user(user)
+                .exclude(title=CREATED_TITLE)
+                .values_list("pk", flat=True)
+            )
+            for user in users
+        }
+        self.run_id = get_random_string(4, "abcdefghijklmnopqrstuvwxyz0123456789")
+        self.signups = 0
+        self.close_connections = options["close_connections"]
+
+        self.stdout.write(
+            f"{'view':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'queries':>8} {'alloc KiB':>10} {'errors':>7}"
+        )
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        report = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=hosts):
+                for name in options["views"] or self.scenarios:
+                    report[name] = self.bench_view(name, options)
+                    self.write_row(name, report[name], baseline)
+        finally:
+            self.clean_up()
+
+        if options["json"]:
+            with open(options["json"], "w") as fp:
+                json.dump(
+                    {
+                        "parameters": {
+                            name: options[name]
+                            for name in (
+                                "users",
+                                "todos",
+                                "requests",
+                                "seed",
+                                "close_connections",
+                            )
+                        },
+                        "environment": {
+                            "python": platform.python_version(),
+                            "django": django.get_version(),
+                            "database": connection.vendor,
+                            "cache": settings.CACHES["default"]["BACKEND"],
+                            "session_engine": settings.SESSION_ENGINE,
+                            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+                            "pool": bool(
+                                connection.settings_dict["OPTIONS"].get("pool")
+                            ),
+                            "max_rss_kib": resource.getrusage(
+                                resource.RUSAGE_SELF
+                            ).ru_maxrss,
+                        },
+                        "views": report,
+                    },
+                    fp,
+                    indent=2,
+                )
+
+    def bench_view(self, name, options):
+        """
+        Sends the requests of one view and measures them.
+
+        Returns:
+            dict: The `summarize` report plus `queries` (mean per request) and
+                  `alloc_kib` (median peak allocation per request).
+        """
+        prepare = getattr(self, f"prepare_{name}", None)
+        count = options["requests"]
+        traced = options["memory_requests"]
+        # One untimed request warms the caches, the traced ones come on top.
+        requests = [self.make_request(name) for _ in range(1 + count + traced)]
+        if prepare is not None:
+            prepare(requests)
+
+        self.send(name, requests[0])
+        latencies, errors, queries = [], 0, []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # Unlike `CaptureQueriesContext`, a wrapper also counts when DEBUG's
+        # `queries_log` is full.
+        with connection.execute_wrapper(count_query):
+            started = time.perf_counter()
+            for request in requests[1 : 1 + count]:
+                began = time.perf_counter()
+                ok = self.send(name, request)
+                latencies.append(time.perf_counter() - began)
+                errors += not ok
+            elapsed = time.perf_counter() - started
+        peaks = []
+        for request in requests[1 + count :]:
+            tracemalloc.start()
+            self.send(name, request)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+        result = summarize(latencies, elapsed, errors)
+        result["queries"] = round(len(queries) / max(count, 1), 1)
+        result["alloc_kib"] = (
+            round(sorted(peaks)[len(peaks) // 2], 1) if peaks else None
+        )
+        return result
+
+    def make_request(self, name):
+        """
+        Returns `(user, method, url, data)` for one request of a view.
+        """
+        user = self.rng.choice(self.users)
+        if name == "list":
+            page = self.rng.randint(1, 3)
+            return user, "get", f"{reverse('main')}?page={page}", None
+        if name == "create":
+            data = {"title": CREATED_TITLE, "description": "Created by bench."}
+            return user, "post", reverse("create_todo"), data
+        if name == "update":
+            todo_id = self.rng.choice(self.todo_ids[user.pk])
+            data = {
+                "title": f"Task {todo_id}",
+                "description": "Updated by bench.",
+                "completed": "on" if self.rng.random() < 0.5 else "",
+            }
+            return user, "post", reverse("edit_todo", args=[todo_id]), data
+        if name == "delete":
+            # The todo to delete is created in `prepare_delete`.
+            return user, "post", None, None
+        if name == "signin":
+            data = {"username": user.username, "password": PASSWORD}
+            return None, "post", reverse("app_auth:signin"), data
+        self.signups += 1
+        username = f"bs{self.run_id}_{self.signups}"
+        data = {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password1": SIGNUP_PASSWORD,
+            "password2": SIGNUP_PASSWORD,
+        }
+        return None, "post", reverse("app_auth:signup"), data
+
+    def prepare_delete(self, requests):
+        # Every delete request gets a todo of its own, created untimed.
+        todos = Todo.objects.bulk_create(
+            Todo(user=user, title=CREATED_TITLE, description="Deleted by bench.")
+            for user, *_ in requests
+        )
+        recount_todo_counters({todo.user_id for todo in todos})
+        for index, todo in enumerate(todos):
+            user, method, _, data = requests[index]
+            requests[index] = (
+                user,
+                method,
+                reverse("delete_todo", args=[todo.pk]),
+                data,
+            )
+
+    def send(self, name, request):
+        """
+        Sends one request, as its user or anonymously, and checks the status code.
+        """
+        user, method, url, data = request
+        if user is None:
+            client = Client()
+        else:
+            client = self.clients.get(user.pk)
+            if client is None:
+                client = self.clients[user.pk] = Client()
+                client.force_login(user)
+        response = getattr(client, method)(url, data)
+        if self.close_connections:
+            # What the request_finished signal does outside the test Client.
+            close_old_connections()
+        return response.status_code == self.expected_status[name]
+
+    def clean_up(self):
+        """
+        Deletes the todos and users the run created.
+        """
+        Todo.objects.filter(user__in=self.users, title=CREATED_TITLE).delete()
+        recount_todo_counters(user.pk for user in self.users)
+        get_user_model().objects.filter(
+            username__startswith=f"bs{self.run_id}_"
+        ).delete()
+
+    def write_row(self, name, result, baseline):
+        alloc = "-" if result["alloc_kib"] is None else f"{result['alloc_kib']:.1f}"
+        self.stdout.write(
+            f"{name:<8} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['queries']:>8.1f} {alloc:>10} "
+            f"{result['errors']:>7}"
+        )
+        if baseline and name in baseline:
+            before = baseline[name]
+            self.stdout.write(
+                f"{'  change':<8} "
+                + " ".join(
+                    f"{self.change(before.get(key), result[key]):>8}"
+                    for key in ("p50_ms", "p95_ms", "p99_ms", "queries")
+                )
+            )
+
+    @staticmethod
+    def change(before, after):
+        """
+        Returns the relative change from `before` to `after` as text, e.g. `-12%`.
+        """
+        if not before:
+            return "-"
+        return f"{(after - before) / before:+.0%}"
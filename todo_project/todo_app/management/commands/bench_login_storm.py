@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+
+from django.conf import settings
+
+from todo_app.benchmarking import HttpLoad, login_cookies
+from todo_app.seeding import seed_todos, seed_users
+
+from .bench_servers import Command as BenchServersCommand
+
+PASSWORD = "seed-password"
+
+
+class Command(BenchServersCommand):
+    """
+    Measures how a storm of logins affects unrelated todo requests.
+
+    For each deployment (see `bench_servers`) the command first drives the todo list
+    alone and then again while other clients keep posting valid credentials to the
+    sign-in page, and reports the todo list's p50/p99 latency for both runs. Under
+    ASGI the async sign-in view hashes on the bounded pool of `app_auth.hashing`, so
+    the todo latency should barely move, and logins beyond the pool's queue are
+    turned away with `503` (counted as rejected). Tune the pool with
+    `TODO_AUTH_HASHING_WORKERS` / `TODO_AUTH_HASHING_QUEUE`, which the servers
+    inherit from the environment.
+
+    Example:
+        python manage.py bench_login_storm --login-concurrency 64 --requests 1000
+        TODO_AUTH_HASHING_WORKERS=2 python manage.py bench_login_storm --only asgi
+    """
+
+    help = "Benchmark todo list latency during a login storm under WSGI and ASGI."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--login-concurrency",
+            type=int,
+            default=32,
+            help="Parallel connections posting logins during the storm.",
+        )
+
+    def handle(self, *args, **options):
+        user = seed_users(1, prefix="bench_servers")[0]
+        if not user.todo_set.exists():
+            seed_todos([user], options["todos"])
+        storm_user = seed_users(1, prefix="login_storm", password=PASSWORD)[0]
+        names = [options["only"]] if options["only"] else list(self.servers)
+        self.stdout.write(
+            f"{'server':<6} {'todo list':<14} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} "
+            f"{'logins/s':>9} {'rejected':>9}"
+        )
+        results = {}
+        for name in names:
+            with self.server(name, options) as base_url:
+                todos = HttpLoad(base_url, login_cookies(user))
+                todos.run([("GET", "/", None)] * options["concurrency"] * 2)  # warm-up
+                requests = [("GET", "/", None)] * options["requests"]
+                quiet = todos.run(requests, concurrency=options["concurrency"])
+                self.write_row(name, "alone", quiet)
+                storm = self.start_storm(base_url, storm_user, options)
+                try:
+                    stormy = todos.run(requests, concurrency=options["concurrency"])
+                finally:
+                    logins = storm()
+                self.write_row(name, "during storm", stormy, logins)
+            results[name] = {
+                "alone": quiet,
+                "during storm": stormy,
+                "logins_per_second": logins[0],
+                "rejected_logins": logins[1],
+            }
+        if options["json"]:
+            with open(options["json"], "w") as fp:
+                json.dump(results, fp, indent=2)
+
+    def start_storm(self, base_url, user, options):
+        """
+        Starts posting logins of `user` from a background thread.
+
+        Returns:
+            callable: Stops the storm and returns `(logins_per_second, rejected)`.
+        """
+        csrf = login_cookies(user)[settings.CSRF_COOKIE_NAME]
+        load = HttpLoad(base_url, {settings.CSRF_COOKIE_NAME: csrf})
+        login = (
+            "POST",
+            "/app_auth/signin/",
+            {"username": user.username, "password": PASSWORD},
+        )
+        batch = [login] * options["login_concurrency"] * 2
+        stop = threading.Event()
+        reports = []
+
+        def run():
+            while not stop.is_set():
+                reports.append(
+                    load.run(batch, concurrency=options["login_concurrency"])
+                )
+
+        thread = threading.Thread(target=run)
+        started = time.perf_counter()
+        thread.start()
+
+        def finish():
+            stop.set()
+            thread.join()
+            elapsed = time.perf_counter() - started
+            logins = sum(report["requests"] for report in reports)
+            rejected = sum(report["errors"] for report in reports)
+            return round(logins / elapsed, 1), rejected
+
+        return finish
+
+    def write_row(self, server, label, report, logins=("-", "-")):
+        self.stdout.write(
+            f"{server:<6} {label:<14} {report['rps']:>8} {report['p50_ms']:>8} "
+            f"{report['p99_ms']:>8} {logins[0]:>9} {logins[1]:>9}"
+        )
@@ -0,0 +1,103 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from todo_app.models import Todo
+from todo_app.repository import create_todos
+from todo_app.search import search_todos
+from todo_app.seeding import seed_todos, seed_users
+
+VOCABULARY = (
+    "buy call email write review plan fix clean book pay send order check update "
+    "prepare schedule meeting report groceries milk bread coffee dentist doctor "
+    "gym garden car insurance taxes budget project release deploy server backup "
+    "invoice client team lunch dinner birthday gift flight hotel ticket passport "
+    "laundry kitchen garage paint repair bike library homework exam lecture notes"
+).split()
+# A phrase that occurs in exactly `--matches` todos of every benchmark user, so the
+# selective query returns the same number of rows at every size.
+NEEDLE = "quarterly reconciliation"
+
+
+class Command(BaseCommand):
+    """
+    Measures todo search latency as the number of todos per user grows.
+
+    For every size a benchmark user is seeded with that many todos built from a small
+    vocabulary, plus `--matches` todos containing a rare phrase. The command then
+    times the list query of the first search page (rows plus count) for
+
+    - a selective query (the rare phrase), whose latency should stay flat with the
+      full-text index, and
+    - a common word, whose cost grows with the number of matches it has to rank,
+
+    next to the equivalent `icontains` scan, which grows with the table.
+
+    Example:
+        python manage.py bench_search --sizes 1000 10000 100000 --repeat 20
+    """
+
+    help = "Benchmark full-text todo search against an icontains scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1000, 10000, 50000]
+        )
+        parser.add_argument("--matches", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--per-page", type=int, default=9)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}")
+        header = f"{'todos':>8} {'query':<36} {'matches':>8} {'search ms':>10} {'icontains ms':>13}"
+        self.stdout.write(header)
+        for size in options["sizes"]:
+            user = self.seed(size, options["matches"])
+            todos = Todo.objects.for_user(user).for_cards()
+            for label, text in (("selective", NEEDLE), ("common", VOCABULARY[0])):
+                search = search_todos(todos, text)
+                scan = todos.filter(
+                    Q(title__icontains=text) | Q(description__icontains=text)
+                ).order_by("-published", "-id")
+                self.stdout.write(
+                    f"{size:>8} {label + ' (' + text + ')':<36} {search.count():>8} "
+                    f"{self.time(search, options):>10.2f} "
+                    f"{self.time(scan, options):>13.2f}"
+                )
+
+    def seed(self, size, matches):
+        """
+        Returns the benchmark user of `size`, seeding its todos on the first run.
+        """
+        user = seed_users(1, prefix=f"bench_search_{size}_")[0]
+        if not Todo.objects.filter(user=user).exists():
+            seed_todos([user], size - matches, vocabulary=VOCABULARY)
+            create_todos(
+                [
+                    Todo(
+                        user=user,
+                        title=NEEDLE.capitalize(),
+                        description=f"Check the {NEEDLE} report {n}.",
+                    )
+                    for n in range(matches)
+                ]
+            )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Todo._meta.db_table}")
+        return user
+
+    def time(self, queryset, options):
+        """
+        Returns the median milliseconds of fetching the first page and the count.
+        """
+        timings = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            list(queryset[: options["per_page"]])
+            queryset.count()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
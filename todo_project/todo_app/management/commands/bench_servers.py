@@ -0,0 +1,143 @@
+import json
+import os
+import shlex
+import socket
+import subprocess
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todo_app.benchmarking import HttpLoad, login_cookies
+from todo_app.seeding import seed_todos, seed_users
+
+
+class Command(BaseCommand):
+    """
+    Compares the WSGI (gunicorn, sync views) and ASGI (uvicorn, async views)
+    deployments of the Todo CRUD endpoints.
+
+    For each deployment the command starts the server on a local port, drives the
+    list, create, edit and delete endpoints with a logged-in benchmark user and
+    reports requests per second and p50/p95/p99 latency per endpoint. The servers
+    inherit the current environment, so they use the same database; the ASGI
+    server is started with `TODO_ASYNC_VIEWS=1`.
+
+    Example:
+        python manage.py bench_servers --requests 2000 --concurrency 32 --workers 2
+        python manage.py bench_servers --only asgi --json asgi.json
+    """
+
+    help = "Benchmark the todo endpoints under gunicorn (WSGI) and uvicorn (ASGI)."
+
+    servers = {
+        "wsgi": (
+            "gunicorn todo_project.wsgi:application --bind 127.0.0.1:{port} "
+            "--workers {workers} --threads {threads}",
+            {"TODO_ASYNC_VIEWS": "0"},
+        ),
+        "asgi": (
+            "uvicorn todo_project.asgi:application --host 127.0.0.1 --port {port} "
+            "--workers {workers} --no-access-log",
+            {"TODO_ASYNC_VIEWS": "1"},
+        ),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--threads", type=int, default=4, help="gunicorn threads per worker."
+        )
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--todos", type=int, default=500, help="Todos of the benchmark user."
+        )
+        parser.add_argument("--only", choices=sorted(self.servers))
+        parser.add_argument("--json", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        user = seed_users(1, prefix="bench_servers")[0]
+        if not user.todo_set.exists():
+            seed_todos([user], options["todos"])
+        todo_id = user.todo_set.values_list("pk", flat=True).first()
+        scenarios = {
+            "list": [("GET", "/", None)],
+            "list page 2": [("GET", "/?page=2", None)],
+            "create (GET)": [("GET", "/todo/create", None)],
+            "edit (GET)": [("GET", f"/todo/edit/{todo_id}", None)],
+            "delete (GET)": [("GET", f"/todo/delete/{todo_id}", None)],
+            "create (POST)": [
+                ("POST", "/todo/create", {"title": "Bench", "description": "Bench"})
+            ],
+        }
+        names = [options["only"]] if options["only"] else list(self.servers)
+        results = {}
+        for name in names:
+            results[name] = self.bench_server(name, user, scenarios, options)
+        self.report(results)
+        if options["json"]:
+            with open(options["json"], "w") as fp:
+                json.dump(results, fp, indent=2)
+
+    def bench_server(self, name, user, scenarios, options):
+        with self.server(name, options) as base_url:
+            load = HttpLoad(base_url, login_cookies(user))
+            load.run([("GET", "/", None)] * options["concurrency"] * 2)  # warm-up
+            return {
+                label: load.run(
+                    requests * options["requests"],
+                    concurrency=options["concurrency"],
+                )
+                for label, requests in scenarios.items()
+            }
+
+    @contextmanager
+    def server(self, name, options):
+        """
+        Runs the server `name` for the duration of the block.
+
+        Yields:
+            str: The base URL the server listens on.
+        """
+        command, extra_env = self.servers[name]
+        command = command.format(
+            port=options["port"],
+            workers=options["workers"],
+            threads=options["threads"],
+        )
+        process = subprocess.Popen(
+            shlex.split(command),
+            env={**os.environ, **extra_env},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.wait_for_port(options["port"], process)
+            yield f"http://127.0.0.1:{options['port']}"
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def wait_for_port(self, port, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"The server exited with code {process.returncode}.")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"The server did not listen on port {port}.")
+
+    def report(self, results):
+        header = f"{'server':<6} {'endpoint':<14} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}"
+        self.stdout.write(header)
+        for server, scenarios in results.items():
+            for label, row in scenarios.items():
+                self.stdout.write(
+                    f"{server:<6} {label:<14} {row['rps']:>8} {row['p50_ms']:>8} "
+                    f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['errors']:>6}"
+                )
@@ -0,0 +1,97 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todo_app.benchmarking import summarize
+from todo_app.models import Todo
+from todo_app.seeding import seed_todos, seed_users
+
+
+class Command(BaseCommand):
+    """
+    Measures what each session mode costs a request of the todo list.
+
+    For every mode of `settings.SESSION_ENGINES` the list page is requested
+    `--requests` times in-process with the test `Client`, as a logged-in benchmark
+    user and with a warm list fragment cache. The report shows the SQL queries per
+    request (all of them and those on `django_session`), the queries saved compared
+    to the `db` mode, the p50/p95 latency and the throughput.
+
+    The `cache` and `cached_db` modes use the configured session cache, so run the
+    command with the same `CACHE_URL`/`SESSION_CACHE_URL` as production (a locmem
+    cache flatters them). All modes run against the configured database.
+
+    Example:
+        python manage.py bench_sessions --requests 500
+        python manage.py bench_sessions --modes db cached_db
+    """
+
+    help = "Benchmark the todo list under each session mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--todos", type=int, default=100, help="Todos of the benchmark user."
+        )
+        parser.add_argument(
+            "--modes", nargs="+", choices=list(settings.SESSION_ENGINES)
+        )
+
+    def handle(self, *args, **options):
+        user = seed_users(1, prefix="bench_sessions")[0]
+        if not Todo.objects.filter(user=user).exists():
+            seed_todos([user], options["todos"])
+        self.stdout.write(
+            f"{'mode':<16} {'queries':>8} {'session':>8} {'saved':>6} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'req/s':>8}"
+        )
+        modes = options["modes"] or list(settings.SESSION_ENGINES)
+        results = {mode: self.bench_mode(user, mode, options) for mode in modes}
+        baseline = results["db"][0] if "db" in results else None
+        for mode, (queries, session_queries, report) in results.items():
+            saved = "-" if baseline is None else f"{baseline - queries:.1f}"
+            self.stdout.write(
+                f"{mode:<16} {queries:>8.1f} {session_queries:>8.1f} {saved:>6} "
+                f"{report['p50_ms']:>8.2f} {report['p95_ms']:>8.2f} "
+                f"{report['rps']:>8.1f}"
+            )
+
+    def bench_mode(self, user, mode, options):
+        """
+        Requests the todo list `--requests` times with the session engine of `mode`.
+
+        Returns:
+            tuple: `(queries, session_queries, report)`, the mean number of queries
+                   per request, of those on the session table, and the latency
+                   report from `summarize`.
+        """
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        engine = settings.SESSION_ENGINES[mode]
+        with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=hosts):
+            # A new client loads the middleware, and so the session engine, afresh.
+            client = Client()
+            client.force_login(user)
+            url = reverse("main")
+            client.get(url)  # Warms the fragment and session caches.
+            latencies = []
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(options["requests"]):
+                    began = time.perf_counter()
+                    client.get(url)
+                    latencies.append(time.perf_counter() - began)
+                elapsed = time.perf_counter() - start
+        session_queries = sum(
+            Session._meta.db_table in query["sql"] for query in queries
+        )
+        return (
+            len(queries) / options["requests"],
+            session_queries / options["requests"],
+            summarize(latencies, elapsed),
+        )
@@ -0,0 +1,105 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory, override_settings
+
+from todo_app.benchmarking import summarize
+from todo_app.cards import card_key, render_cards
+from todo_app.models import Todo
+from todo_app.seeding import seed_todos, seed_users
+from todo_app.views import TodoListView
+
+
+class Command(BaseCommand):
+    """
+    Measures how long the todo list fragment takes to render by number of cards.
+
+    For every `--cards` count the first page of a benchmark user's list is loaded
+    once, and then only the template work is timed, `--repeat` times each:
+
+    - `uncached`: every card is rendered (`TODO_CARD_CACHE_TIMEOUT=0`),
+    - `cold`: the card cache is empty, so every card is rendered and stored,
+    - `warm`: every card comes from the card cache and only the relative dates,
+      the navigation and the stitching are rendered.
+
+    Run it with the production `CACHE_URL`, since the warm numbers include the
+    `get_many()` round trip to the cache.
+
+    Example:
+        python manage.py bench_templates --cards 10 100 999 --repeat 20
+    """
+
+    help = "Benchmark the todo list template by card count, with and without the card cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, nargs="+", default=[10, 100, 500, 999])
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Renders per card count and mode."
+        )
+
+    def handle(self, *args, **options):
+        user = seed_users(1, prefix="bench_templates")[0]
+        missing = max(options["cards"]) - Todo.objects.for_user(user).count()
+        if missing > 0:
+            seed_todos([user], missing)
+        self.stdout.write(
+            f"{'cards':>6} {'mode':<9} {'p50 ms':>8} {'p95 ms':>8} {'us/card':>8}"
+        )
+        for count in options["cards"]:
+            context = self.list_context(user, count)
+            todos = list(context["todo_list"])
+            keys = [card_key(todo) for todo in todos]
+            with override_settings(TODO_CARD_CACHE_TIMEOUT=0):
+                uncached = self.measure(context, options["repeat"])
+            cold = self.measure(
+                context, options["repeat"], before=lambda: cache.delete_many(keys)
+            )
+            warm = self.measure(context, options["repeat"])
+            for mode, report in (
+                ("uncached", uncached),
+                ("cold", cold),
+                ("warm", warm),
+            ):
+                per_card = report["p50_ms"] * 1000 / max(len(todos), 1)
+                self.stdout.write(
+                    f"{len(todos):>6} {mode:<9} {report['p50_ms']:>8.2f} "
+                    f"{report['p95_ms']:>8.2f} {per_card:>8.1f}"
+                )
+
+    def list_context(self, user, count):
+        """
+        Returns the fragment context of the first list page with `count` cards.
+
+        The page is evaluated here, so the timed renders run no queries.
+        """
+        request = RequestFactory().get("/", {"cards_per_page": count})
+        request.user = user
+        view = TodoListView()
+        view.setup(request)
+        view.object_list = view.get_queryset()
+        context = view.get_context_data()
+        context["todo_list"] = list(context["todo_list"])
+        return context
+
+    def measure(self, context, repeat, before=None):
+        """
+        Renders the fragment `repeat` times and returns the `summarize` report.
+
+        Args:
+            context (dict): The context from `list_context`.
+            repeat (int): The number of timed renders.
+            before (callable): Called, untimed, before every render.
+        """
+        latencies = []
+        for _ in range(repeat):
+            if before is not None:
+                before()
+            began = time.perf_counter()
+            render_to_string(
+                TodoListView.fragment_template_name,
+                {**context, "cards": render_cards(context["todo_list"])},
+            )
+            latencies.append(time.perf_counter() - began)
+        return summarize(latencies, sum(latencies))
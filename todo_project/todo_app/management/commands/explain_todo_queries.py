@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from todo_app.models import Todo
+from todo_app.pagination import KeysetPaginator
+from todo_app.seeding import seed_todos, seed_users
+from todo_app.views import TodoListView
+
+
+class Command(BaseCommand):
+    """
+    Prints the query plans of the main todo view queries.
+
+    On PostgreSQL the plans come from `EXPLAIN ANALYZE`, so they show whether the
+    list queries (including every `status`/`sort` combination of `TodoListView`) are
+    served straight from the `Todo.Meta.indexes` or still need a `Sort` node. Other
+    backends print their plain `EXPLAIN` output.
+
+    Example:
+        python manage.py explain_todo_queries --seed-users 10 --seed-todos 20000
+        python manage.py explain_todo_queries --username alice
+    """
+
+    help = "Print EXPLAIN (ANALYZE) output for the todo view queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Explain the queries of this user.")
+        parser.add_argument(
+            "--seed-users",
+            type=int,
+            default=0,
+            help="Seed this many users before explaining.",
+        )
+        parser.add_argument(
+            "--seed-todos",
+            type=int,
+            default=0,
+            help="Seed this many todos per seeded user.",
+        )
+        parser.add_argument(
+            "--per-page", type=int, default=9, help="The page size to explain."
+        )
+        parser.add_argument(
+            "--page", type=int, default=100, help="The deep page to explain."
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options["seed_users"]:
+            users = seed_users(options["seed_users"], prefix="explain")
+            created = seed_todos(users, options["seed_todos"])
+            self.stdout.write(f"Seeded {len(users)} users and {created} todos.")
+            user = users[0]
+        if options["username"]:
+            try:
+                user = get_user_model().objects.get(username=options["username"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['username']!r} does not exist.")
+        if user is None:
+            raise CommandError("Pass --username or --seed-users.")
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Todo._meta.db_table}")
+
+        for label, queryset in self.get_queries(user, options):
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label}"))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(self.explain(queryset))
+
+    def get_queries(self, user, options):
+        """
+        Returns `(label, queryset)` pairs mirroring the queries the views run.
+        """
+        per_page = options["per_page"]
+        offset = per_page * (options["page"] - 1)
+        todos = Todo.objects.for_user(user).for_cards()
+        first = todos.order_by("-published", "-id").first()
+        if first is None:
+            raise CommandError(f"User {user.username!r} has no todos.")
+        keyset_filter = KeysetPaginator(todos, per_page)._after(
+            [first.published, first.id]
+        )
+        filtered = [
+            (
+                f"TodoListView: status={status}, sort={sort}",
+                todos.filter(**filters).order_by(*ordering)[:per_page],
+            )
+            for status, filters in TodoListView.status_filters.items()
+            for sort, ordering in TodoListView.sort_orderings.items()
+        ]
+        return [
+            ("TodoListView: count", todos.order_by().values("pk")),
+            ("TodoListView: first page", todos[:per_page]),
+            (
+                f"TodoListView: page {options['page']} (offset)",
+                todos[offset:][:per_page],
+            ),
+            (
+                "TodoListView: next page (keyset)",
+                todos.filter(keyset_filter).order_by("-published", "-id")[:per_page],
+            ),
+            *filtered,
+            (
+                "TodoUpdateView / TodoDeleteView: get_object",
+                todos.filter(pk=first.pk),
+            ),
+        ]
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from todo_app.transfer import import_todos, parse_csv, parse_ndjson
+
+
+class Command(BaseCommand):
+    """
+    Imports Todo items for a user from an NDJSON or CSV file.
+
+    The file is read line by line and inserted with batched `bulk_create` in one
+    transaction, applying the same validation as the import view: invalid records
+    are skipped, but a file that cannot be read imports nothing.
+
+    Example:
+        python manage.py import_todos alice todos.ndjson
+        python manage.py import_todos alice export.csv --batch-size 5000
+    """
+
+    help = "Import todos for a user from an NDJSON or CSV file."
+
+    parsers = {"ndjson": parse_ndjson, "jsonl": parse_ndjson, "csv": parse_csv}
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="The owner of the imported todos.")
+        parser.add_argument("path", help="The NDJSON or CSV file to import.")
+        parser.add_argument(
+            "--format",
+            choices=("ndjson", "csv"),
+            help="The file format (detected from the extension by default).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of todos per bulk insert.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+        file_format = options["format"] or options["path"].rsplit(".", 1)[-1].lower()
+        if file_format not in self.parsers:
+            raise CommandError("Unknown file format, pass --format.")
+        with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+            try:
+                with transaction.atomic():
+                    result = import_todos(
+                        user,
+                        self.parsers[file_format](lines),
+                        batch_size=options["batch_size"],
+                    )
+            except UnicodeDecodeError:
+                raise CommandError(
+                    "The file must be UTF-8 encoded; nothing was imported."
+                )
+        for number, error in result.errors:
+            self.stderr.write(f"Line {number} skipped: {error}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {result.created} todos."))
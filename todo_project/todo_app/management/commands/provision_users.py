@@ -0,0 +1,101 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todo_app.provisioning import (
+    provision_users,
+    read_checkpoint,
+    write_checkpoint,
+)
+from todo_app.transfer import parse_csv, parse_ndjson
+
+
+class Command(BaseCommand):
+    """
+    Creates user accounts in bulk from a CSV or NDJSON file.
+
+    Every record has a `username` and an `email`, and optionally a `password`,
+    `first_name`, `last_name` and `cards_per_page`. Records are validated like a
+    registration, and users are created with their `UserSettings` in batched
+    `bulk_create`s; passwords are hashed in parallel by `--processes` worker
+    processes. Records whose username or email is taken are skipped.
+
+    After every committed batch the progress is printed and saved to a checkpoint
+    file (`<path>.checkpoint` by default). If the run fails, running the same
+    command again resumes after the last committed batch; `--restart` ignores
+    the checkpoint. The checkpoint is removed once the whole file was processed.
+
+    Example:
+        python manage.py provision_users acme.csv
+        python manage.py provision_users acme.ndjson --batch-size 2000 --processes 8
+    """
+
+    help = "Create users and their settings in bulk from a CSV or NDJSON file."
+
+    parsers = {"ndjson": parse_ndjson, "jsonl": parse_ndjson, "csv": parse_csv}
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The NDJSON or CSV file of users.")
+        parser.add_argument(
+            "--format",
+            choices=("ndjson", "csv"),
+            help="The file format (detected from the extension by default).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of users per batch and transaction.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help="The number of password hashing processes (default: CPU count).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="The progress file to resume from (default: <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Start from the first record, ignoring the checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or options["path"].rsplit(".", 1)[-1].lower()
+        if file_format not in self.parsers:
+            raise CommandError("Unknown file format, pass --format.")
+        checkpoint = options["checkpoint"] or f"{options['path']}.checkpoint"
+        result = None if options["restart"] else read_checkpoint(checkpoint)
+        if result is not None:
+            self.stdout.write(f"Resuming after line {result.line}.")
+        started = time.perf_counter()
+        created_before = result.created if result else 0
+
+        def on_batch(result):
+            write_checkpoint(checkpoint, result)
+            rate = (result.created - created_before) / (time.perf_counter() - started)
+            self.stdout.write(
+                f"Line {result.line}: {result.created} created, {result.existing} "
+                f"existing, {len(result.errors)} rejected ({rate:.0f} users/s)"
+            )
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+            result = provision_users(
+                self.parsers[file_format](lines),
+                batch_size=options["batch_size"],
+                processes=options["processes"],
+                result=result,
+                on_batch=on_batch,
+            )
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        for number, error in result.errors:
+            self.stderr.write(f"Line {number} skipped: {error}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users ({result.existing} already existed)."
+            )
+        )
@@ -0,0 +1,54 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired sessions from the session table in batches.
+
+    Django's `clearsessions` removes every expired row with one `DELETE`, which on a
+    large `django_session` table holds its locks for as long as the whole delete
+    takes. This command deletes the rows in batches of `--batch-size` keys (found
+    through the `expire_date` index), each in its own short transaction, so it can
+    run against a live database, e.g. as a daily cron job.
+
+    The `cache` and `signed_cookies` session modes keep no rows: the cache expires
+    sessions by itself and cookies expire in the browser. For those the command
+    falls back to the engine's own `clear_expired()`, which does nothing.
+
+    Example:
+        python manage.py purge_expired_sessions
+        python manage.py purge_expired_sessions --batch-size 5000
+    """
+
+    help = "Delete expired sessions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of sessions deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, "get_model_class"):
+            store.clear_expired()
+            self.stdout.write(f"{settings.SESSION_ENGINE} keeps no session rows.")
+            return
+        expired = store.get_model_class().objects.filter(expire_date__lt=timezone.now())
+        purged = 0
+        while True:
+            with transaction.atomic():
+                keys = list(
+                    expired.values_list("pk", flat=True)[: options["batch_size"]]
+                )
+                if not keys:
+                    break
+                purged += expired.filter(pk__in=keys).delete()[0]
+        self.stdout.write(f"Purged {purged} expired sessions.")
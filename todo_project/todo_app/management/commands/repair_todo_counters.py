@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from todo_app.repository import recount_todo_counters
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the denormalized `TodoCounter` rows from the Todo table.
+
+    Users are processed in primary-key batches, each batch costing one grouped
+    `COUNT` query and one upsert, so the command can run against a live database.
+
+    Example:
+        python manage.py repair_todo_counters --batch-size 500
+        python manage.py repair_todo_counters --user-id 42
+    """
+
+    help = "Recompute the per-user todo counters in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of users recounted per batch.",
+        )
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only recount these users (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("pk")
+        if options["user_ids"]:
+            users = users.filter(pk__in=options["user_ids"])
+        batch_size = options["batch_size"]
+        last_pk = None
+        repaired = 0
+        while True:
+            batch = users if last_pk is None else users.filter(pk__gt=last_pk)
+            user_ids = list(batch.values_list("pk", flat=True)[:batch_size])
+            if not user_ids:
+                break
+            recount_todo_counters(user_ids)
+            repaired += len(user_ids)
+            last_pk = user_ids[-1]
+            self.stdout.write(f"Recounted {repaired} users (up to id {last_pk}).")
+        self.stdout.write(self.style.SUCCESS(f"Done, {repaired} users recounted."))
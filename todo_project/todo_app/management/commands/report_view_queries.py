@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from todo_app.cache import bump_list_version
+from todo_app.models import Todo
+from todo_app.seeding import seed_todos, seed_users
+
+
+class Command(BaseCommand):
+    """
+    Prints the number of SQL queries each todo view runs for one request.
+
+    The views are requested in-process with the test `Client` as a seeded user, and
+    the queries are captured per request, so the report shows regressions such as a
+    lazy foreign key load or an extra `COUNT(*)`. The list is measured twice: with a
+    cold fragment cache (the list version is bumped first) and with a warm one.
+
+    Example:
+        python manage.py report_view_queries
+        python manage.py report_view_queries --todos 100 --verbosity 2  # Also print the SQL.
+    """
+
+    help = "Report the number of SQL queries per todo view request."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--todos", type=int, default=30, help="Todos of the report user."
+        )
+
+    def handle(self, *args, **options):
+        user = seed_users(1, prefix="query_report")[0]
+        if not Todo.objects.filter(user=user).exists():
+            seed_todos([user], options["todos"])
+        todo_id, other_id = Todo.objects.filter(user=user).values_list("pk", flat=True)[
+            :2
+        ]
+        # The session authenticates the views, the bearer token the JSON API.
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        client.force_login(user)
+        edit = reverse("edit_todo", args=[todo_id])
+        delete = reverse("delete_todo", args=[other_id])
+        requests = [
+            ("list (cold cache)", "get", reverse("main"), None, True),
+            ("list (warm cache)", "get", reverse("main"), None, False),
+            ("list page 2", "get", reverse("main") + "?page=2", None, True),
+            ("list search", "get", reverse("main") + "?q=task", None, True),
+            ("create (GET)", "get", reverse("create_todo"), None, False),
+            (
+                "create (POST)",
+                "post",
+                reverse("create_todo"),
+                {"title": "Report", "description": "Query report"},
+                False,
+            ),
+            ("edit (GET)", "get", edit, None, False),
+            (
+                "edit (POST)",
+                "post",
+                edit,
+                {"title": "Edited", "description": "Query report", "completed": "on"},
+                False,
+            ),
+            ("delete (GET)", "get", delete, None, False),
+            ("delete (POST)", "post", delete, None, False),
+            ("export", "get", reverse("export_todos"), None, False),
+            ("api list", "get", reverse("api-v1:todo-list"), None, False),
+        ]
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        with override_settings(ALLOWED_HOSTS=hosts):
+            for label, method, url, data, cold in requests:
+                if cold:
+                    bump_list_version(user.pk)
+                with CaptureQueriesContext(connection) as queries:
+                    response = getattr(client, method)(url, data)
+                    if getattr(response, "streaming", False):
+                        b"".join(response.streaming_content)
+                self.stdout.write(
+                    f"{label:<20} {response.status_code:>4} {len(queries):>3} queries"
+                )
+                if options["verbosity"] > 1:
+                    for query in queries:
+                        self.stdout.write(f"    {query['sql']}")
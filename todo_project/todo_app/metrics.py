@@ -0,0 +1,171 @@
+"""
+Prometheus metrics of the HTTP requests, served at `/internal/metrics`.
+
+`MetricsMiddleware` records, per URL name (`request.resolver_match.view_name`,
+so the label set stays small), method and status:
+
+- `todo_requests_total`: a counter of the responses,
+- `todo_request_duration_seconds`: a histogram of the latency,
+- `todo_request_queries`: a histogram of the SQL statements per request,
+- `todo_requests_in_flight`: a gauge of the requests being handled.
+
+Every worker process of gunicorn or uvicorn has its own memory, so a scrape that
+reached one worker would only see its share. When `PROMETHEUS_MULTIPROC_DIR` is
+set (`gunicorn.conf.py` sets it), `prometheus_client` keeps the values in
+mmap-backed files in that directory, and `metrics_view` sums the files of all
+workers. The directory must be emptied when the server starts (`gunicorn.conf.py`
+does), and must be set before the first import of `prometheus_client`.
+"""
+
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .timing import current_timings, install_query_recorders, measure
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+REQUESTS = Counter(
+    "todo_requests_total",
+    "HTTP responses by URL name, method and status code.",
+    ["view", "method", "status"],
+)
+LATENCY = Histogram(
+    "todo_request_duration_seconds",
+    "HTTP request latency by URL name and method.",
+    ["view", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+QUERIES = Histogram(
+    "todo_request_queries",
+    "SQL statements per HTTP request by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+IN_FLIGHT = Gauge(
+    "todo_requests_in_flight",
+    "HTTP requests being handled.",
+    multiprocess_mode="livesum",
+)
+
+
+def observe(request, response, duration, queries):
+    """
+    Records one finished request.
+
+    Args:
+        request (HttpRequest): The request; unresolved URLs (404s, static files)
+                               are labelled `"none"`.
+        response (HttpResponse): The response.
+        duration (float): The latency in seconds.
+        queries (int): The number of SQL statements.
+    """
+    match = request.resolver_match
+    view = match.view_name if match else "none"
+    method = request.method if request.method in METHODS else "other"
+    REQUESTS.labels(view, method, response.status_code).inc()
+    LATENCY.labels(view, method).observe(duration)
+    QUERIES.labels(view).observe(queries)
+
+
+class MetricsMiddleware:
+    """
+    Records the Prometheus metrics of every request.
+
+    It reuses the query count of `timing.ServerTimingMiddleware` when that runs
+    before it, and otherwise measures the request itself.
+
+    Raises:
+        MiddlewareNotUsed: If `settings.TODO_METRICS` is disabled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TODO_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_query_recorders()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            timings = current_timings()
+            if timings is None:
+                with measure(request.path, count_shapes=False) as timings:
+                    response = self.get_response(request)
+            else:
+                response = self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+        observe(request, response, time.perf_counter() - started, timings.queries)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            timings = current_timings()
+            if timings is None:
+                with measure(request.path, count_shapes=False) as timings:
+                    response = await self.get_response(request)
+            else:
+                response = await self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+        observe(request, response, time.perf_counter() - started, timings.queries)
+        return response
+
+
+def can_read_metrics(request):
+    """
+    Returns whether the request may read the metrics.
+
+    Allowed are requests with `Authorization: Bearer <TODO_METRICS_TOKEN>` (for the
+    Prometheus scraper), requests from `TODO_METRICS_ALLOWED_IPS` and staff users.
+    """
+    token = settings.TODO_METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    if token and constant_time_compare(authorization, f"Bearer {token}"):
+        return True
+    if request.META.get("REMOTE_ADDR") in settings.TODO_METRICS_ALLOWED_IPS:
+        return True
+    return request.user.is_staff
+
+
+def metrics_view(request):
+    """
+    Serves the metrics of all worker processes in the Prometheus text format.
+
+    Raises:
+        PermissionDenied: If `can_read_metrics()` is false.
+    """
+    if not can_read_metrics(request):
+        raise PermissionDenied
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+
+from todo_app.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("todo_app", "0002_usersettings"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "-published", "-id"],
+                name="todo_user_published_idx",
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="todo",
+            index=models.Index(
+                condition=models.Q(("completed", False)),
+                fields=["user", "-published", "-id"],
+                name="todo_user_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    Todo = apps.get_model("todo_app", "Todo")
+    TodoCounter = apps.get_model("todo_app", "TodoCounter")
+    db_alias = schema_editor.connection.alias
+    counts = (
+        Todo.objects.using(db_alias)
+        .order_by()
+        .values("user_id")
+        .annotate(total=Count("id"), completed=Count("id", filter=Q(completed=True)))
+    )
+    TodoCounter.objects.using(db_alias).bulk_create(
+        (
+            TodoCounter(
+                user_id=row["user_id"],
+                total=row["total"],
+                completed=row["completed"],
+                pending=row["total"] - row["completed"],
+            )
+            for row in counts.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0003_todo_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="todo_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+                ("completed", models.IntegerField(default=0)),
+                ("pending", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
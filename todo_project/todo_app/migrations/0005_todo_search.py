@@ -0,0 +1,107 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+from todo_app.operations import RunSQLForVendor
+
+# The vector weighs the title above the description. Keep it in sync with
+# `search.SEARCH_CONFIG`.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('pg_catalog.english', coalesce({0}.title, '')), 'A') || "
+    "setweight(to_tsvector('pg_catalog.english', coalesce({0}.description, '')), 'B')"
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("todo_app", "0004_todocounter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todo",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        RunSQLForVendor(
+            "postgresql",
+            sql=[
+                f"""
+                CREATE FUNCTION todo_app_todo_search_vector() RETURNS trigger AS $$
+                BEGIN
+                    NEW.search_vector := {SEARCH_VECTOR.format("NEW")};
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+                """,
+                """
+                CREATE TRIGGER todo_app_todo_search_vector
+                BEFORE INSERT OR UPDATE OF title, description ON todo_app_todo
+                FOR EACH ROW EXECUTE FUNCTION todo_app_todo_search_vector()
+                """,
+                "UPDATE todo_app_todo SET search_vector = "
+                + SEARCH_VECTOR.format("todo_app_todo"),
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS todo_app_todo_search_vector ON todo_app_todo",
+                "DROP FUNCTION IF EXISTS todo_app_todo_search_vector()",
+            ],
+        ),
+        RunSQLForVendor(
+            "postgresql",
+            sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS todo_search_vector_idx "
+            "ON todo_app_todo USING gin (search_vector)",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS todo_search_vector_idx",
+        ),
+        # SQLite keeps an external-content FTS5 table in sync with triggers. Note that
+        # SQLite rebuilds a table (dropping its triggers) on most ALTERs, so a later
+        # migration altering `Todo` has to recreate them.
+        RunSQLForVendor(
+            "sqlite",
+            sql=[
+                """
+                CREATE VIRTUAL TABLE todo_app_todo_fts USING fts5(
+                    title, description,
+                    content='todo_app_todo', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+                """,
+                """
+                CREATE TRIGGER todo_app_todo_fts_insert AFTER INSERT ON todo_app_todo
+                BEGIN
+                    INSERT INTO todo_app_todo_fts (rowid, title, description)
+                    VALUES (new.id, new.title, new.description);
+                END
+                """,
+                """
+                CREATE TRIGGER todo_app_todo_fts_delete AFTER DELETE ON todo_app_todo
+                BEGIN
+                    INSERT INTO todo_app_todo_fts (todo_app_todo_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                END
+                """,
+                """
+                CREATE TRIGGER todo_app_todo_fts_update
+                AFTER UPDATE OF title, description ON todo_app_todo
+                BEGIN
+                    INSERT INTO todo_app_todo_fts (todo_app_todo_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                    INSERT INTO todo_app_todo_fts (rowid, title, description)
+                    VALUES (new.id, new.title, new.description);
+                END
+                """,
+                "INSERT INTO todo_app_todo_fts (todo_app_todo_fts) VALUES ('rebuild')",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS todo_app_todo_fts_update",
+                "DROP TRIGGER IF EXISTS todo_app_todo_fts_delete",
+                "DROP TRIGGER IF EXISTS todo_app_todo_fts_insert",
+                "DROP TABLE IF EXISTS todo_app_todo_fts",
+            ],
+        ),
+    ]
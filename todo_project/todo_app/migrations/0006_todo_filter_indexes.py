@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+from todo_app.operations import (
+    AddIndexConcurrentlyIfSupported,
+    RemoveIndexConcurrentlyIfSupported,
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("todo_app", "0005_todo_search"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "completed", "-published", "-id"],
+                name="todo_user_status_idx",
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "title", "id"], name="todo_user_title_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "completed", "title", "id"],
+                name="todo_user_status_title_idx",
+            ),
+        ),
+        # Superseded by `todo_user_status_idx`, which also serves completed todos.
+        RemoveIndexConcurrentlyIfSupported(
+            model_name="todo",
+            name="todo_user_pending_idx",
+        ),
+    ]
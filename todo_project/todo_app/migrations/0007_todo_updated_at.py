@@ -0,0 +1,62 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+from todo_app.operations import RunSQLForVendor
+
+# The FTS5 triggers of migration 0005, recreated after SQLite rebuilt the table.
+FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_app_todo_fts_insert AFTER INSERT ON todo_app_todo
+    BEGIN
+        INSERT INTO todo_app_todo_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_app_todo_fts_delete AFTER DELETE ON todo_app_todo
+    BEGIN
+        INSERT INTO todo_app_todo_fts (todo_app_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_app_todo_fts_update
+    AFTER UPDATE OF title, description ON todo_app_todo
+    BEGIN
+        INSERT INTO todo_app_todo_fts (todo_app_todo_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todo_app_todo_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def copy_published(apps, schema_editor):
+    Todo = apps.get_model("todo_app", "Todo")
+    Todo.objects.update(updated_at=models.F("published"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0006_todo_filter_indexes"),
+    ]
+
+    operations = [
+        # Restores the SQLite FTS5 triggers when the migration is reversed (removing
+        # the column rebuilds the table again).
+        RunSQLForVendor("sqlite", sql=[], reverse_sql=FTS_TRIGGERS),
+        migrations.AddField(
+            model_name="todo",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        # Adding a NOT NULL column rebuilds the table on SQLite, which drops the
+        # FTS5 triggers of migration 0005.
+        RunSQLForVendor("sqlite", sql=FTS_TRIGGERS, reverse_sql=[]),
+        migrations.RunPython(copy_published, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,48 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 # Create your models here.
 
 
+class TodoQuerySet(models.QuerySet):
+    """
+    The queryset (and, via `as_manager()`, the manager) of `Todo`.
+
+    It gives the views one place for ownership scoping and column projections:
+    ownership is filtered on the `user_id` column, so no user row is joined or
+    loaded, and each view loads only the columns it renders or writes.
+
+    Attributes:
+        card_fields (tuple): The fields rendered by a card of the Todo list, plus `updated_at`,
+                             which keys the card cache (see `cards.py`).
+        edit_fields (tuple): The fields used by the update and delete views (and their signals).
+
+    Methods:
+        for_user(user): Returns the Todo items owned by `user`.
+        for_cards(): Loads only `card_fields`.
+        for_edit(): Loads only `edit_fields`.
+
+    Example:
+        Todo.objects.for_user(request.user).for_cards()[:9]
+    """
+
+    card_fields = ("title", "description", "completed", "published", "updated_at")
+    edit_fields = ("user", "title", "description", "completed", "updated_at")
+
+    def for_user(self, user):
+        return self.filter(user_id=user.pk)
+
+    def for_cards(self):
+        return self.only(*self.card_fields)
+
+    def for_edit(self):
+        # Saving an instance with deferred fields writes only the loaded ones, so
+        # `save()` never sends `published` or `search_vector` back. `updated_at`
+        # has to be loaded, or `auto_now` would not be written either.
+        return self.only(*self.edit_fields)
+
+
 class Todo(models.Model):
     """
     Represents a Todo item in the application.
@@ -16,11 +55,19 @@ class Todo(models.Model):
         description (CharField): A description of the Todo item, with a maximum length of 300 characters.
         completed (BooleanField): A boolean flag indicating whether the Todo item is completed. Defaults to False.
         published (DateTimeField): The timestamp of when the Todo item was created. Automatically set to the current time.
+        updated_at (DateTimeField): The timestamp of the last change, used as the validator of conditional GETs.
+                                    Bulk updates (`update()`, `bulk_update()`) have to set it explicitly.
         user (ForeignKey): A foreign key linking the Todo item to a specific user. The user is required and the relationship is set to cascade on delete.
+        search_vector (SearchVectorField): The weighted full-text vector of `title` and `description`.
+                                           It is maintained by a database trigger on PostgreSQL and stays
+                                           empty elsewhere (see `search.py`).
 
     Methods:
         __str__(): Returns a string representation of the Todo instance, typically the title of the task.
 
+    Managers:
+        objects (TodoQuerySet): Adds `for_user()`, `for_cards()` and `for_edit()`.
+
     Example:
         todo = Todo.objects.create(title="My Todo", description="Task description", user=user)
         todo.completed = True
@@ -31,12 +78,37 @@ class Todo(models.Model):
     description = models.CharField(max_length=300, blank=False)
     completed = models.BooleanField(default=False)
     published = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, default=1
     )
+    # Written by the `todo_app_todo_search_vector` trigger and indexed by the
+    # `todo_search_vector_idx` GIN index, both created in migration 0005 on PostgreSQL
+    # only, so they also cover `bulk_create()` and `update()`.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TodoQuerySet.as_manager()
 
     class Meta:
         ordering = ["-published"]
+        indexes = [
+            # Serve every per-user list query (see `TodoListView.sort_orderings`)
+            # without a sort step: `-published`/`-id` is read forwards for "newest"
+            # and backwards for "oldest", `title`/`id` for "title", and the
+            # `completed` variants for the pending/completed filters.
+            models.Index(
+                fields=["user", "-published", "-id"], name="todo_user_published_idx"
+            ),
+            models.Index(
+                fields=["user", "completed", "-published", "-id"],
+                name="todo_user_status_idx",
+            ),
+            models.Index(fields=["user", "title", "id"], name="todo_user_title_idx"),
+            models.Index(
+                fields=["user", "completed", "title", "id"],
+                name="todo_user_status_title_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -70,3 +142,37 @@ class UserSettings(models.Model):
 
     def __str__(self):
         return self.user
+
+
+class TodoCounter(models.Model):
+    """
+    Holds denormalized Todo counts for a user.
+
+    The counts replace `COUNT(*)` queries on the Todo list: pagination reads a single
+    row by primary key instead of scanning every Todo of the user. They are kept up to
+    date with atomic `F()` updates by the `Todo` signals and the bulk helpers in
+    `repository.py`, and can be rebuilt with `manage.py repair_todo_counters`.
+
+    Attributes:
+        user (OneToOneField): The user the counts belong to, also the primary key.
+        total (IntegerField): The number of Todo items of the user.
+        completed (IntegerField): The number of completed Todo items.
+        pending (IntegerField): The number of Todo items that are not completed yet.
+
+    Example:
+        counter = repository.get_todo_counter(user)
+        counter.pending  # The number of pending todos, without a COUNT(*) query.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="todo_counter",
+    )
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.completed}/{self.total}"
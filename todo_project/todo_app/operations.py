@@ -0,0 +1,109 @@
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db.migrations.operations import AddIndex, RemoveIndex, RunSQL
+
+
+class AddIndexConcurrentlyIfSupported(AddIndexConcurrently):
+    """
+    A migration operation that builds an index without locking the table.
+
+    On PostgreSQL it runs `CREATE INDEX CONCURRENTLY`, so writes to large tables keep
+    flowing while the index is built. Other backends (e.g. SQLite used in development)
+    have no concurrent builds, so the operation falls back to a plain `AddIndex`.
+
+    The migration using it must set `atomic = False`, because PostgreSQL does not allow
+    concurrent index builds inside a transaction.
+
+    Example:
+        operations = [
+            AddIndexConcurrentlyIfSupported(
+                model_name="todo",
+                index=models.Index(fields=["user", "-published"], name="todo_idx"),
+            ),
+        ]
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        return AddIndex.database_forwards(
+            self, app_label, schema_editor, from_state, to_state
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        return AddIndex.database_backwards(
+            self, app_label, schema_editor, from_state, to_state
+        )
+
+
+class RemoveIndexConcurrentlyIfSupported(RemoveIndexConcurrently):
+    """
+    The counterpart of `AddIndexConcurrentlyIfSupported`: runs `DROP INDEX
+    CONCURRENTLY` on PostgreSQL and a plain `RemoveIndex` elsewhere.
+
+    The migration using it must set `atomic = False`.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        return RemoveIndex.database_forwards(
+            self, app_label, schema_editor, from_state, to_state
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        return RemoveIndex.database_backwards(
+            self, app_label, schema_editor, from_state, to_state
+        )
+
+
+class RunSQLForVendor(RunSQL):
+    """
+    A `RunSQL` operation that only runs on one database vendor.
+
+    It is used for schema objects Django has no portable operation for, such as the
+    PostgreSQL full-text search trigger and the SQLite FTS5 table. On other vendors
+    the operation is a no-op, so one migration can carry the SQL for every backend.
+
+    Attributes:
+        vendor (str): The `connection.vendor` the SQL is written for, e.g. `"postgresql"`.
+
+    Example:
+        operations = [
+            RunSQLForVendor(
+                "postgresql",
+                sql="CREATE INDEX ... USING gin (search_vector)",
+                reverse_sql="DROP INDEX ...",
+            ),
+        ]
+    """
+
+    def __init__(self, vendor, sql, reverse_sql=None, **kwargs):
+        self.vendor = vendor
+        super().__init__(sql, reverse_sql, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, args, {"vendor": self.vendor, **kwargs}
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
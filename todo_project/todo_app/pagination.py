@@ -0,0 +1,280 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+
+
+class CountedPaginator(Paginator):
+    """
+    A `Paginator` that is given its item count instead of running `COUNT(*)`.
+
+    The Todo list passes the denormalized `TodoCounter` value, so numbered pages
+    cost a primary-key lookup rather than a scan over all of the user's Todo items.
+
+    Attributes:
+        known_count (int): The number of items, used as `count`. If `None`, the
+                           paginator counts the items like `Paginator` does.
+
+    Example:
+        paginator = CountedPaginator(todos, 9, count=get_todo_counter(user).total)
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = count
+
+    @property
+    def count(self):
+        if self.known_count is None:
+            self.known_count = super().count
+        return self.known_count
+
+
+class InvalidCursor(InvalidPage):
+    """
+    Raised when a pagination cursor cannot be decoded.
+
+    It subclasses `InvalidPage`, so `ListView.paginate_queryset` turns it into a 404
+    exactly like an out-of-range page number.
+    """
+
+
+class KeysetPaginator:
+    """
+    A paginator that walks a queryset by key values instead of `OFFSET`.
+
+    Every page is fetched with a `WHERE (key) < (cursor) ... LIMIT per_page + 1` query,
+    so the cost of a page does not depend on how deep it is. The keys must form a total
+    order, which is why the primary key is always the last field of `ordering`.
+
+    Attributes:
+        object_list (QuerySet): The queryset to paginate.
+        per_page (int): The number of items per page.
+        ordering (tuple): The ordering fields or annotations, e.g. `("-published", "-id")`.
+        with_count (bool): Whether `count` should be reported at all.
+        known_count (int): The item count, if known; otherwise `count` runs `COUNT(*)`.
+
+    Methods:
+        page(cursor): Returns the `KeysetPage` for an opaque cursor (or the first page).
+        encode_cursor(obj, direction): Builds an opaque cursor pointing at `obj`.
+        decode_cursor(cursor): Decodes an opaque cursor into `(direction, values)`.
+
+    Example:
+        paginator = KeysetPaginator(Todo.objects.for_user(user), 9)
+        page = paginator.page(request.GET.get("cursor"))
+        page.next_cursor  # Pass back as `?cursor=...` to get the next page.
+    """
+
+    NEXT = "n"
+    PREVIOUS = "p"
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        ordering=("-published", "-id"),
+        with_count=True,
+        count=None,
+    ):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.with_count = with_count
+        self.known_count = count
+        self.model = object_list.model
+
+    @property
+    def count(self):
+        """
+        Returns the total number of items, or `None` when counting is disabled.
+        """
+        if not self.with_count:
+            return None
+        if self.known_count is None:
+            self.known_count = self.object_list.count()
+        return self.known_count
+
+    def _fields(self):
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        """
+        Builds an opaque cursor for the position of `obj`.
+
+        Args:
+            obj (Model | dict): The boundary object (or `values()` row) of the current page.
+            direction (str): `KeysetPaginator.NEXT` or `KeysetPaginator.PREVIOUS`.
+
+        Returns:
+            str: A URL-safe cursor string.
+        """
+        values = [
+            obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            for name, _ in self._fields()
+        ]
+        # Keys are serialized at full precision: `DjangoJSONEncoder` truncates
+        # datetimes to milliseconds, which would skip or repeat rows.
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        ]
+        payload = json.dumps({"d": direction, "v": values})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+        Decodes an opaque cursor back into a direction and typed key values.
+
+        Args:
+            cursor (str): A cursor produced by `encode_cursor`.
+
+        Returns:
+            tuple: `(direction, values)`.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_values = payload["d"], payload["v"]
+            fields = self._fields()
+            if direction not in (self.NEXT, self.PREVIOUS) or len(raw_values) != len(
+                fields
+            ):
+                raise ValueError
+            values = [
+                self._get_field(name).to_python(value)
+                for (name, _), value in zip(fields, raw_values)
+            ]
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            TypeError,
+            KeyError,
+            ValidationError,
+        ):
+            raise InvalidCursor("Invalid cursor.")
+        return direction, values
+
+    def _get_field(self, name):
+        """
+        Returns the field of an ordering key: a model field, or the output field of an
+        annotation such as a search rank.
+        """
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return self.object_list.query.annotations[name].output_field
+
+    def _after(self, values, reverse=False):
+        """
+        Builds the `Q` filter selecting rows that come after `values` in the ordering
+        (or before them when `reverse` is set).
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self._fields(), values):
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _page_query(self, cursor):
+        direction, values = self.decode_cursor(cursor) if cursor else (self.NEXT, None)
+        backwards = direction == self.PREVIOUS
+        queryset = self.object_list
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse=backwards))
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(
+                name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+            )
+        return queryset.order_by(*ordering)[: self.per_page + 1], values, backwards
+
+    def _build_page(self, rows, values, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+            return KeysetPage(self, rows, has_next=True, has_previous=has_more)
+        return KeysetPage(
+            self, rows, has_next=has_more, has_previous=values is not None
+        )
+
+    def page(self, cursor=None):
+        """
+        Returns the page located by `cursor`.
+
+        Args:
+            cursor (str, optional): An opaque cursor; the first page is returned if empty.
+
+        Returns:
+            KeysetPage: The requested page.
+        """
+        queryset, values, backwards = self._page_query(cursor)
+        return self._build_page(list(queryset), values, backwards)
+
+    async def apage(self, cursor=None):
+        """
+        Async version of `page()`, fetching the rows with the async ORM.
+        """
+        queryset, values, backwards = self._page_query(cursor)
+        return self._build_page([row async for row in queryset], values, backwards)
+
+
+class KeysetPage(Sequence):
+    """
+    A single page produced by `KeysetPaginator`.
+
+    It mirrors the parts of Django's `Page` API that templates use, and exposes
+    opaque `next_cursor` / `previous_cursor` values instead of page numbers.
+
+    Attributes:
+        paginator (KeysetPaginator): The paginator that produced the page.
+        object_list (list): The objects on this page.
+    """
+
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_next = has_next and bool(object_list)
+        self._has_previous = has_previous and bool(object_list)
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self.object_list)} items>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], KeysetPaginator.NEXT)
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[0], KeysetPaginator.PREVIOUS
+        )
@@ -0,0 +1,229 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from app_auth.forms import ProvisionUserForm
+
+from .models import UserSettings
+
+
+@dataclass
+class ProvisionResult:
+    """
+    The progress and outcome of `provision_users`.
+
+    Attributes:
+        created (int): The number of users created.
+        existing (int): The number of records skipped because the username or email
+                        is already taken (e.g. by an earlier, interrupted run).
+        errors (list): `(line_number, message)` pairs for the rejected records.
+        line (int): The last line number processed and committed.
+    """
+
+    created: int = 0
+    existing: int = 0
+    errors: list = field(default_factory=list)
+    line: int = 0
+
+
+def read_checkpoint(path):
+    """
+    Returns the `ProvisionResult` saved by `write_checkpoint`, or `None`.
+    """
+    try:
+        with open(path, encoding="utf-8") as fp:
+            return ProvisionResult(**json.load(fp))
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, result):
+    """
+    Atomically saves the progress of a provisioning run.
+
+    The file is written next to its final name and renamed over it, so a crash
+    while writing leaves the previous checkpoint intact.
+
+    Args:
+        path (str): The checkpoint file.
+        result (ProvisionResult): The progress after the last committed batch.
+    """
+    with open(f"{path}.tmp", "w", encoding="utf-8") as fp:
+        json.dump(asdict(result), fp)
+    os.replace(f"{path}.tmp", path)
+
+
+def _setup_worker():
+    # Spawned (not forked) workers start without configured settings.
+    django.setup()
+
+
+def _untaken(records):
+    """
+    Returns the records whose username and email are free.
+
+    Usernames are compared case-insensitively, like registration does, so `Alice`
+    is taken by `alice`. A record is also skipped if an earlier record of the same
+    list claims its username or email. One query checks all records.
+
+    Args:
+        records (list): Cleaned data of `ProvisionUserForm`.
+
+    Returns:
+        list: The records that can be created, in their original order.
+    """
+    taken = (
+        get_user_model()
+        .objects.annotate(username_lower=Lower("username"))
+        .filter(
+            Q(username_lower__in=[record["username"].lower() for record in records])
+            | Q(email__in=[record["email"] for record in records])
+        )
+        .values_list("username_lower", "email")
+    )
+    usernames = {username for username, _ in taken}
+    emails = {email for _, email in taken}
+    untaken = []
+    for record in records:
+        username = record["username"].lower()
+        if username in usernames or record["email"] in emails:
+            continue
+        usernames.add(username)
+        emails.add(record["email"])
+        untaken.append(record)
+    return untaken
+
+
+def _create_users(users, records, default_page_size):
+    """
+    Inserts the users of one batch with their `UserSettings` in one transaction.
+    """
+    User = get_user_model()
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        pks = dict(
+            User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list("username", "pk")
+        )
+        UserSettings.objects.bulk_create(
+            UserSettings(
+                user_id=pks[record["username"]],
+                cards_per_page=record["cards_per_page"] or default_page_size,
+            )
+            for record in records
+        )
+
+
+def provision_users(
+    items,
+    batch_size=1000,
+    processes=None,
+    result=None,
+    on_batch=None,
+    max_errors=100,
+):
+    """
+    Validates user records and creates the users with their `UserSettings` in batches.
+
+    For every batch of `batch_size` records:
+
+    1. Each record is validated with `ProvisionUserForm`.
+    2. Usernames (case-insensitively) and emails already taken, in the database
+       or earlier in the batch, are skipped; one query checks the whole batch.
+    3. The passwords are hashed in parallel on a pool of `processes` worker
+       processes, since the hasher is CPU-bound by design.
+    4. The users and their `UserSettings` are inserted with `bulk_create` in one
+       transaction. `bulk_create` sends no `post_save`, so `create_user_settings`
+       does not add an INSERT per user. If a concurrent signup takes a username
+       or email in the meantime, the batch is checked again and retried.
+
+    Records up to `result.line` are skipped, so a run can resume from the result
+    of an interrupted one (see `read_checkpoint`). A batch that was committed but
+    not yet reported is found again as existing users.
+
+    Args:
+        items (Iterable[tuple]): `(line_number, record)` pairs from `transfer.parse_csv`
+                                 or `transfer.parse_ndjson`.
+        batch_size (int): The number of records per batch and transaction.
+        processes (int): The number of hashing processes, defaults to the CPU count.
+        result (ProvisionResult): The progress to resume from.
+        on_batch (callable): Called with the result after every committed batch.
+        max_errors (int): The number of errors kept in the result.
+
+    Returns:
+        ProvisionResult: The number of created and existing users and the rejected
+                         records.
+    """
+    User = get_user_model()
+    default_page_size = UserSettings._meta.get_field("cards_per_page").get_default()
+    result = result or ProvisionResult()
+    resume_after = result.line
+    iterator = (item for item in items if item[0] > resume_after)
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+    with ProcessPoolExecutor(processes, initializer=_setup_worker) as pool:
+        while chunk := list(islice(iterator, batch_size)):
+            records = []
+            for number, item in chunk:
+                if item is None:
+                    error = "Not a valid record."
+                else:
+                    form = ProvisionUserForm(data=item)
+                    if form.is_valid():
+                        records.append(form.cleaned_data)
+                        continue
+                    error = "; ".join(
+                        f"{name}: {' '.join(messages)}"
+                        for name, messages in form.errors.items()
+                    )
+                if len(result.errors) < max_errors:
+                    result.errors.append((number, error))
+            new = _untaken(records)
+            passwords = pool.map(
+                make_password,
+                [record["password"] or None for record in new],
+                chunksize=max(1, len(new) // ((processes or os.cpu_count()) * 4)),
+            )
+            users = [
+                User(
+                    username=record["username"],
+                    email=record["email"],
+                    first_name=record["first_name"],
+                    last_name=record["last_name"],
+                    password=password,
+                )
+                for record, password in zip(new, passwords)
+            ]
+            while True:
+                try:
+                    _create_users(users, new, default_page_size)
+                    break
+                except IntegrityError:
+                    # A username or email was taken after the check, e.g. by a
+                    # signup. The batch was rolled back; check it again.
+                    kept = _untaken(new)
+                    if len(kept) == len(new):
+                        raise
+                    kept_ids = {id(record) for record in kept}
+                    users = [
+                        user
+                        for user, record in zip(users, new)
+                        if id(record) in kept_ids
+                    ]
+                    new = kept
+            result.existing += len(records) - len(new)
+            result.created += len(users)
+            result.line = chunk[-1][0]
+            if on_batch is not None:
+                on_batch(result)
+    return result
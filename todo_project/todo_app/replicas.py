@@ -0,0 +1,198 @@
+"""
+Routing of read queries to the read replicas of the database.
+
+`settings.TODO_DB_REPLICAS` lists the aliases of the replicas (configured with
+`TODO_DB_REPLICA_URLS`). `ReplicaMiddleware` picks one of them for each `GET`,
+`HEAD` and `OPTIONS` request, and `ReplicaRouter` sends that request's reads
+there. Everything else goes to `default`, the primary:
+
+- every write, and every read of the request after its first write, so a view
+  reads back what it just changed;
+- reads inside a transaction on `default`;
+- all queries of other requests (form posts validate against current data) and
+  of code running outside a request (management commands, the test runner).
+
+A replica lags behind the primary. After a client wrote (a form post, a sign-in,
+a `GET` that saved a setting), its following requests would otherwise read data
+that is missing the change, e.g. the todo list it is redirected to after creating
+a todo. The response of a request that wrote therefore sets a cookie that keeps
+the client on the primary for `TODO_DB_REPLICA_PIN_SECONDS`, which must exceed
+the replication lag. Clients without cookies (API clients using tokens) are not
+pinned.
+
+The cookie only affects the client that wrote. Views that cache what they read
+check `may_be_stale()` first, so another device of the same user cannot cache a
+list it read from a replica that has not caught up yet.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "todo_primary"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_current = ContextVar("replica_routing", default=None)
+
+
+class RequestRouting:
+    """
+    The routing state of one request.
+
+    Attributes:
+        replica (str): The alias reads go to, or `None` once they go to `default`.
+        wrote (bool): Whether the request routed a write.
+    """
+
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+def is_pinned(request):
+    """
+    Returns whether the request carries a valid pin cookie of a recent write.
+
+    The cookie holds the time the pin ends; values further ahead than the pin
+    window are ignored.
+    """
+    try:
+        until = float(request.COOKIES.get(PIN_COOKIE, 0))
+    except ValueError:
+        return False
+    now = time.time()
+    return now < until <= now + settings.TODO_DB_REPLICA_PIN_SECONDS + 1
+
+
+def may_be_stale(modified):
+    """
+    Returns whether the current request reads from a replica that may not have
+    caught up with a change made at `modified`.
+
+    Args:
+        modified (float): The UNIX time of the change, e.g. of a todo list from
+                          `cache.get_list_state` (in whole seconds).
+
+    Returns:
+        bool: `False` when reads go to the primary or the change is older than the
+              pin window.
+    """
+    routing = _current.get()
+    if routing is None or routing.replica is None:
+        return False
+    return time.time() < modified + 1 + settings.TODO_DB_REPLICA_PIN_SECONDS
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of the current request to its replica and all writes to `default`.
+
+    Outside a request routed by `ReplicaMiddleware` it has no opinion, so Django's
+    defaults apply.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _current.get()
+        if routing is None:
+            return None
+        if routing.replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _current.get()
+        if routing is not None:
+            # Later reads of the request must see the write.
+            routing.wrote = True
+            routing.replica = None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.TODO_DB_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary through replication.
+        if db in settings.TODO_DB_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Routes the reads of safe requests to a replica, unless the client is pinned
+    to the primary, and pins clients whose request wrote.
+
+    It should come before the session and authentication middleware, so their
+    queries are routed too. See the module docstring.
+
+    Raises:
+        MiddlewareNotUsed: If no replica is configured (`TODO_DB_REPLICA_URLS`).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TODO_DB_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        routing = self.start(request)
+        token = _current.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, routing)
+        return response
+
+    async def __acall__(self, request):
+        routing = self.start(request)
+        token = _current.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, routing)
+        return response
+
+    def start(self, request):
+        """
+        Returns the `RequestRouting` of a new request.
+        """
+        replica = None
+        if request.method in SAFE_METHODS and not is_pinned(request):
+            replica = random.choice(settings.TODO_DB_REPLICAS)
+        return RequestRouting(replica)
+
+    def finish(self, request, response, routing):
+        """
+        Sets the pin cookie on the response of a request that wrote.
+        """
+        if not routing.wrote:
+            return
+        pin = settings.TODO_DB_REPLICA_PIN_SECONDS
+        response.set_cookie(
+            PIN_COOKIE,
+            str(int(time.time()) + pin + 1),
+            max_age=pin + 1,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite="Lax",
+        )
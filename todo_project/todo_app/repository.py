@@ -1,4 +1,150 @@
-from .models import UserSettings
+from collections import Counter
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .cache import bump_list_version
+from .models import Todo, TodoCounter, UserSettings
+
+_settings_relation = UserSettings._meta.get_field("user").remote_field
+
+
+def user_settings_cache_key(user_id):
+    """
+    Returns the cache key under which the settings of a user are stored.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"todo:user-settings:{user_id}"
+
+
+def user_settings_snapshot(user_settings):
+    """
+    Returns the field values of a `UserSettings` instance as a picklable dict.
+
+    The snapshot is what the settings cache (and the cached user of
+    `app_auth.middleware`) stores; `attach_user_settings` turns it back into an
+    instance.
+
+    Args:
+        user_settings (UserSettings): The settings to snapshot.
+
+    Returns:
+        dict: The concrete field values, keyed by attribute name.
+    """
+    return {
+        field.attname: getattr(user_settings, field.attname)
+        for field in UserSettings._meta.concrete_fields
+    }
+
+
+def attach_user_settings(user, values):
+    """
+    Rebuilds `UserSettings` from a snapshot and caches them on the user instance.
+
+    Afterwards `user.usersettings` and `get_user_settings(user)` return the rebuilt
+    instance without touching the cache or the database.
+
+    Args:
+        user (User): The user the settings belong to.
+        values (dict): A snapshot from `user_settings_snapshot`.
+
+    Returns:
+        UserSettings: The rebuilt settings.
+    """
+    user_settings = UserSettings.from_db(None, list(values), list(values.values()))
+    _settings_relation.set_cached_value(user, user_settings)
+    UserSettings.user.field.set_cached_value(user_settings, user)
+    return user_settings
+
+
+def load_user_settings(user):
+    """
+    Reads the settings of a user from the database, creating them if missing.
+
+    The plain read comes first, so the common case is a read (which a read replica
+    can serve, see `replicas.py`) rather than a `get_or_create`.
+
+    Args:
+        user (User): The user whose settings are needed.
+
+    Returns:
+        dict: A snapshot from `user_settings_snapshot`.
+    """
+    user_settings = UserSettings.objects.filter(user=user).first()
+    if user_settings is None:
+        user_settings, _ = UserSettings.objects.get_or_create(user=user)
+    return user_settings_snapshot(user_settings)
+
+
+async def aload_user_settings(user):
+    """
+    Async version of `load_user_settings`.
+    """
+    user_settings = await UserSettings.objects.filter(user=user).afirst()
+    if user_settings is None:
+        user_settings, _ = await UserSettings.objects.aget_or_create(user=user)
+    return user_settings_snapshot(user_settings)
+
+
+def get_user_settings(user):
+    """
+    Returns the `UserSettings` of a user, loading them at most once per request.
+
+    The settings are looked up in three places, cheapest first:
+
+    1. The user instance itself. `request.user` lives for one request, so once the
+       settings are attached to it (by an earlier call, by the cached user of
+       `app_auth.middleware`, or joined in with `select_related("usersettings")`)
+       no further lookups happen.
+    2. The shared cache, keyed by user id and invalidated by the `UserSettings`
+       signals in `signals.py`. It is skipped unless `settings.TODO_SHARED_CACHE`
+       is set: a per-process cache would keep serving settings another worker
+       changed.
+    3. The database. Missing settings (e.g. users created before `UserSettings`
+       existed) are created with defaults.
+
+    Args:
+        user (User): The user whose settings are needed.
+
+    Returns:
+        UserSettings: The user's settings.
+    """
+    if _settings_relation.is_cached(user):
+        return _settings_relation.get_cached_value(user)
+    if not settings.TODO_SHARED_CACHE:
+        return attach_user_settings(user, load_user_settings(user))
+    key = user_settings_cache_key(user.pk)
+    values = cache.get(key)
+    if values is None:
+        values = load_user_settings(user)
+        cache.set(key, values, settings.TODO_SETTINGS_CACHE_TIMEOUT)
+    return attach_user_settings(user, values)
+
+
+async def aget_user_settings(user):
+    """
+    Async version of `get_user_settings`, using the async cache and ORM APIs.
+    """
+    if _settings_relation.is_cached(user):
+        return _settings_relation.get_cached_value(user)
+    if not settings.TODO_SHARED_CACHE:
+        return attach_user_settings(user, await aload_user_settings(user))
+    key = user_settings_cache_key(user.pk)
+    values = await cache.aget(key)
+    if values is None:
+        values = await aload_user_settings(user)
+        await cache.aset(key, values, settings.TODO_SETTINGS_CACHE_TIMEOUT)
+    return attach_user_settings(user, values)
 
 
 def set_cards_per_page(user, cards_per_page):
@@ -7,13 +153,294 @@ def set_cards_per_page(user, cards_per_page):
 
     This function updates the `cards_per_page` value in the `UserSettings` model
     for the given user. It modifies the number of items to display per page
-    in the Todo list for that user.
+    in the Todo list for that user. Nothing is written when the value is unchanged,
+    so the list view stays a read-only path on ordinary page views.
 
     Args:
         user (User): The user whose settings need to be updated.
         cards_per_page (int): The number of Todo items to display per page.
 
+    Returns:
+        bool: True if the settings were written, False if they were already up to date.
+
     Side Effects:
         - Updates the `cards_per_page` value for the specified user in the `UserSettings` table.
+        - Invalidates the cached settings of the user (through the `post_save` signal).
+    """
+    user_settings = get_user_settings(user)
+    if user_settings.cards_per_page == cards_per_page:
+        return False
+    user_settings.cards_per_page = cards_per_page
+    user_settings.save(update_fields=["cards_per_page"])
+    return True
+
+
+async def aset_cards_per_page(user, cards_per_page):
+    """
+    Async version of `set_cards_per_page`.
+    """
+    user_settings = await aget_user_settings(user)
+    if user_settings.cards_per_page == cards_per_page:
+        return False
+    user_settings.cards_per_page = cards_per_page
+    await user_settings.asave(update_fields=["cards_per_page"])
+    return True
+
+
+def adjust_todo_counters(user_id, total=0, completed=0, pending=0):
+    """
+    Atomically shifts the Todo counters of a user by the given deltas.
+
+    The update is a single `UPDATE ... SET total = total + n` statement, so concurrent
+    writers never lose increments. A user without a counter row is left alone: the row
+    is created with exact counts the next time `get_todo_counter` reads it.
+
+    Args:
+        user_id (int): The primary key of the user.
+        total (int): The change of the total number of Todo items.
+        completed (int): The change of the number of completed Todo items.
+        pending (int): The change of the number of pending Todo items.
+
+    Side Effects:
+        - Updates the `TodoCounter` row of the user.
     """
-    UserSettings.objects.filter(user=user).update(cards_per_page=cards_per_page)
+    if not (total or completed or pending):
+        return
+    TodoCounter.objects.filter(user_id=user_id).update(
+        total=F("total") + total,
+        completed=F("completed") + completed,
+        pending=F("pending") + pending,
+    )
+
+
+def recount_todo_counters(user_ids):
+    """
+    Recomputes the Todo counters of the given users from the Todo table.
+
+    Args:
+        user_ids (Iterable[int]): The primary keys of the users to recount.
+
+    Returns:
+        list: The up-to-date `TodoCounter` instances, one per user.
+
+    Side Effects:
+        - Inserts or overwrites the `TodoCounter` rows of the users.
+    """
+    user_ids = list(user_ids)
+    counts = {
+        row["user_id"]: row
+        for row in Todo.objects.filter(user_id__in=user_ids)
+        .order_by()
+        .values("user_id")
+        .annotate(total=Count("id"), completed=Count("id", filter=Q(completed=True)))
+    }
+    counters = []
+    for user_id in user_ids:
+        row = counts.get(user_id, {"total": 0, "completed": 0})
+        counters.append(
+            TodoCounter(
+                user_id=user_id,
+                total=row["total"],
+                completed=row["completed"],
+                pending=row["total"] - row["completed"],
+            )
+        )
+    TodoCounter.objects.bulk_create(
+        counters,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["total", "completed", "pending"],
+    )
+    return counters
+
+
+def get_todo_counter(user):
+    """
+    Returns the Todo counters of a user, creating them from exact counts if missing.
+
+    Args:
+        user (User): The user whose counters are needed.
+
+    Returns:
+        TodoCounter: The user's counters.
+    """
+    counter = TodoCounter.objects.filter(user=user).first()
+    if counter is None:
+        counter = recount_todo_counters([user.pk])[0]
+    return counter
+
+
+async def aget_todo_counter(user):
+    """
+    Async version of `get_todo_counter`.
+    """
+    counter = await TodoCounter.objects.filter(user=user).afirst()
+    if counter is None:
+        counter = (await sync_to_async(recount_todo_counters)([user.pk]))[0]
+    return counter
+
+
+def _count_todos(todos):
+    counts = Counter()
+    for todo in todos:
+        counts[todo.user_id, todo.completed] += 1
+    return counts
+
+
+def create_todos(todos, batch_size=500):
+    """
+    Inserts many Todo items with `bulk_create` and keeps the derived data in sync.
+
+    `bulk_create` does not send `post_save`, so this helper applies what the signals
+    would have done: it adjusts the counters and bumps the list version of every
+    affected user, once per user rather than once per Todo.
+
+    Args:
+        todos (list): Unsaved `Todo` instances.
+        batch_size (int): The number of rows per INSERT.
+
+    Returns:
+        list: The created Todo items.
+    """
+    with transaction.atomic():
+        created = Todo.objects.bulk_create(todos, batch_size=batch_size)
+        _apply_counts(_count_todos(created), sign=1)
+    return created
+
+
+def update_todos(todos, fields, batch_size=500):
+    """
+    Saves changes to many loaded Todo items with `bulk_update`.
+
+    Like `create_todos`, it replaces the work of the `post_save` signals: the
+    completion state each Todo was loaded with (remembered by the `post_init`
+    receiver) is compared with the new one to move the counters.
+
+    Args:
+        todos (list): Modified `Todo` instances loaded from the database.
+        fields (Iterable[str]): The names of the fields to write.
+        batch_size (int): The number of rows per UPDATE.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    # `bulk_update` skips `auto_now`, so `updated_at` is set here.
+    now = timezone.now()
+    fields = {*fields, "updated_at"}
+    moved = Counter()
+    for todo in todos:
+        todo.updated_at = now
+        if todo._counted_completed is not None and (
+            todo._counted_completed != todo.completed
+        ):
+            moved[todo.user_id] += 1 if todo.completed else -1
+    with transaction.atomic():
+        updated = Todo.objects.bulk_update(todos, fields, batch_size=batch_size)
+        for user_id, delta in moved.items():
+            adjust_todo_counters(user_id, completed=delta, pending=-delta)
+        for user_id in {todo.user_id for todo in todos}:
+            transaction.on_commit(lambda user_id=user_id: bump_list_version(user_id))
+    for todo in todos:
+        todo._counted_completed = todo.completed
+    return updated
+
+
+def _chunked(ids, size):
+    iterator = iter(ids)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def set_todos_completed(user, ids, completed, chunk_size=500):
+    """
+    Marks the given Todo items of a user as completed (or pending) in one UPDATE
+    per `chunk_size` ids.
+
+    Ownership is enforced in SQL: ids of other users' Todo items simply do not match.
+    Rows that already have the requested state are not touched. All chunks run in
+    one transaction, and the counters and list version are updated once.
+
+    Args:
+        user (User): The owner of the Todo items.
+        ids (Iterable[int]): The primary keys of the Todo items.
+        completed (bool): The new completion state.
+        chunk_size (int): The maximum number of ids per statement.
+
+    Returns:
+        int: The number of Todo items that changed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        changed = 0
+        for chunk in _chunked(ids, chunk_size):
+            changed += (
+                Todo.objects.for_user(user)
+                .filter(id__in=chunk, completed=not completed)
+                .update(completed=completed, updated_at=now)
+            )
+        if changed:
+            delta = changed if completed else -changed
+            adjust_todo_counters(user.pk, completed=delta, pending=-delta)
+            transaction.on_commit(lambda: bump_list_version(user.pk))
+    return changed
+
+
+def delete_todos(user, ids, chunk_size=500):
+    """
+    Deletes the given Todo items of a user with one DELETE statement per
+    `chunk_size` ids.
+
+    Ownership is enforced in SQL, like in `set_todos_completed`.
+
+    Args:
+        user (User): The owner of the Todo items.
+        ids (Iterable[int]): The primary keys of the Todo items.
+        chunk_size (int): The maximum number of ids per statement.
+
+    Returns:
+        int: The number of deleted Todo items.
+    """
+    counts = Counter()
+    deleted = 0
+    with transaction.atomic():
+        for chunk in _chunked(ids, chunk_size):
+            queryset = Todo.objects.for_user(user).filter(id__in=chunk)
+            counts.update(
+                {
+                    (user.pk, row["completed"]): row["n"]
+                    for row in queryset.order_by()
+                    .values("completed")
+                    .annotate(n=Count("id"))
+                }
+            )
+            deleted += _delete_without_signals(queryset)
+        _apply_counts(counts, sign=-1)
+    return deleted
+
+
+def _delete_without_signals(queryset):
+    """
+    Deletes the Todo items of a queryset with one DELETE, without loading them.
+
+    `QuerySet.delete()` only deletes this way when no delete signal receivers are
+    connected. The `post_delete` receivers of `Todo` (counters, list version) make
+    it fetch every row and send one signal per row, each with its own UPDATE, so
+    the callers apply those effects in bulk instead. This relies on Django's
+    private `_raw_delete`, which skips cascades as well: it is only correct while
+    no model references `Todo` (checked by `BulkActionTests`).
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def _apply_counts(counts, sign):
+    per_user = {}
+    for (user_id, completed), n in counts.items():
+        deltas = per_user.setdefault(user_id, Counter())
+        deltas["total"] += sign * n
+        deltas["completed" if completed else "pending"] += sign * n
+    for user_id, deltas in per_user.items():
+        adjust_todo_counters(user_id, **deltas)
+        transaction.on_commit(lambda user_id=user_id: bump_list_version(user_id))
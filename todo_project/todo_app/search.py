@@ -0,0 +1,74 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+# The text search configuration of the `search_vector` trigger (migration 0005).
+SEARCH_CONFIG = "english"
+# The FTS5 table mirroring `todo_app_todo` on SQLite (migration 0005).
+FTS_TABLE = "todo_app_todo_fts"
+
+
+def fts5_query(text):
+    """
+    Turns free text into an FTS5 query matching every word.
+
+    Each word is quoted, so characters with a meaning in the FTS5 query syntax
+    (`"`, `*`, `-`, `AND`, ...) are matched literally instead of raising an error.
+
+    Args:
+        text (str): The text typed by the user.
+
+    Returns:
+        str: The FTS5 `MATCH` expression, or `""` if the text has no words.
+    """
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+
+
+def search_todos(queryset, text):
+    """
+    Filters a Todo queryset by full-text search and ranks the matches.
+
+    The queryset is annotated with a float `rank` (higher is better) and ordered by
+    `("-rank", "-id")`, which is a total order, so it works with both the numbered
+    and the keyset paginators.
+
+    - PostgreSQL matches `websearch_to_tsquery()` against the GIN-indexed
+      `search_vector` column and ranks with `ts_rank()`. The rank is cast to double
+      precision so keyset cursors compare it exactly.
+    - SQLite matches the FTS5 table and ranks with `bm25()`, negated so that higher
+      is better here too.
+    - Other backends fall back to an unranked `icontains` scan.
+
+    Args:
+        queryset (QuerySet): The Todo items to search, usually those of one user.
+        text (str): The search text.
+
+    Returns:
+        QuerySet: The matching Todo items, best matches first.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        queryset = queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+        )
+    elif vendor == "sqlite":
+        # Joining the FTS5 table evaluates the MATCH once; a correlated subquery
+        # would re-run it for every match. The unary `+` keeps SQLite from probing
+        # the FTS table by rowid for every Todo of the user, so the join is always
+        # driven by the MATCH.
+        table = queryset.model._meta.db_table
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"+{FTS_TABLE}.rowid = {table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[fts5_query(text)],
+        ).annotate(
+            rank=RawSQL(f"-bm25({FTS_TABLE}, 10.0, 1.0)", [], output_field=FloatField())
+        )
+    else:
+        queryset = queryset.filter(
+            Q(title__icontains=text) | Q(description__icontains=text)
+        ).annotate(rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by("-rank", "-id")
@@ -0,0 +1,115 @@
+import random
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from .models import Todo, UserSettings
+from .repository import recount_todo_counters
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def seed_users(count, prefix="seed", password="seed-password", batch_size=1000):
+    """
+    Creates `count` users (plus their `UserSettings`) with `bulk_create`.
+
+    The password is hashed once and shared by every seeded user, and the
+    `create_user_settings` signal is bypassed, so seeding thousands of users takes
+    a few queries per batch instead of two INSERTs and one hash per user.
+    Users that already exist (by username) are reused.
+
+    Args:
+        count (int): The number of users to create.
+        prefix (str): The username prefix, users are named `<prefix><n>`.
+        password (str): The raw password for every seeded user.
+        batch_size (int): The number of rows per INSERT.
+
+    Returns:
+        list: The seeded users, ordered by username suffix.
+    """
+    User = get_user_model()
+    usernames = [f"{prefix}{n}" for n in range(count)]
+    existing = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    hashed = make_password(password)
+    User.objects.bulk_create(
+        (
+            User(username=name, email=f"{name}@example.com", password=hashed)
+            for name in usernames
+            if name not in existing
+        ),
+        batch_size=batch_size,
+    )
+    users = {u.username: u for u in User.objects.filter(username__in=usernames)}
+    with_settings = set(
+        UserSettings.objects.filter(user__in=users.values()).values_list(
+            "user_id", flat=True
+        )
+    )
+    UserSettings.objects.bulk_create(
+        (UserSettings(user=u) for u in users.values() if u.pk not in with_settings),
+        batch_size=batch_size,
+    )
+    return [users[name] for name in usernames]
+
+
+def _random_text(rng, vocabulary, words):
+    return " ".join(rng.choices(vocabulary, k=words)).capitalize()
+
+
+def seed_todos(
+    users, todos_per_user, completed_every=3, batch_size=1000, vocabulary=None
+):
+    """
+    Creates `todos_per_user` todos for every user with batched `bulk_create`.
+
+    The `Todo` signals are bypassed, so the counters of the users are recounted once
+    at the end.
+
+    Args:
+        users (list): The owners of the new todos.
+        todos_per_user (int): The number of todos to create per user.
+        completed_every (int): Every n-th todo is marked as completed.
+        batch_size (int): The number of rows per INSERT.
+        vocabulary (list, optional): Words to build titles and descriptions from
+                                     (with a fixed seed), e.g. to benchmark search.
+                                     By default the todos are numbered `Task <n>`.
+
+    Returns:
+        int: The number of todos created.
+    """
+    if vocabulary:
+        rng = random.Random(0)
+        todos = (
+            Todo(
+                user=user,
+                title=_random_text(rng, vocabulary, 3),
+                description=_random_text(rng, vocabulary, 12),
+                completed=n % completed_every == 0,
+            )
+            for user in users
+            for n in range(todos_per_user)
+        )
+    else:
+        todos = (
+            Todo(
+                user=user,
+                title=f"Task {n}",
+                description=f"Seeded task number {n} for {user.username}.",
+                completed=n % completed_every == 0,
+            )
+            for user in users
+            for n in range(todos_per_user)
+        )
+    created = 0
+    for batch in _batched(todos, batch_size):
+        Todo.objects.bulk_create(batch)
+        created += len(batch)
+    recount_todo_counters(user.pk for user in users)
+    return created
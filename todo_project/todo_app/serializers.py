@@ -0,0 +1,61 @@
+from rest_framework import serializers
+
+from .forms import TodoForm
+from .models import Todo
+
+_form_fields = TodoForm.base_fields
+
+
+class TodoSerializer(serializers.ModelSerializer):
+    """
+    A serializer for reading and writing Todo items through the JSON API.
+
+    It exposes only the columns the API needs and applies the same length limits as
+    `TodoForm`, so a Todo accepted by the API is also valid in the HTML views.
+    It works with both model instances and the `values()` rows the list endpoint
+    uses to skip model instantiation.
+
+    Attributes:
+        title (CharField): The title of the Todo item, limited like `TodoForm.title`.
+        description (CharField): The description, limited like `TodoForm.description`.
+
+    Meta:
+        model (Model): The model associated with the serializer (`Todo`).
+        fields (tuple): The exposed fields.
+        read_only_fields (tuple): Fields set by the server (`id`, `published`).
+    """
+
+    title = serializers.CharField(max_length=_form_fields["title"].max_length)
+    description = serializers.CharField(
+        max_length=_form_fields["description"].max_length
+    )
+
+    class Meta:
+        model = Todo
+        fields = ("id", "title", "description", "completed", "published")
+        read_only_fields = ("id", "published")
+
+
+class TodoBulkUpdateSerializer(TodoSerializer):
+    """
+    A serializer for one item of a bulk update: a Todo id plus the fields to change.
+    """
+
+    id = serializers.IntegerField()
+
+    class Meta(TodoSerializer.Meta):
+        read_only_fields = ("published",)
+
+    def validate(self, attrs):
+        # Bulk updates are partial, which would otherwise make `id` optional too.
+        if "id" not in attrs:
+            raise serializers.ValidationError({"id": "This field is required."})
+        return attrs
+
+
+class TodoIdsSerializer(serializers.Serializer):
+    """
+    A serializer for the list of Todo ids of a bulk delete.
+    """
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
@@ -1,7 +1,16 @@
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.conf import settings
-from .models import UserSettings
+from app_auth.middleware import user_cache_key
+from .cache import bump_list_version
+from .models import Todo, UserSettings
+from .repository import (
+    adjust_todo_counters,
+    recount_todo_counters,
+    user_settings_cache_key,
+)
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -25,3 +34,166 @@ def create_user_settings(sender, instance, created, **kwargs):
     """
     if created:
         UserSettings.objects.create(user=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Signal receiver to drop the cached user snapshot when the user changes.
+
+    This receiver listens for the `post_save` and `post_delete` signals of the user
+    model and removes the snapshot `app_auth.middleware.CachedAuthenticationMiddleware`
+    serves `request.user` from, so the next request loads the user from the database.
+    This covers logins (`last_login`), password changes and deactivation.
+
+    Args:
+        sender (Model): The model class that triggered the signal, which is `AUTH_USER_MODEL`.
+        instance (User): The user instance that was saved or deleted.
+        **kwargs: Additional keyword arguments passed by the signal.
+
+    Side Effects:
+        - Deletes the cached snapshot of the user.
+    """
+    cache.delete(user_cache_key(instance.pk))
+
+
+@receiver(post_save, sender=UserSettings)
+@receiver(post_delete, sender=UserSettings)
+def invalidate_user_settings(sender, instance, **kwargs):
+    """
+    Signal receiver to drop cached UserSettings when they change.
+
+    This receiver listens for the `post_save` and `post_delete` signals of
+    `UserSettings` and removes the cached copy used by
+    `repository.get_user_settings` and the cached user snapshot that embeds them,
+    so the next request reloads fresh settings.
+    The settings shape the todo list page, so its version (and with it the
+    ETag and Last-Modified of the page) is bumped as well. Both wait for the
+    transaction to commit, so a concurrent request cannot cache the old settings
+    again after they were dropped.
+
+    Args:
+        sender (Model): The model class that triggered the signal, which is `UserSettings`.
+        instance (UserSettings): The settings instance that was saved or deleted.
+        **kwargs: Additional keyword arguments passed by the signal.
+
+    Side Effects:
+        - Deletes the cached settings and user snapshot of the instance's user once
+          the transaction commits.
+        - Increments the list version of the instance's user once the transaction
+          commits.
+    """
+    user_id = instance.user_id
+
+    def invalidate():
+        cache.delete_many([user_settings_cache_key(user_id), user_cache_key(user_id)])
+        bump_list_version(user_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def invalidate_todo_list(sender, instance, **kwargs):
+    """
+    Signal receiver to invalidate cached list pages when a Todo changes.
+
+    This receiver listens for the `post_save` and `post_delete` signals of `Todo`
+    and bumps the list version of the Todo's owner. Every cached list fragment is
+    keyed by that version, so all of them become unreachable at once.
+    The bump waits for the transaction to commit: a request reading the list before
+    that would still see the old rows and cache them under the new version.
+
+    Args:
+        sender (Model): The model class that triggered the signal, which is `Todo`.
+        instance (Todo): The Todo instance that was saved or deleted.
+        **kwargs: Additional keyword arguments passed by the signal.
+
+    Side Effects:
+        - Increments the list version of `instance.user_id` once the transaction
+          commits.
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_list_version(user_id))
+
+
+@receiver(post_init, sender=Todo)
+def remember_todo_state(sender, instance, **kwargs):
+    """
+    Signal receiver to remember the completion state a Todo was loaded with.
+
+    `update_todo_counters` compares it with the saved state to know whether the
+    completed/pending counters have to move. Deferred fields are not loaded, so
+    nothing is remembered for them.
+
+    Args:
+        sender (Model): The model class that triggered the signal, which is `Todo`.
+        instance (Todo): The Todo instance that was initialized.
+        **kwargs: Additional keyword arguments passed by the signal.
+    """
+    instance._counted_completed = instance.__dict__.get("completed")
+
+
+@receiver(post_save, sender=Todo)
+def update_todo_counters(sender, instance, created, **kwargs):
+    """
+    Signal receiver to keep the TodoCounter of the owner in sync on save.
+
+    A new Todo increments `total` and either `completed` or `pending`; a Todo whose
+    completion state changed moves one unit between `completed` and `pending`.
+    All changes are atomic `F()` updates. If the previous state is unknown (the
+    Todo was loaded without the `completed` field), the owner's counters are
+    recounted instead.
+
+    Args:
+        sender (Model): The model class that triggered the signal, which is `Todo`.
+        instance (Todo): The Todo instance that was saved.
+        created (bool): A flag that indicates whether the Todo was created.
+        **kwargs: Additional keyword arguments passed by the signal.
+
+    Side Effects:
+        - Updates the `TodoCounter` row of `instance.user_id`.
+    """
+    completed = instance.completed
+    if created:
+        adjust_todo_counters(
+            instance.user_id,
+            total=1,
+            completed=int(completed),
+            pending=int(not completed),
+        )
+    elif instance._counted_completed is None:
+        recount_todo_counters([instance.user_id])
+    elif instance._counted_completed != completed:
+        delta = 1 if completed else -1
+        adjust_todo_counters(instance.user_id, completed=delta, pending=-delta)
+    instance._counted_completed = completed
+
+
+@receiver(post_delete, sender=Todo)
+def decrement_todo_counters(sender, instance, **kwargs):
+    """
+    Signal receiver to keep the TodoCounter of the owner in sync on delete.
+
+    If the Todo was loaded without its `completed` field, the row is already gone
+    and cannot be refreshed, so the owner's counters are recounted instead.
+
+    Args:
+        sender (Model): The model class that triggered the signal, which is `Todo`.
+        instance (Todo): The Todo instance that was deleted.
+        **kwargs: Additional keyword arguments passed by the signal.
+
+    Side Effects:
+        - Decrements the `TodoCounter` row of `instance.user_id`.
+    """
+    completed = instance.__dict__.get("completed")
+    if completed is None:
+        recount_todo_counters([instance.user_id])
+        return
+    adjust_todo_counters(
+        instance.user_id,
+        total=-1,
+        completed=-int(completed),
+        pending=-int(not completed),
+    )
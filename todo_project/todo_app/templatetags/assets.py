@@ -0,0 +1,22 @@
+from django import template
+
+from todo_app.assets import BUNDLE_CSS, BUNDLE_FONTS, bundle_built
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset_bundle():
+    """
+    Returns the static paths of the built CSS bundle and its font.
+
+    Returns:
+        dict: `{"css": ..., "font": ...}`, or `None` if `build_assets` has not run,
+              in which case the templates fall back to the CDNs.
+    """
+    if not bundle_built():
+        return None
+    return {
+        "css": BUNDLE_CSS,
+        "font": BUNDLE_CSS.rsplit("/", 1)[0] + "/" + BUNDLE_FONTS["fa-solid-900"],
+    }
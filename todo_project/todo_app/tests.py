@@ -1,3 +1,1356 @@
-from django.test import TestCase
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta
+from html import unescape
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, connections
+from django.db.models.signals import post_delete
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+from rest_framework.test import APIClient
+from todo_project.log import QueuedRotatingFileHandler
+
+from . import cards, provisioning, timing
+from .assets import BUNDLE_FONTS, parse_css, serialize_css, trim_css, used_classes
+from .cache import bump_list_version, get_list_version, list_modified_key
+from .forms import TodoBulkActionForm
+from .models import Todo, TodoCounter, UserSettings
+from .pagination import InvalidCursor, KeysetPaginator
+from .provisioning import provision_users
+from .replicas import PIN_COOKIE
+from .repository import (
+    create_todos as create_todos_in_bulk,
+    delete_todos,
+    get_todo_counter,
+    get_user_settings,
+    set_cards_per_page,
+    set_todos_completed,
+    update_todos,
+    user_settings_cache_key,
+)
+from .search import search_todos
+from .views import TodoListView
+
+
+def create_user(username="alice"):
+    return get_user_model().objects.create_user(
+        username=username, email=f"{username}@example.com", password="password"
+    )
+
+
+def create_todos(user, titles, completed=False, published=None):
+    """
+    Creates one Todo per title; with `published`, they all share that timestamp.
+    """
+    todos = [
+        Todo.objects.create(
+            user=user, title=title, description=f"{title} notes", completed=completed
+        )
+        for title in titles
+    ]
+    if published is not None:
+        Todo.objects.filter(pk__in=[todo.pk for todo in todos]).update(
+            published=published
+        )
+    return todos
+
+
+class TodoTestCase(TestCase):
+    """
+    Starts every test with an empty cache, since cached state outlives the
+    rolled-back database.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+
+class KeysetPaginatorTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        now = timezone.now().replace(microsecond=123456)
+        # Ties on `published` and `title` make the primary key decide the order.
+        create_todos(self.user, ["b", "a", "c"], published=now)
+        create_todos(self.user, ["a", "d"], completed=True, published=now)
+        create_todos(self.user, ["e", "b"], published=now - timedelta(days=1))
+        create_todos(self.user, ["f"], published=now + timedelta(days=1))
+
+    def walk(self, queryset, ordering, per_page=3):
+        """
+        Returns the pages of a queryset walked forward, and the same pages walked
+        back from the last one.
+        """
+        paginator = KeysetPaginator(queryset, per_page, ordering=ordering)
+        limit = queryset.count() // per_page + 1
+        forward = [paginator.page()]
+        while forward[-1].has_next() and len(forward) <= limit:
+            forward.append(paginator.page(forward[-1].next_cursor))
+        backward = [forward[-1]]
+        while backward[-1].has_previous() and len(backward) <= limit:
+            backward.append(paginator.page(backward[-1].previous_cursor))
+        return [list(page) for page in forward], [list(page) for page in backward]
+
+    def assertWalks(self, queryset, ordering):
+        expected = list(queryset.order_by(*ordering))
+        forward, backward = self.walk(queryset, ordering)
+        self.assertEqual([todo for page in forward for todo in page], expected)
+        self.assertEqual(backward, forward[::-1])
+
+    def test_sort_orderings(self):
+        queryset = Todo.objects.for_user(self.user)
+        for sort, ordering in TodoListView.sort_orderings.items():
+            with self.subTest(sort=sort):
+                self.assertWalks(queryset, ordering)
+
+    def test_status_filters(self):
+        for status, filters in TodoListView.status_filters.items():
+            queryset = Todo.objects.for_user(self.user).filter(**filters)
+            with self.subTest(status=status):
+                self.assertWalks(queryset, TodoListView.sort_orderings["newest"])
+
+    def test_search_ordering(self):
+        create_todos(self.user, [f"report {n}" for n in range(7)])
+        queryset = search_todos(Todo.objects.for_user(self.user), "report notes")
+        self.assertEqual(queryset.count(), 7)
+        self.assertWalks(queryset, TodoListView.search_ordering)
+
+    def test_cursor_round_trip(self):
+        paginator = KeysetPaginator(Todo.objects.all(), 3)
+        todo = Todo.objects.first()
+        cursor = paginator.encode_cursor(todo, KeysetPaginator.PREVIOUS)
+        self.assertEqual(
+            paginator.decode_cursor(cursor),
+            (KeysetPaginator.PREVIOUS, [todo.published, todo.id]),
+        )
+        self.assertEqual(paginator.decode_cursor(cursor)[1][0].microsecond, 123456)
+
+    def test_invalid_cursors(self):
+        paginator = KeysetPaginator(Todo.objects.all(), 3)
+        other = KeysetPaginator(Todo.objects.all(), 3, ordering=("id",))
+        cursors = [
+            "not a cursor",
+            "e30",  # {}
+            other.encode_cursor({"id": 1}, KeysetPaginator.NEXT),
+            paginator.encode_cursor({"published": "x", "id": 1}, KeysetPaginator.NEXT),
+            paginator.encode_cursor({"published": None, "id": 1}, "sideways"),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    paginator.decode_cursor(cursor)
+
+    def test_list_view_follows_cursors(self):
+        self.client.force_login(self.user)
+        url = reverse("main")
+        with mock.patch.object(TodoListView, "pagination_mode", "keyset"):
+            first = self.client.get(url, {"cards_per_page": 3, "sort": "title"})
+            page = first.context["page_obj"]
+            self.assertEqual([todo.title for todo in page], ["a", "a", "b"])
+            second = self.client.get(
+                url, {"cards_per_page": 3, "sort": "title", "cursor": page.next_cursor}
+            )
+            self.assertEqual(
+                [todo.title for todo in second.context["page_obj"]], ["b", "c", "d"]
+            )
+            self.assertEqual(self.client.get(url, {"cursor": "bogus"}).status_code, 404)
+
+
+class SearchTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+
+    def search(self, text):
+        return list(search_todos(Todo.objects.for_user(self.user), text))
+
+    def create(self, title, description=""):
+        return Todo.objects.create(user=self.user, title=title, description=description)
+
+    def test_title_matches_rank_first(self):
+        in_description = self.create("weekend", "buy groceries and flowers")
+        in_title = self.create("groceries", "for the weekend")
+        self.create("laundry")
+        self.assertEqual(self.search("groceries"), [in_title, in_description])
+        self.assertEqual(self.search("groceries flowers"), [in_description])
+
+    def test_saved_and_edited_todos_are_found(self):
+        todo = self.create("quarterly report", "numbers")
+        self.assertEqual(self.search("reports"), [todo])
+        todo.title = "invoice"
+        todo.save()
+        self.assertEqual(self.search("report"), [])
+        self.assertEqual(self.search("invoice"), [todo])
+        Todo.objects.filter(pk=todo.pk).update(description="for the accountant")
+        self.assertEqual(self.search("numbers"), [])
+        self.assertEqual(self.search("accountant"), [todo])
+
+    def test_deleted_todos_are_not_found(self):
+        deleted, bulk_deleted, kept = (
+            self.create(f"{word} report") for word in ("daily", "weekly", "monthly")
+        )
+        deleted.delete()
+        delete_todos(self.user, [bulk_deleted.pk])
+        self.assertEqual(self.search("report"), [kept])
+
+    def test_other_users_are_not_searched(self):
+        Todo.objects.create(user=create_user("bob"), title="report")
+        self.assertEqual(self.search("report"), [])
+
+
+class SearchMigrationTests(TransactionTestCase):
+    """
+    Migration 0007 rebuilds the todo table on SQLite, which drops the search
+    triggers of 0005, and creates them again.
+    """
+
+    def test_search_works_after_migrating_0007_again(self):
+        user = create_user()
+        kept, deleted = (
+            Todo.objects.create(user=user, title=title)
+            for title in ("kept report", "deleted report")
+        )
+        call_command("migrate", "todo_app", "0006", verbosity=0)
+        call_command("migrate", "todo_app", verbosity=0)
+        edited = Todo.objects.create(user=user, title="new todo")
+        edited.title = "edited report"
+        edited.save()
+        deleted.delete()
+        self.assertEqual(
+            list(search_todos(Todo.objects.for_user(user), "report")), [edited, kept]
+        )
+
+
+class CardCacheTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.todo = create_todos(self.user, ["first"])[0]
+        render_card = mock.patch.object(cards, "render_card", wraps=cards.render_card)
+        self.addCleanup(render_card.stop)
+        self.render_card = render_card.start()
+
+    def render(self):
+        """
+        Renders the user's cards from freshly loaded todos, like the list view.
+        """
+        self.render_card.reset_mock()
+        return cards.render_cards(Todo.objects.for_user(self.user).for_cards())
+
+    def test_cards_are_cached(self):
+        first = self.render()
+        self.assertEqual(self.render_card.call_count, 1)
+        self.assertEqual(self.render(), first)
+        self.render_card.assert_not_called()
+        self.assertNotIn(cards.PUBLISHED_PLACEHOLDER, first)
+
+    def test_edited_todo_is_rendered_again(self):
+        self.render()
+        todo = Todo.objects.for_edit().get(pk=self.todo.pk)
+        todo.title = "renamed"
+        todo.save()
+        html = self.render()
+        self.assertEqual(self.render_card.call_count, 1)
+        self.assertIn("Select renamed", html)
+        self.assertNotIn("Select first", html)
+
+    def test_relative_date_is_formatted_on_every_render(self):
+        self.assertIn("now", self.render())
+        # `update()` leaves `updated_at` and so the cache key unchanged.
+        Todo.objects.filter(pk=self.todo.pk).update(
+            published=timezone.now() - timedelta(hours=2)
+        )
+        html = self.render()
+        self.render_card.assert_not_called()
+        self.assertIn("2\xa0hours ago", html)
+
+    @override_settings(TODO_CARD_CACHE_TIMEOUT=0)
+    def test_cache_is_disabled(self):
+        self.render()
+        self.render()
+        self.assertEqual(self.render_card.call_count, 1)
+
+
+class UserSettingsCacheTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+
+    def fresh_user(self):
+        """
+        Returns a new instance of the user, without settings attached to it.
+        """
+        return get_user_model().objects.get(pk=self.user.pk)
+
+    def test_settings_are_read_once(self):
+        user = self.fresh_user()
+        with self.assertNumQueries(1):
+            get_user_settings(user)
+        with self.assertNumQueries(0):
+            get_user_settings(user)
+        other = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_settings(other).cards_per_page, 9)
+
+    def test_saving_settings_invalidates_the_cache(self):
+        get_user_settings(self.fresh_user())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(set_cards_per_page(self.fresh_user(), 20))
+        self.assertEqual(get_user_settings(self.fresh_user()).cards_per_page, 20)
+
+    def test_cache_is_invalidated_on_commit(self):
+        get_user_settings(self.fresh_user())
+        key = user_settings_cache_key(self.user.pk)
+        version = get_list_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            set_cards_per_page(self.fresh_user(), 20)
+        self.assertIsNotNone(cache.get(key))
+        self.assertEqual(get_list_version(self.user.pk), version)
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(key))
+        self.assertGreater(get_list_version(self.user.pk), version)
+
+    def test_unchanged_settings_are_not_written(self):
+        user = self.fresh_user()
+        get_user_settings(user)
+        with self.assertNumQueries(0):
+            self.assertFalse(set_cards_per_page(user, 9))
+
+    @override_settings(TODO_SHARED_CACHE=False)
+    def test_cache_is_bypassed_unless_shared(self):
+        get_user_settings(self.fresh_user())
+        UserSettings.objects.filter(user=self.user).update(cards_per_page=30)
+        user = self.fresh_user()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_settings(user).cards_per_page, 30)
+
+    def test_list_view_writes_only_changed_settings(self):
+        self.client.force_login(self.user)
+        url = reverse("main")
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {"cards_per_page": 9})
+        self.assertFalse(any("UPDATE" in q["sql"] for q in queries.captured_queries))
+        self.client.get(url, {"cards_per_page": 12})
+        self.assertEqual(UserSettings.objects.get(user=self.user).cards_per_page, 12)
+
+
+class ListParametersTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        now = timezone.now()
+        create_todos(self.user, ["b"], published=now - timedelta(days=2))
+        create_todos(
+            self.user, ["c"], completed=True, published=now - timedelta(days=1)
+        )
+        create_todos(self.user, ["a"], published=now)
+        self.client.force_login(self.user)
+        self.url = reverse("main")
+
+    def get(self, **params):
+        # A rendered fragment, so the context is there.
+        cache.clear()
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def titles(self, response):
+        return [todo.title for todo in response.context["page_obj"]]
+
+    def test_unknown_status_and_sort_fall_back_to_the_defaults(self):
+        default = self.get()
+        for params in (
+            {"status": "archived", "sort": "priority"},
+            {"status": "", "sort": ""},
+            {"sort": "relevance"},
+        ):
+            with self.subTest(**params):
+                response = self.get(**params)
+                self.assertEqual(response.context["status"], "all")
+                self.assertEqual(response.context["sort"], "newest")
+                self.assertEqual(self.titles(response), ["a", "c", "b"])
+                self.assertEqual(
+                    response.context["list_params"], default.context["list_params"]
+                )
+
+    def test_known_status_and_sort(self):
+        response = self.get(status="pending", sort="title")
+        self.assertEqual(self.titles(response), ["a", "b"])
+        response = self.get(status="completed", sort="oldest")
+        self.assertEqual(self.titles(response), ["c"])
+
+    def links(self, response):
+        return [
+            unescape(href)
+            for href in re.findall(r'href="(\?[^"]*)"', response.content.decode())
+        ]
+
+    def test_pagination_links_keep_the_parameters(self):
+        response = self.get(cards_per_page=1, status="pending", sort="title", page=2)
+        self.assertEqual(self.titles(response), ["b"])
+        self.assertEqual(
+            self.links(response),
+            ["?page=1&cards_per_page=1&status=pending&sort=title"] * 2,
+        )
+
+    def test_cursor_links_keep_the_parameters(self):
+        with mock.patch.object(TodoListView, "pagination_mode", "keyset"):
+            response = self.get(cards_per_page=1, q="notes", status="pending")
+        [next_link] = self.links(response)
+        self.assertRegex(
+            next_link, r"^\?cursor=[\w-]+&cards_per_page=1&q=notes&status=pending$"
+        )
+
+    def test_bulk_actions_return_to_the_same_list(self):
+        response = self.get(cards_per_page=1, status="pending", sort="title", page=2)
+        next_url = f"{self.url}?cards_per_page=1&status=pending&sort=title&page=2"
+        self.assertContains(
+            response,
+            f'<input type="hidden" name="next" value="{escape(next_url)}">',
+            html=True,
+        )
+        todo = response.context["page_obj"][0]
+        response = self.client.post(
+            reverse("bulk_todos"),
+            {"action": "complete", "ids": todo.pk, "next": next_url},
+        )
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+
+
+class ListFragmentCacheTests(TodoTestCase):
+    fragment_template = "todo/list_fragment.html"
+
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.todo = create_todos(self.user, ["first"])[0]
+        self.client.force_login(self.user)
+        self.url = reverse("main")
+
+    def assertRendered(self, response, rendered=True):
+        if rendered:
+            self.assertTemplateUsed(response, self.fragment_template)
+        else:
+            self.assertTemplateNotUsed(response, self.fragment_template)
+
+    def test_fragment_is_reused(self):
+        self.assertRendered(self.client.get(self.url))
+        second = self.client.get(self.url)
+        self.assertRendered(second, False)
+        self.assertContains(second, "first notes")
+
+    def test_parameters_are_part_of_the_key(self):
+        self.client.get(self.url)
+        self.assertRendered(self.client.get(self.url, {"status": "completed"}))
+        self.assertRendered(self.client.get(self.url, {"sort": "title"}))
+
+    def test_writes_invalidate_the_fragment(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("create_todo"), {"title": "second", "description": "notes"}
+            )
+        response = self.client.get(self.url)
+        self.assertRendered(response)
+        self.assertContains(response, "second")
+
+        self.todo.title = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo.save()
+        self.assertContains(self.client.get(self.url), "renamed")
+
+    def test_list_version_is_bumped_on_commit(self):
+        version = get_list_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.todo.title = "renamed"
+            self.todo.save()
+            self.todo.delete()
+        self.assertEqual(get_list_version(self.user.pk), version)
+        self.assertRendered(self.client.get(self.url))
+        self.assertRendered(self.client.get(self.url), False)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_list_version(self.user.pk), version)
+        self.assertRendered(self.client.get(self.url))
+
+    def test_bulk_actions_invalidate_the_fragment(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            set_todos_completed(self.user, [self.todo.pk], True)
+        self.assertRendered(self.client.get(self.url))
+
+    def test_other_users_do_not_invalidate_the_fragment(self):
+        self.client.get(self.url)
+        create_todos(create_user("bob"), ["other"])
+        self.assertRendered(self.client.get(self.url), False)
+
+    def test_cache_is_disabled(self):
+        for overrides in ({"TODO_SHARED_CACHE": False}, {"TODO_LIST_CACHE_TIMEOUT": 0}):
+            with self.subTest(**overrides), override_settings(**overrides):
+                self.client.get(self.url)
+                self.assertRendered(self.client.get(self.url))
+
+
+class TodoCounterTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.other = create_user("bob")
+        get_todo_counter(self.user)
+
+    def assertCounts(self, total, completed, pending, user=None):
+        user = user or self.user
+        counter = TodoCounter.objects.get(user=user)
+        self.assertEqual(
+            (counter.total, counter.completed, counter.pending),
+            (total, completed, pending),
+        )
+        todos = Todo.objects.for_user(user)
+        self.assertEqual(
+            (todos.count(), todos.filter(completed=True).count()), (total, completed)
+        )
+
+    def test_missing_counter_is_recounted(self):
+        create_todos(self.other, ["a", "b"])
+        create_todos(self.other, ["c"], completed=True)
+        self.assertFalse(TodoCounter.objects.filter(user=self.other).exists())
+        counter = get_todo_counter(self.other)
+        self.assertEqual((counter.total, counter.completed, counter.pending), (3, 1, 2))
+
+    def test_signals(self):
+        todo, done = create_todos(self.user, ["a", "b"])
+        done.completed = True
+        done.save()
+        self.assertCounts(2, 1, 1)
+        todo.title = "renamed"
+        todo.save()
+        self.assertCounts(2, 1, 1)
+        done.delete()
+        self.assertCounts(1, 0, 1)
+
+    def test_signals_of_deferred_todos(self):
+        todo = create_todos(self.user, ["a"])[0]
+        deferred = Todo.objects.only("user", "title").get(pk=todo.pk)
+        deferred.completed = True
+        deferred.save()
+        self.assertCounts(1, 1, 0)
+        Todo.objects.only("user", "title").get(pk=todo.pk).delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_create_todos(self):
+        create_todos_in_bulk(
+            [
+                Todo(user=self.user, title="a", description="a"),
+                Todo(user=self.user, title="b", description="b", completed=True),
+                Todo(user=self.other, title="c", description="c"),
+            ]
+        )
+        self.assertCounts(2, 1, 1)
+
+    def test_update_todos(self):
+        create_todos(self.user, ["a", "b", "c"])
+        todos = list(Todo.objects.for_user(self.user).order_by("id"))
+        todos[0].completed = True
+        todos[1].completed = True
+        todos[2].title = "renamed"
+        update_todos(todos, ["completed", "title"])
+        self.assertCounts(3, 2, 1)
+        todos[0].completed = False
+        update_todos(todos, ["completed"])
+        self.assertCounts(3, 1, 2)
+
+    def test_set_todos_completed(self):
+        todos = create_todos(self.user, ["a", "b", "c"])
+        foreign = create_todos(self.other, ["d"])[0]
+        ids = [todos[0].pk, todos[1].pk, foreign.pk]
+        self.assertEqual(set_todos_completed(self.user, ids, True), 2)
+        self.assertEqual(set_todos_completed(self.user, ids, True), 0)
+        self.assertCounts(3, 2, 1)
+        self.assertFalse(Todo.objects.get(pk=foreign.pk).completed)
+        self.assertEqual(set_todos_completed(self.user, [todos[0].pk], False), 1)
+        self.assertCounts(3, 1, 2)
+
+    def test_delete_todos(self):
+        todos = create_todos(self.user, ["a", "b"]) + create_todos(
+            self.user, ["c"], completed=True
+        )
+        foreign = create_todos(self.other, ["d"])[0]
+        ids = [todos[0].pk, todos[2].pk, foreign.pk]
+        self.assertEqual(delete_todos(self.user, ids, chunk_size=2), 2)
+        self.assertCounts(1, 0, 1)
+        self.assertTrue(Todo.objects.filter(pk=foreign.pk).exists())
+
+
+class TodoApiTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = "/api/v1/todos/"
+        self.bulk_url = "/api/v1/todos/bulk/"
+
+    def test_list_pages_by_cursor(self):
+        create_todos(self.user, [f"todo {n}" for n in range(5)])
+        create_todos(create_user("bob"), ["other"])
+        first = self.client.get(self.url, {"page_size": 3}).json()
+        second = self.client.get(first["next"]).json()
+        titles = [item["title"] for item in first["results"] + second["results"]]
+        self.assertEqual(titles, [f"todo {n}" for n in reversed(range(5))])
+        self.assertIsNone(second["next"])
+        self.assertEqual(self.client.get(self.url, {"cursor": "x"}).status_code, 404)
+
+    def test_bulk_create(self):
+        response = self.client.post(
+            self.bulk_url,
+            [{"title": "a", "description": "a"}, {"title": "b", "description": "b"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item["title"] for item in response.json()], ["a", "b"])
+        self.assertEqual(get_todo_counter(self.user).total, 2)
+
+    def test_bulk_update(self):
+        todos = create_todos(self.user, ["a", "b"])
+        response = self.client.patch(
+            self.bulk_url,
+            [{"id": todos[0].pk, "completed": True}, {"id": todos[1].pk, "title": "c"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(Todo.objects.order_by("id").values_list("title", "completed")),
+            [("a", True), ("c", False)],
+        )
+
+    def test_bulk_update_of_unknown_todos_changes_nothing(self):
+        todo = create_todos(self.user, ["a"])[0]
+        foreign = create_todos(create_user("bob"), ["b"])[0]
+        response = self.client.patch(
+            self.bulk_url,
+            [{"id": todo.pk, "title": "x"}, {"id": foreign.pk, "title": "x"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Todo.objects.filter(title="x").exists())
+
+    def test_bulk_update_requires_ids(self):
+        response = self.client.patch(self.bulk_url, [{"title": "x"}], format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete(self):
+        todos = create_todos(self.user, ["a", "b"])
+        foreign = create_todos(create_user("bob"), ["c"])[0]
+        response = self.client.delete(
+            self.bulk_url, {"ids": [todos[0].pk, foreign.pk]}, format="json"
+        )
+        self.assertEqual(response.json(), {"deleted": 1})
+        self.assertEqual(Todo.objects.count(), 2)
+
+    @override_settings(TODO_API_BULK_LIMIT=2)
+    def test_bulk_limit_is_checked_before_validation(self):
+        invalid = [{"id": "x", "title": ""}] * 3
+        requests = [
+            (self.client.post, invalid),
+            (self.client.patch, invalid),
+            (self.client.delete, {"ids": ["x"] * 3}),
+        ]
+        for method, data in requests:
+            with self.subTest(method=method.__name__):
+                response = method(self.bulk_url, data, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), ["At most 2 items per request."])
+        self.assertEqual(
+            self.client.delete(
+                self.bulk_url, {"ids": [1, 2]}, format="json"
+            ).status_code,
+            200,
+        )
+
+    def test_api_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+class BulkActionTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.todos = create_todos(self.user, ["a", "b", "c"])
+        self.foreign = create_todos(create_user("bob"), ["d"])[0]
+        self.client.force_login(self.user)
+        self.url = reverse("bulk_todos")
+
+    def post(self, action, ids, **data):
+        return self.client.post(self.url, {"action": action, "ids": ids, **data})
+
+    def last_message(self, response):
+        # Messages are only consumed when a page renders them, so they pile up.
+        return [str(message) for message in get_messages(response.wsgi_request)][-1]
+
+    def completed(self):
+        return set(Todo.objects.filter(completed=True).values_list("title", flat=True))
+
+    def test_complete_and_reopen(self):
+        a, b, c = (todo.pk for todo in self.todos)
+        response = self.post("complete", [a, b, self.foreign.pk])
+        self.assertRedirects(response, reverse("main"), fetch_redirect_response=False)
+        self.assertEqual(self.last_message(response), "Completed 2 todo(s).")
+        self.assertEqual(self.completed(), {"a", "b"})
+        # Scripts may send the ids comma-separated.
+        response = self.post("reopen", f"{a},{c}")
+        self.assertEqual(self.last_message(response), "Reopened 1 todo(s).")
+        self.assertEqual(self.completed(), {"b"})
+
+    def test_delete(self):
+        ids = [todo.pk for todo in self.todos] + [self.foreign.pk]
+        response = self.post("delete", ids)
+        self.assertEqual(self.last_message(response), "Deleted 3 todo(s).")
+        self.assertEqual(list(Todo.objects.all()), [self.foreign])
+        self.assertEqual(get_todo_counter(self.user).total, 0)
+
+    def test_queries_do_not_grow_with_the_selection(self):
+        todos = create_todos(self.user, [f"todo {n}" for n in range(20)])
+        for action in ("complete", "delete"):
+            with self.subTest(action=action):
+                with CaptureQueriesContext(connection) as queries:
+                    self.post(action, [todo.pk for todo in todos])
+                writes = [
+                    q["sql"]
+                    for q in queries.captured_queries
+                    if q["sql"].startswith(("UPDATE", "DELETE"))
+                    and '"todo_app_todo"' in q["sql"]
+                ]
+                self.assertEqual(len(writes), 1, writes)
+
+    def test_invalid_requests_change_nothing(self):
+        ids_field = TodoBulkActionForm.base_fields["ids"]
+        with mock.patch.object(ids_field, "max_ids", 2):
+            response = self.post("complete", [todo.pk for todo in self.todos])
+        self.assertEqual(self.last_message(response), "Select at most 2 todos at once.")
+        self.assertEqual(
+            self.last_message(self.post("complete", "1,x")), "Invalid todo id."
+        )
+        self.assertEqual(
+            self.last_message(self.post("archive", self.todos[0].pk)),
+            "Select a valid choice. archive is not one of the available choices.",
+        )
+        self.assertEqual(self.completed(), set())
+
+    def test_redirects_to_safe_next_urls(self):
+        next_url = reverse("main") + "?page=2"
+        response = self.post("complete", self.todos[0].pk, next=next_url)
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+        response = self.post("complete", self.todos[0].pk, next="https://evil.test/")
+        self.assertRedirects(response, reverse("main"), fetch_redirect_response=False)
+
+    def test_login_required(self):
+        self.client.logout()
+        self.assertEqual(self.post("delete", self.todos[0].pk).status_code, 302)
+        self.assertEqual(Todo.objects.count(), 4)
+
+    def test_delete_without_signals(self):
+        # `delete_todos` deletes without `QuerySet.delete()`, which would cascade to
+        # rows referencing the todos. Nothing may reference them.
+        self.assertEqual(Todo._meta.related_objects, ())
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=Todo)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Todo)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(delete_todos(self.user, [self.todos[0].pk]), 1)
+        receiver.assert_not_called()
+        self.assertEqual(get_todo_counter(self.user).total, 2)
+
+
+class TransferTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        now = timezone.now().replace(microsecond=0)
+        create_todos(self.user, ["old"], published=now - timedelta(days=30))
+        create_todos(
+            self.user, ["done"], completed=True, published=now - timedelta(days=2)
+        )
+        create_todos(self.user, ['quoted, "title"'], published=now - timedelta(hours=1))
+        self.client.force_login(self.user)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def export(self, export_format):
+        response = self.client.get(reverse("export_todos"), {"format": export_format})
+        return b"".join(response.streaming_content)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def todos(self, user):
+        return list(
+            Todo.objects.for_user(user)
+            .order_by("published")
+            .values_list("title", "description", "completed", "published")
+        )
+
+    def assertCounts(self, user, total, completed):
+        counter = get_todo_counter(user)
+        self.assertEqual((counter.total, counter.completed), (total, completed))
+
+    def test_round_trip(self):
+        for export_format in ("ndjson", "csv"):
+            with self.subTest(export_format=export_format):
+                owner = create_user(f"owner-{export_format}")
+                get_todo_counter(owner)
+                path = self.write(f"todos.{export_format}", self.export(export_format))
+                call_command("import_todos", owner.username, path, stdout=io.StringIO())
+                self.assertEqual(self.todos(owner), self.todos(self.user))
+                self.assertCounts(owner, 3, 1)
+
+    def test_import_view_keeps_the_published_time(self):
+        upload = SimpleUploadedFile("todos.csv", self.export("csv"))
+        owner = create_user("bob")
+        self.client.force_login(owner)
+        self.client.post(reverse("import_todos"), {"file": upload})
+        self.assertEqual(self.todos(owner), self.todos(self.user))
+
+    def test_published_time_is_optional(self):
+        owner = create_user("bob")
+        path = self.write(
+            "todos.ndjson", b'{"title": "new", "description": "without a date"}\n'
+        )
+        started = timezone.now()
+        call_command("import_todos", "bob", path, stdout=io.StringIO())
+        self.assertGreaterEqual(Todo.objects.get(user=owner).published, started)
+
+    def test_invalid_records_are_skipped(self):
+        owner = create_user("bob")
+        path = self.write(
+            "todos.ndjson",
+            b"not json\n"
+            b'{"title": "dated", "description": "x", "published": "yesterday"}\n'
+            b'{"title": "kept", "description": "x", "completed": true}\n',
+        )
+        stderr = io.StringIO()
+        call_command("import_todos", "bob", path, stdout=io.StringIO(), stderr=stderr)
+        self.assertEqual([todo[0] for todo in self.todos(owner)], ["kept"])
+        self.assertIn("Line 1 skipped: Not a valid record.", stderr.getvalue())
+        self.assertIn("Line 2 skipped: published:", stderr.getvalue())
+
+    def test_malformed_file_imports_nothing(self):
+        owner = create_user("bob")
+        get_todo_counter(owner)
+        # The file is decoded in blocks, so the error has to come after the first.
+        valid = b"".join(
+            b'{"title": "todo %d", "description": "imported"}\n' % number
+            for number in range(500)
+        )
+        path = self.write(
+            "todos.ndjson", valid + b'{"title": "\xff", "description": "x"}\n'
+        )
+        with self.assertRaisesMessage(CommandError, "nothing was imported"):
+            call_command(
+                "import_todos", "bob", path, "--batch-size", "10", stdout=io.StringIO()
+            )
+        self.assertEqual(self.todos(owner), [])
+        self.assertCounts(owner, 0, 0)
+
+
+class ConditionalGetTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.todo = create_todos(self.user, ["first"])[0]
+        self.client.force_login(self.user)
+        self.url = reverse("main")
+
+    def test_list_validators(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(
+            any('"todo_app_todo"' in q["sql"] for q in queries.captured_queries)
+        )
+        modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, headers={"if-modified-since": modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_list_is_sent_again(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            create_todos(self.user, ["second"])
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertContains(response, "second")
+
+    def test_parameters_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(
+            self.url, {"status": "completed"}, headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_messages_are_rendered(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(
+            reverse("bulk_todos"), {"action": "reopen", "ids": self.todo.pk}
+        )
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertContains(response, "Reopened 0 todo(s).")
+
+    @override_settings(TODO_SHARED_CACHE=False)
+    def test_list_validators_need_a_shared_cache(self):
+        self.assertNotIn("ETag", self.client.get(self.url))
+
+    def test_edit_page(self):
+        url = reverse("edit_todo", args=[self.todo.pk])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.todo.title = "renamed"
+        self.todo.save()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "renamed")
+
+
+@skipUnless(
+    "replica1" in settings.DATABASES
+    and not settings.DATABASES["replica1"].get("TEST", {}).get("MIRROR"),
+    "needs a replica1 alias with its own connection (see test_settings.py)",
+)
+@override_settings(TODO_DB_REPLICAS=["replica1"], TODO_DB_REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    `replica1` is a second connection to the test database, so the tests see which
+    alias each query was sent to. The transactions of `TestCase` would hide the
+    data from the second connection.
+    """
+
+    databases = {"default", "replica1"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.todo = create_todos(self.user, ["first"])[0]
+        get_todo_counter(self.user)
+        self.client.force_login(self.user)
+        self.url = reverse("main")
+
+    def request(self, method, url, *args, **kwargs):
+        """
+        Returns the response and the SQL sent to each alias during the request.
+        """
+        with CaptureQueriesContext(
+            connections["default"]
+        ) as primary, CaptureQueriesContext(connections["replica1"]) as replica:
+            response = getattr(self.client, method)(url, *args, **kwargs)
+        return (
+            response,
+            [q["sql"] for q in primary.captured_queries],
+            [q["sql"] for q in replica.captured_queries],
+        )
+
+    def age_list(self):
+        """
+        Moves the list's last change out of the pin window.
+        """
+        cache.set(list_modified_key(self.user.pk), int(time.time()) - 60, None)
+
+    def test_safe_requests_read_from_the_replica(self):
+        response, primary, replica = self.request("get", self.url)
+        self.assertContains(response, "first")
+        self.assertEqual(primary, [])
+        self.assertTrue(any('"todo_app_todo"' in sql for sql in replica))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_writes_and_later_reads_use_the_primary(self):
+        response, primary, replica = self.request(
+            "post", reverse("create_todo"), {"title": "second", "description": "x"}
+        )
+        self.assertEqual(replica, [])
+        self.assertTrue(any(sql.startswith("INSERT") for sql in primary))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        # A GET that saves a setting reads the rest of its data from the primary.
+        self.client.cookies.pop(PIN_COOKIE)
+        response, primary, replica = self.request(
+            "get", self.url, {"cards_per_page": 20}
+        )
+        self.assertTrue(any(sql.startswith("UPDATE") for sql in primary))
+        self.assertTrue(any('"todo_app_todo"' in sql for sql in primary))
+        self.assertFalse(any('"todo_app_todo"' in sql for sql in replica))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_pinned_clients_read_from_the_primary(self):
+        self.request(
+            "post", reverse("create_todo"), {"title": "pinned", "description": "x"}
+        )
+        response, primary, replica = self.request("get", self.url)
+        self.assertEqual(replica, [])
+        self.assertContains(response, "pinned")
+
+    def test_forged_pins_are_ignored(self):
+        self.client.cookies[PIN_COOKIE] = str(int(time.time()) + 3600)
+        _, primary, replica = self.request("get", self.url)
+        self.assertEqual(primary, [])
+        self.assertNotEqual(replica, [])
+
+    def test_recent_changes_are_not_cached_from_the_replica(self):
+        bump_list_version(self.user.pk)
+        response, _, _ = self.request("get", self.url)
+        self.assertNotIn("ETag", response)
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "todo/list_fragment.html")
+
+        self.age_list()
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertIn("ETag", response)
+        self.assertTemplateNotUsed(response, "todo/list_fragment.html")
+
+
+class ProvisionUsersTests(TransactionTestCase):
+    """
+    `provision_users` closes the database connections before it starts its
+    hashing processes, which would end the transaction of a `TestCase`.
+    """
+
+    def provision(self, usernames):
+        items = [
+            (
+                number,
+                {
+                    "username": username,
+                    "email": f"{username.lower()}{number}@example.com",
+                },
+            )
+            for number, username in enumerate(usernames, start=1)
+        ]
+        return provision_users(items, processes=1)
+
+    def usernames(self):
+        return sorted(get_user_model().objects.values_list("username", flat=True))
+
+    def test_usernames_clash_case_insensitively(self):
+        create_user("alice")
+        result = self.provision(["Alice", "bob1", "Bob1", "carol"])
+        self.assertEqual((result.created, result.existing), (2, 2))
+        self.assertEqual(self.usernames(), ["alice", "bob1", "carol"])
+        self.assertEqual(UserSettings.objects.count(), 3)
+
+    def test_batch_is_checked_again_after_a_concurrent_signup(self):
+        untaken = provisioning._untaken
+
+        def check_then_sign_up(records):
+            result = untaken(records)
+            if not get_user_model().objects.filter(username="bob").exists():
+                create_user("bob")
+            return result
+
+        with mock.patch.object(provisioning, "_untaken", check_then_sign_up):
+            result = self.provision(["alice", "bob", "carol"])
+        self.assertEqual((result.created, result.existing), (2, 1))
+        self.assertEqual(self.usernames(), ["alice", "bob", "carol"])
+
+
+@override_settings(TODO_METRICS_TOKEN="scraper-token")
+class MetricsTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("metrics")
+
+    def assertReadable(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "todo_requests_total")
+
+    def test_other_requests_are_forbidden(self):
+        # The test client connects from 127.0.0.1, like a reverse proxy on the host.
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(create_user())
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        response = self.client.get(
+            self.url, headers={"authorization": "Bearer wrong-token"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(TODO_METRICS_TOKEN="")
+    def test_empty_token_is_not_accepted(self):
+        response = self.client.get(self.url, headers={"authorization": "Bearer "})
+        self.assertEqual(response.status_code, 403)
+
+    def test_bearer_token(self):
+        self.assertReadable(
+            self.client.get(self.url, headers={"authorization": "Bearer scraper-token"})
+        )
+
+    def test_staff_users(self):
+        user = create_user()
+        user.is_staff = True
+        user.save()
+        self.client.force_login(user)
+        self.assertReadable(self.client.get(self.url))
+
+    @override_settings(TODO_METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_allowed_ips(self):
+        self.assertReadable(self.client.get(self.url))
+
+
+@override_settings(
+    TODO_REQUEST_TIMING=False,
+    TODO_REQUEST_TIMING_SAMPLE_RATE=0,
+    TODO_SLOW_REQUEST_MS=0,
+    TODO_SLOW_QUERY_MS=0,
+    TODO_SLOW_LOG_SAMPLE_RATE=1,
+)
+class RequestTimingTests(TodoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        create_todos(self.user, ["first"])
+        self.client.force_login(self.user)
+        self.url = reverse("main")
+
+    def slow_clock(self):
+        """
+        Makes every reading of the timing clock half a second later than the last.
+        """
+        clock = mock.patch.object(timing, "time")
+        self.addCleanup(clock.stop)
+        clock.start().perf_counter.side_effect = itertools.count(0, 0.5)
+
+    def test_timing_is_off_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            timing.ServerTimingMiddleware(lambda request: None)
+        self.assertNotIn("Server-Timing", self.client.get(self.url))
+
+    @override_settings(TODO_REQUEST_TIMING=True)
+    def test_server_timing_header(self):
+        header = self.client.get(self.url)["Server-Timing"]
+        self.assertRegex(
+            header,
+            r'^db;dur=[\d.]+;desc="[1-9]\d* queries", tpl;dur=[\d.]+, '
+            r"view;dur=-?[\d.]+, total;dur=[\d.]+$",
+        )
+
+    @override_settings(TODO_SLOW_REQUEST_MS=1000)
+    def test_slow_requests_are_logged(self):
+        self.slow_clock()
+        with self.assertLogs("todo_app.slow_requests", "WARNING") as logs:
+            response = self.client.get(self.url)
+        self.assertNotIn("Server-Timing", response)
+        slow_request = logs.records[0].slow_request
+        self.assertEqual(slow_request["view"], "main")
+        self.assertEqual(slow_request["status"], 200)
+        self.assertGreaterEqual(slow_request["total_ms"], 1000)
+
+    @override_settings(TODO_SLOW_QUERY_MS=200)
+    def test_slow_queries_are_logged(self):
+        self.slow_clock()
+        with self.assertLogs("todo_app.slow_queries", "WARNING") as logs:
+            self.client.get(self.url)
+        self.assertEqual(logs.records[0].slow_query["path"], self.url)
+
+    @override_settings(
+        TODO_SLOW_REQUEST_MS=1000, TODO_SLOW_QUERY_MS=200, TODO_SLOW_LOG_SAMPLE_RATE=0
+    )
+    def test_slow_log_sample_rate(self):
+        self.slow_clock()
+        with self.assertNoLogs("todo_app.slow_requests"), self.assertNoLogs(
+            "todo_app.slow_queries"
+        ):
+            self.client.get(self.url)
+
+    @override_settings(TODO_REQUEST_TIMING=True, TODO_REQUEST_TIMING_REPEATED_QUERIES=3)
+    def test_repeated_queries_are_logged(self):
+        def get_response(request):
+            for todo in Todo.objects.filter(user=self.user):
+                for _ in range(3):
+                    get_user_model().objects.get(pk=todo.user_id)
+            return HttpResponse()
+
+        middleware = timing.ServerTimingMiddleware(get_response)
+        with self.assertLogs("todo_app.timing", "WARNING") as logs:
+            middleware(RequestFactory().get("/n-plus-one/"))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("ran the same query 3 times (possible N+1)", logs.output[0])
+        self.assertIn(
+            f'FROM "{get_user_model()._meta.db_table}"', logs.records[0].timing["sql"]
+        )
+
+        with self.assertNoLogs("todo_app.timing", "WARNING"):
+            timing.ServerTimingMiddleware(lambda request: HttpResponse())(
+                RequestFactory().get("/")
+            )
+
+    @override_settings(TODO_REQUEST_TIMING=True)
+    def test_timing_sample_rate(self):
+        with self.assertNoLogs("todo_app.timing"):
+            self.client.get(self.url)
+        with override_settings(TODO_REQUEST_TIMING_SAMPLE_RATE=1):
+            with self.assertLogs("todo_app.timing", "INFO") as logs:
+                self.client.get(self.url)
+        self.assertEqual(logs.records[0].timing["path"], self.url)
+
+
+class JsonLoggingTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.filename = os.path.join(self.directory.name, "logs", "todo.log")
+        self.handler = QueuedRotatingFileHandler(self.filename)
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger("todo_app.tests.json")
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def lines(self):
+        self.handler.stop_listener()
+        with open(self.filename, encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_records_are_written_as_json_lines(self):
+        self.logger.warning(
+            "Slow request (%.1f ms)", 1234.5, extra={"slow_request": {"view": "main"}}
+        )
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            self.logger.exception("Failed")
+        slow, failed = self.lines()
+        self.assertEqual(slow["level"], "WARNING")
+        self.assertEqual(slow["logger"], "todo_app.tests.json")
+        self.assertEqual(slow["message"], "Slow request (1234.5 ms)")
+        self.assertEqual(slow["slow_request"], {"view": "main"})
+        self.assertNotIn("exception", slow)
+        self.assertEqual(datetime.fromisoformat(slow["time"]).utcoffset(), timedelta(0))
+        self.assertEqual(failed["message"], "Failed")
+        self.assertIn("ZeroDivisionError", failed["exception"])
+
+    def test_unserializable_values_are_written_as_strings(self):
+        self.logger.error("Error", extra={"request": RequestFactory().get("/")})
+        self.assertEqual(self.lines()[0]["request"], "<WSGIRequest: GET '/'>")
+
+
+class AssetBundleTests(SimpleTestCase):
+    # A stand-in for the vendored stylesheets, in their minified and their
+    # readable form.
+    vendor_css = """
+    /*! Bootstrap v5.3.3 | MIT License */
+    /* Layout */
+    :root { --bs-gutter-x: 1.5rem; }
+    .card-title, .modal-title { margin-bottom: var(--bs-card-title-spacer-y); }
+    .page-link:not(.disabled):hover { z-index: 2; }
+    .alert-success { color: var(--bs-success-text-emphasis); }
+    .btn-outline-danger:focus-visible, .btn-check + .btn-outline-danger { box-shadow: none; }
+    .carousel-item { display: none; }
+    .fa-angle-double-left:before { content: "\\f100"; }
+    @media (min-width: 576px) {
+        .col { flex: 1 0 0%; }
+        .offcanvas-sm { position: fixed; }
+    }
+    @supports (position: sticky) { .sticky-lg-top { position: sticky; } }
+    .form-control { width: calc(100% - 2px); font-family: "Segoe UI", sans-serif; }
+    @font-face {
+        font-family: "Font Awesome 6 Free";
+        src: url(../webfonts/fa-solid-900.woff2) format("woff2"),
+             url(../webfonts/fa-solid-900.ttf) format("truetype");
+    }
+    @font-face { font-family: "Font Awesome 6 Brands"; src: url(../webfonts/fa-brands-400.woff2); }
+    """
+
+    def trimmed(self):
+        classes, prefixes = used_classes()
+        return serialize_css(
+            trim_css(parse_css(self.vendor_css), classes, prefixes, BUNDLE_FONTS)
+        )
+
+    def test_used_classes(self):
+        classes, prefixes = used_classes()
+        # Templates of both apps, and the widget attributes of forms.py.
+        for name in ("card-title", "page-link", "fa-angle-double-left", "form-control"):
+            self.assertIn(name, classes)
+        self.assertIn("alert-", prefixes)
+        self.assertNotIn("carousel-item", classes)
+
+    def test_selectors_used_by_the_templates_survive(self):
+        css = self.trimmed()
+        for kept in (
+            "/*! Bootstrap v5.3.3 | MIT License */",
+            ":root{--bs-gutter-x:1.5rem}",
+            ".card-title{",
+            ".page-link:not(.disabled):hover{",
+            ".alert-success{",
+            ".btn-outline-danger:focus-visible{",
+            "@media (min-width:576px){.col{flex:1 0 0%}}",
+            '.fa-angle-double-left:before{content:"\\f100"}',
+            'font-family:"Font Awesome 6 Free";'
+            'src:url(webfonts/fa-solid-900.woff2) format("woff2")}',
+        ):
+            self.assertIn(kept, css)
+        for dropped in (
+            "modal-title",
+            "btn-check",
+            "carousel-item",
+            "offcanvas-sm",
+            "@supports",
+            "fa-solid-900.ttf",
+            "Brands",
+        ):
+            self.assertNotIn(dropped, css)
+
+    def test_minified_output_is_smaller(self):
+        nodes = parse_css(self.vendor_css)
+        css = serialize_css(nodes)
+        self.assertLess(len(css), len(self.vendor_css))
+        self.assertNotIn("/* Layout */", css)
+        self.assertIn("calc(100% - 2px)", css)
+        self.assertIn('font-family:"Segoe UI",sans-serif', css)
+        # Minifying loses nothing: the output parses to the same rules.
+        self.assertEqual(serialize_css(parse_css(css)), css)
+        self.assertEqual(len(parse_css(css)), len(nodes))
+
+    def test_project_stylesheet_is_minified(self):
+        source = Path(finders.find("todo_app/css/main.css")).read_text()
+        css = serialize_css(parse_css(source))
+        self.assertLess(len(css), len(source))
+        self.assertEqual(serialize_css(parse_css(css)), css)
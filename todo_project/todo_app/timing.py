@@ -0,0 +1,368 @@
+"""
+Per-request instrumentation of SQL queries, template rendering and view time.
+
+When `settings.TODO_REQUEST_TIMING` is enabled, `ServerTimingMiddleware` measures
+every request and adds a `Server-Timing` header, which browsers show in the
+network panel:
+
+    Server-Timing: db;dur=4.1;desc="5 queries", tpl;dur=2.3, view;dur=1.2, total;dur=7.6
+
+- `db`: the time spent executing SQL, on every database connection.
+- `tpl`: the time spent rendering templates, minus the SQL run by lazy querysets
+  while rendering.
+- `view`: everything else: view code, middleware, cache round trips.
+
+A sample of the requests (`TODO_REQUEST_TIMING_SAMPLE_RATE`) is also logged to the
+`todo_app.timing` logger, and requests that run the same SQL shape (the statement
+with its literals and `IN` lists collapsed) `TODO_REQUEST_TIMING_REPEATED_QUERIES`
+times or more are always logged as a warning, as that is the mark of an N+1
+query pattern.
+
+Independently of the header, requests slower than `TODO_SLOW_REQUEST_MS` are
+logged to `todo_app.slow_requests` and SQL statements slower than
+`TODO_SLOW_QUERY_MS` to `todo_app.slow_queries` (each sampled by
+`TODO_SLOW_LOG_SAMPLE_RATE`), so the endpoints that breach their latency budget
+show up in the JSON log (see `todo_project/log.py`).
+
+Queries are recorded by a wrapper in every connection's `execute_wrappers` (see
+`install_query_recorder`), templates by `TimedDjangoTemplates`, which `settings.py`
+selects as the template backend only when instrumentation is enabled. Both find
+the current request's `RequestTimings` through a context variable, which also
+reaches the threads that run the async ORM. When timing and both slow logs are
+disabled the middleware removes itself from the chain (`MiddlewareNotUsed`) and
+neither hook is installed, so the cost is nil.
+"""
+
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+slow_request_logger = logging.getLogger("todo_app.slow_requests")
+slow_query_logger = logging.getLogger("todo_app.slow_queries")
+
+_current = ContextVar("request_timings", default=None)
+
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+SQL_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def sql_shape(sql):
+    """
+    Returns `sql` with its literals and parameters replaced by `?` and `IN` lists
+    collapsed, so the queries of an N+1 loop map to the same shape.
+    """
+    return SQL_IN_LIST.sub("(...)", SQL_LITERAL.sub("?", sql))
+
+
+def instrumentation_enabled():
+    """
+    Returns whether requests are measured: for the `Server-Timing` header or a slow log.
+    """
+    return bool(
+        settings.TODO_REQUEST_TIMING
+        or settings.TODO_SLOW_REQUEST_MS
+        or settings.TODO_SLOW_QUERY_MS
+    )
+
+
+def _sample_slow():
+    return random.random() < settings.TODO_SLOW_LOG_SAMPLE_RATE
+
+
+class RequestTimings:
+    """
+    The measurements of one request.
+
+    Attributes:
+        path (str): The request path.
+        started (float): `time.perf_counter()` at the start of the request.
+        queries (int): The number of SQL statements executed.
+        sql (float): The seconds spent executing them.
+        template (float): The seconds spent in top-level template renders.
+        template_sql (float): The part of `sql` executed while rendering templates.
+        template_depth (int): The nesting level of the renders in progress.
+        shapes (Counter): The number of statements per `sql_shape`, or `None` when
+                          N+1 detection (`TODO_REQUEST_TIMING`) is off.
+    """
+
+    __slots__ = (
+        "path",
+        "started",
+        "queries",
+        "sql",
+        "template",
+        "template_sql",
+        "template_depth",
+        "shapes",
+    )
+
+    def __init__(self, path="", count_shapes=True):
+        self.path = path
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql = self.template = self.template_sql = 0.0
+        self.template_depth = 0
+        self.shapes = Counter() if count_shapes else None
+
+    def summary(self):
+        """
+        Returns the durations of the request in milliseconds.
+
+        Returns:
+            dict: `queries`, `db_ms`, `template_ms`, `view_ms` and `total_ms`.
+        """
+        total = time.perf_counter() - self.started
+        template = self.template - self.template_sql
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.sql * 1000, 2),
+            "template_ms": round(template * 1000, 2),
+            "view_ms": round((total - self.sql - template) * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+        }
+
+    def repeated(self, threshold):
+        """
+        Returns `(shape, count)` for every SQL shape run at least `threshold` times.
+        """
+        if self.shapes is None:
+            return []
+        return [item for item in self.shapes.most_common() if item[1] >= threshold]
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    A database execute wrapper adding each statement to the current `RequestTimings`.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.queries += 1
+        timings.sql += elapsed
+        if timings.template_depth:
+            timings.template_sql += elapsed
+        if timings.shapes is not None:
+            timings.shapes[sql_shape(sql)] += 1
+        slow = settings.TODO_SLOW_QUERY_MS
+        if slow and elapsed * 1000 >= slow and _sample_slow():
+            slow_query_logger.warning(
+                "Slow query (%.1f ms) in %s: %s",
+                elapsed * 1000,
+                timings.path,
+                sql,
+                extra={
+                    "slow_query": {
+                        "ms": round(elapsed * 1000, 2),
+                        "path": timings.path,
+                        "sql": sql,
+                    }
+                },
+            )
+
+
+def install_query_recorder(connection, **kwargs):
+    """
+    Adds `record_query` to a connection's execute wrappers (a `connection_created` receiver).
+
+    The wrapper is inserted first: `connection.execute_wrapper()` blocks remove the
+    last wrapper when they exit, and a connection opened inside such a block must
+    not lose `record_query` instead.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def install_query_recorders():
+    """
+    Installs `record_query` on the open connections and on every new one.
+    """
+    connection_created.connect(install_query_recorder, dispatch_uid=__name__)
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+@contextmanager
+def measure(path, count_shapes=True):
+    """
+    Records the queries and template renders of the block in a new `RequestTimings`.
+
+    Queries are only recorded once `install_query_recorders()` was called.
+
+    Args:
+        path (str): The request path, for the slow query log.
+        count_shapes (bool): Whether to count SQL shapes for N+1 detection.
+
+    Yields:
+        RequestTimings: The measurements, complete when the block exits.
+    """
+    timings = RequestTimings(path, count_shapes)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current_timings():
+    """
+    Returns the `RequestTimings` of the request being measured, or `None`.
+    """
+    return _current.get()
+
+
+class TimedTemplate:
+    """
+    Wraps a template of the Django backend to time its `render()` calls.
+    """
+
+    def __init__(self, template):
+        self._wrapped = template
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return self._wrapped.render(context, request)
+        timings.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return self._wrapped.render(context, request)
+        finally:
+            timings.template_depth -= 1
+            if not timings.template_depth:
+                timings.template += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, with rendering time added to `RequestTimings`.
+
+    Only top-level renders are timed; `{% include %}` and renders nested in a
+    render count towards their parent.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class ServerTimingMiddleware:
+    """
+    Measures each request and reports it in a `Server-Timing` header and the logs.
+
+    It should come first in `MIDDLEWARE`, so the timings cover the other
+    middleware (session and user loading) too. See the module docstring.
+
+    Raises:
+        MiddlewareNotUsed: If `instrumentation_enabled()` is false.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not instrumentation_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_query_recorders()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with measure(request.path, settings.TODO_REQUEST_TIMING) as timings:
+            response = self.get_response(request)
+        self.report(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        with measure(request.path, settings.TODO_REQUEST_TIMING) as timings:
+            response = await self.get_response(request)
+        self.report(request, response, timings)
+        return response
+
+    def report(self, request, response, timings):
+        """
+        Adds the `Server-Timing` header and logs the request if it is slow, sampled
+        or shows an N+1 pattern.
+        """
+        summary = timings.summary()
+        slow = settings.TODO_SLOW_REQUEST_MS
+        if slow and summary["total_ms"] >= slow and _sample_slow():
+            match = request.resolver_match
+            slow_request_logger.warning(
+                "Slow request (%.1f ms): %s %s %s",
+                summary["total_ms"],
+                request.method,
+                request.path,
+                response.status_code,
+                extra={
+                    "slow_request": {
+                        **summary,
+                        "method": request.method,
+                        "path": request.path,
+                        "view": match.view_name if match else None,
+                        "status": response.status_code,
+                    }
+                },
+            )
+        if not settings.TODO_REQUEST_TIMING:
+            return
+        response["Server-Timing"] = (
+            f'db;dur={summary["db_ms"]};desc="{summary["queries"]} queries", '
+            f"tpl;dur={summary['template_ms']}, view;dur={summary['view_ms']}, "
+            f"total;dur={summary['total_ms']}"
+        )
+        repeated = timings.repeated(settings.TODO_REQUEST_TIMING_REPEATED_QUERIES)
+        sampled = random.random() < settings.TODO_REQUEST_TIMING_SAMPLE_RATE
+        if not (repeated or sampled):
+            return
+        message = (
+            "%s %s %s: %d queries in %.1f ms, templates %.1f ms, view %.1f ms, "
+            "total %.1f ms"
+        )
+        args = (
+            request.method,
+            request.path,
+            response.status_code,
+            summary["queries"],
+            summary["db_ms"],
+            summary["template_ms"],
+            summary["view_ms"],
+            summary["total_ms"],
+        )
+        extra = {"timing": {**summary, "path": request.path}}
+        if sampled:
+            logger.info(message, *args, extra=extra)
+        for shape, count in repeated:
+            logger.warning(
+                "%s %s ran the same query %d times (possible N+1): %s",
+                request.method,
+                request.path,
+                count,
+                shape,
+                extra={"timing": {**summary, "path": request.path, "sql": shape}},
+            )
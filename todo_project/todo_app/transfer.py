@@ -0,0 +1,186 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from .forms import TodoRecordForm
+from .models import Todo
+from .repository import create_todos
+
+EXPORT_FIELDS = ("title", "description", "completed", "published")
+FORMATS = ("ndjson", "csv")
+
+
+class _Echo:
+    """
+    A file-like object whose `write` returns the value, so `csv.writer` can be used
+    to format single rows for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _rows(queryset, chunk_size):
+    return (
+        queryset.order_by("-published", "-id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def export_ndjson(queryset, chunk_size=2000):
+    """
+    Yields the Todo items of `queryset` as newline-delimited JSON.
+
+    Rows are read with a chunked `iterator()`, so memory use does not depend on the
+    number of Todo items.
+
+    Args:
+        queryset (QuerySet): The Todo items to export.
+        chunk_size (int): The number of rows fetched from the database at a time.
+
+    Yields:
+        str: One JSON object per line.
+    """
+    for row in _rows(queryset, chunk_size):
+        item = dict(zip(EXPORT_FIELDS, row))
+        item["published"] = item["published"].isoformat()
+        yield json.dumps(item) + "\n"
+
+
+def export_csv(queryset, chunk_size=2000):
+    """
+    Yields the Todo items of `queryset` as CSV lines, starting with a header.
+
+    Args:
+        queryset (QuerySet): The Todo items to export.
+        chunk_size (int): The number of rows fetched from the database at a time.
+
+    Yields:
+        str: One CSV line at a time.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for title, description, completed, published in _rows(queryset, chunk_size):
+        yield writer.writerow((title, description, completed, published.isoformat()))
+
+
+def parse_ndjson(lines):
+    """
+    Parses newline-delimited JSON lazily.
+
+    Args:
+        lines (Iterable[str]): The lines of the document.
+
+    Yields:
+        tuple: `(line_number, item)`, where `item` is a dict or `None` if the line
+        is not a JSON object.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = None
+        yield number, item if isinstance(item, dict) else None
+
+
+def parse_csv(lines):
+    """
+    Parses a CSV document with a header row lazily.
+
+    Args:
+        lines (Iterable[str]): The lines of the document.
+
+    Yields:
+        tuple: `(line_number, item)`, where `item` maps header names to values.
+    """
+    reader = csv.DictReader(lines)
+    for item in reader:
+        yield reader.line_num, item
+
+
+def decode_lines(binary_file, encoding="utf-8-sig"):
+    """
+    Decodes a binary file (e.g. an upload) line by line without reading it whole.
+    """
+    return codecs.iterdecode(binary_file, encoding)
+
+
+@dataclass
+class ImportResult:
+    """
+    The outcome of `import_todos`.
+
+    Attributes:
+        created (int): The number of Todo items created.
+        errors (list): `(line_number, message)` pairs for the rejected lines.
+    """
+
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+
+def import_todos(user, items, batch_size=1000, max_errors=100):
+    """
+    Validates and inserts parsed Todo items in batches.
+
+    Every item is validated with `TodoRecordForm`, i.e. the same rules as the HTML
+    views (`TodoForm`'s lengths plus the `completed` flag). Valid items are inserted
+    with `repository.create_todos` every `batch_size` items, invalid ones are
+    reported in the result. An item's `published` time is kept when present, so an
+    export imports back with its dates; without it, the import time is used.
+
+    The batches are separate statements: callers run the import in a transaction
+    so that an error while reading the file does not leave part of it imported.
+
+    Args:
+        user (User): The owner of the imported Todo items.
+        items (Iterable[tuple]): `(line_number, item)` pairs from `parse_ndjson` or `parse_csv`.
+        batch_size (int): The number of Todo items per `bulk_create`.
+        max_errors (int): The number of errors kept in the result.
+
+    Returns:
+        ImportResult: The number of created Todo items and the rejected lines.
+    """
+    result = ImportResult()
+    batch = []
+    iterator = iter(items)
+    while chunk := list(islice(iterator, batch_size)):
+        for number, item in chunk:
+            if item is None:
+                error = "Not a valid record."
+            else:
+                form = TodoRecordForm(data=item)
+                if form.is_valid():
+                    todo = form.save(commit=False)
+                    todo.user = user
+                    batch.append((todo, form.cleaned_data["published"]))
+                    continue
+                error = "; ".join(
+                    f"{name}: {' '.join(messages)}"
+                    for name, messages in form.errors.items()
+                )
+            if len(result.errors) < max_errors:
+                result.errors.append((number, error))
+        if batch:
+            result.created += len(create_todos([todo for todo, _ in batch]))
+            _restore_published(batch)
+            batch = []
+    return result
+
+
+def _restore_published(batch):
+    # `auto_now_add` overwrites `published` on insert, so the exported times are
+    # written afterwards. `bulk_update` leaves `updated_at` alone, and the list
+    # version was already bumped by `create_todos`.
+    dated = []
+    for todo, published in batch:
+        if published is not None:
+            todo.published = published
+            dated.append(todo)
+    if dated:
+        Todo.objects.bulk_update(dated, ["published"])
@@ -1,11 +1,21 @@
+from django.conf import settings
 from django.urls import path
 
+from .async_views import (
+    AsyncTodoCreateView,
+    AsyncTodoDeleteView,
+    AsyncTodoListView,
+    AsyncTodoUpdateView,
+)
 from .views import (
     TodoListView,
     TodoCreateView,
     TodoUpdateView,
     TodoDeleteView,
     HomeView,
+    TodoExportView,
+    TodoImportView,
+    TodoBulkActionView,
 )
 
 """
@@ -41,11 +51,45 @@ Path Definitions:
     - View: `TodoDeleteView.as_view()`
     - Template: "todo/delete.html"
     - Purpose: Allows deleting a Todo item by its primary key (TodoDeleteView).
+6. **export**:
+    - Path: "/todo/export"
+    - View: `TodoExportView.as_view()`
+    - Purpose: Streams the user's Todo items as NDJSON or CSV (TodoExportView).
+7. **import**:
+    - Path: "/todo/import"
+    - View: `TodoImportView.as_view()`
+    - Template: "todo/import.html"
+    - Purpose: Imports Todo items from an uploaded NDJSON or CSV file (TodoImportView).
+8. **bulk**:
+    - Path: "/todo/bulk"
+    - View: `TodoBulkActionView.as_view()`
+    - Purpose: Completes, reopens or deletes the Todo items selected on the list (TodoBulkActionView).
+
+When `settings.TODO_ASYNC_VIEWS` is enabled (ASGI deployments), the main, create,
+edit and delete routes are served by the async variants from `async_views.py`.
 """
+if settings.TODO_ASYNC_VIEWS:
+    list_view, create_view, update_view, delete_view = (
+        AsyncTodoListView,
+        AsyncTodoCreateView,
+        AsyncTodoUpdateView,
+        AsyncTodoDeleteView,
+    )
+else:
+    list_view, create_view, update_view, delete_view = (
+        TodoListView,
+        TodoCreateView,
+        TodoUpdateView,
+        TodoDeleteView,
+    )
+
 urlpatterns = [
     path("home", HomeView.as_view(), name="home"),
-    path("", TodoListView.as_view(), name="main"),
-    path("todo/create", TodoCreateView.as_view(), name="create_todo"),
-    path("todo/edit/<pk>", TodoUpdateView.as_view(), name="edit_todo"),
-    path("todo/delete/<pk>", TodoDeleteView.as_view(), name="delete_todo"),
+    path("", list_view.as_view(), name="main"),
+    path("todo/create", create_view.as_view(), name="create_todo"),
+    path("todo/edit/<pk>", update_view.as_view(), name="edit_todo"),
+    path("todo/delete/<pk>", delete_view.as_view(), name="delete_todo"),
+    path("todo/export", TodoExportView.as_view(), name="export_todos"),
+    path("todo/import", TodoImportView.as_view(), name="import_todos"),
+    path("todo/bulk", TodoBulkActionView.as_view(), name="bulk_todos"),
 ]
@@ -1,15 +1,47 @@
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from django.urls import reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme, urlencode
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, View
 
-from .forms import TodoForm, TodoUpdateForm
-from .models import Todo, UserSettings
-from .repository import set_cards_per_page
-
+from .cache import (
+    get_list_fragment,
+    get_list_state,
+    list_fragment_key,
+    set_list_fragment,
+)
+from .cards import render_cards
+from .conditional import is_cacheable, not_modified, page_etag, set_validators
+from .forms import TodoBulkActionForm, TodoForm, TodoImportForm, TodoUpdateForm
+from .models import Todo
+from .pagination import CountedPaginator, KeysetPaginator
+from .replicas import may_be_stale
+from .repository import (
+    delete_todos,
+    get_todo_counter,
+    get_user_settings,
+    set_cards_per_page,
+    set_todos_completed,
+)
+from .search import search_todos
+from .transfer import (
+    decode_lines,
+    export_csv,
+    export_ndjson,
+    import_todos,
+    parse_csv,
+    parse_ndjson,
+)
 
 # Create your views here.
 
@@ -59,6 +91,24 @@ class TodoListView(LoginRequiredMixin, ListView):
     with pagination based on the number of items per page specified in their settings.
     The `cards_per_page` is fetched from the `UserSettings` model and used for pagination.
 
+    The navigation and cards are rendered from `todo/list_fragment.html` and cached per
+    user under the user's list version (see `cache.py`), so repeated views of an
+    unchanged list skip both the ORM query and the card rendering. When the fragment
+    is rendered, the cards of unchanged todos come from the card cache (`cards.py`).
+    The list version and its modification time also make the `ETag`/`Last-Modified`
+    of the page, so a client revalidating an unchanged list gets a `304 Not Modified`
+    before either runs.
+
+    Two pagination modes are supported (see `TODO_PAGINATION_MODE`): `"offset"` uses
+    Django's numbered `Paginator`, while `"keyset"` uses `KeysetPaginator` with opaque
+    `?cursor=` links, so deep pages cost the same as the first one.
+
+    The `?q=` GET parameter filters the list by full-text search (see `search.py`);
+    matches are ranked best first and paginated in either mode. `?status=` and
+    `?sort=` filter and order the list; both are checked against whitelists
+    (`status_filters`, `sort_orderings`) and every combination is served by one of
+    the `Todo.Meta.indexes`.
+
     Attributes:
         model (models.Model): The model that the view interacts with, which is `Todo`.
         template_name (str): The name of the template to render, `todo/list.html`.
@@ -67,12 +117,35 @@ class TodoListView(LoginRequiredMixin, ListView):
         context_object_name (str): The name of the context variable to use in the template, which is `todo_list`.
         form_class (forms.Form): The form class used to filter or create Todo items (`TodoForm`).
         cards_per_page (int): The number of Todo items to display per page (fetched from user settings).
+        pagination_mode (str): `"offset"` or `"keyset"`, defaults to `settings.TODO_PAGINATION_MODE`.
+        pagination_count (bool): Whether keyset pages also show the total count (`settings.TODO_PAGINATION_COUNT`).
+        status_filters (dict): Maps the allowed `status` values to queryset filters.
+        status_counts (dict): Maps the allowed `status` values to `TodoCounter` fields.
+        sort_orderings (dict): Maps the allowed `sort` values to orderings, each ending with the primary key
+                               so it can also serve as the keyset of keyset pagination.
+        search_ordering (tuple): The ordering of search results by relevance (`sort=relevance`, the default).
+        search_max_length (int): Search text is truncated to this many characters.
+        fragment_template_name (str): The template of the cached list fragment, `todo/list_fragment.html`.
+        fragment_cache_params (tuple): The GET parameters the cached fragment depends on.
 
     Methods:
-        get_queryset(): Returns a queryset of Todo items filtered by the current logged-in user.
+        get(request, *args, **kwargs): Serves the list fragment from the cache or renders and caches it.
+        check_not_modified(version, modified): Sets the fragment key and validators, returns a 304 if current.
+        fragment_is_current(): Returns whether a rendered fragment may be cached and validated.
+        list_response(fragment): Returns the list page around the fragment.
+        get_queryset(): Returns a queryset of Todo items filtered by the current logged-in user (and search).
+        get_search_query(): Returns the stripped `q` GET parameter.
+        get_status(): Returns the validated `status` GET parameter.
+        get_sort(): Returns the validated `sort` GET parameter.
+        get_ordering(): Returns the ordering (and keyset) for the current sort.
         get_data(): Retrieves the number of items per page from the GET request or user settings.
         get_paginate_by(queryset): Returns the number of items to display per page for pagination.
+        get_count(): Returns the number of Todo items (of the status) from the user's `TodoCounter`.
+        get_paginator(queryset, per_page, ...): Returns a `CountedPaginator` fed by `get_count()`.
+        paginate_queryset(queryset, page_size): Paginates by page number or by cursor, depending on the mode.
         get_context_data(object_list=None, **kwargs): Adds additional context (`cards_per_page`) to the template.
+        get_fragment_context(paginator, page, cards, **kwargs): Returns the fragment context of a page.
+        get_list_context(): Returns the list settings for the template, including the query string of the links.
     """
 
     model = Todo
@@ -81,21 +154,169 @@ class TodoListView(LoginRequiredMixin, ListView):
     context_object_name = "todo_list"
     form_class = TodoForm
     cards_per_page = None
+    pagination_mode = settings.TODO_PAGINATION_MODE
+    pagination_count = settings.TODO_PAGINATION_COUNT
+    status_filters = {
+        "all": {},
+        "pending": {"completed": False},
+        "completed": {"completed": True},
+    }
+    status_counts = {"all": "total", "pending": "pending", "completed": "completed"}
+    sort_orderings = {
+        "newest": ("-published", "-id"),
+        "oldest": ("published", "id"),
+        "title": ("title", "id"),
+    }
+    search_ordering = ("-rank", "-id")
+    search_max_length = 200
+    fragment_template_name = "todo/list_fragment.html"
+    fragment_cache_params = ("page", "cursor", "q", "status", "sort")
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handles GET requests, serving the list fragment from the cache when possible.
+
+        The fragment is keyed by the user's list version, the resolved page size and
+        the pagination parameters. If the client already has the page (matching
+        `If-None-Match`/`If-Modified-Since`), a 304 is returned right away. On a
+        cache miss the queryset is paginated and the fragment rendered and cached;
+        on a hit neither happens. The steps are split into `check_not_modified`,
+        `fragment_is_current` and `list_response`, which the async variant shares.
+
+        Args:
+            request (HttpRequest): The incoming request.
+            *args: Additional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            HttpResponse: The rendered list page.
+        """
+        self.cards_per_page = get_user_settings(request.user).cards_per_page
+        self.get_paginate_by(None)
+        if response := self.check_not_modified(*get_list_state(request.user.pk)):
+            return response
+        # The queryset is lazy: it is only evaluated when the fragment is rendered.
+        self.object_list = self.get_queryset()
+        fragment = get_list_fragment(self.fragment_key)
+        if fragment is None:
+            fragment = render_to_string(
+                self.fragment_template_name, self.get_context_data(), request
+            )
+            if self.fragment_is_current():
+                set_list_fragment(self.fragment_key, fragment)
+        return self.list_response(fragment)
+
+    def check_not_modified(self, version, modified):
+        """
+        Derives the fragment key and validators of the page from the list state.
+
+        Sets `fragment_key`, `etag` and `modified`. The `etag` is `None` when the
+        response is not conditional (see `conditional.is_cacheable`), and always
+        without `TODO_SHARED_CACHE`: the list version lives in the cache, so a worker
+        with its own cache would answer 304 for a list changed through another one.
+
+        Args:
+            version (int): The list version from `cache.get_list_state`.
+            modified (int): The time the list last changed, from the same call.
+
+        Returns:
+            HttpResponse: A 304 if the client's copy of the page is current, else `None`.
+        """
+        self.fragment_key = list_fragment_key(
+            self.request.user.pk,
+            version,
+            cards_per_page=self.cards_per_page,
+            mode=self.pagination_mode,
+            count=self.pagination_count,
+            **{name: self.request.GET.get(name) for name in self.fragment_cache_params},
+        )
+        self.modified = modified
+        self.etag = None
+        if settings.TODO_SHARED_CACHE and is_cacheable(self.request):
+            self.etag = page_etag(self.request, self.fragment_key)
+            return not_modified(self.request, self.etag, modified)
+        return None
+
+    def fragment_is_current(self):
+        """
+        Returns whether a freshly rendered fragment may be cached and validated.
+
+        A fragment read from a replica that may not have caught up with the latest
+        change of the list (`replicas.may_be_stale`) is neither cached nor sent with
+        validators, so the next request renders it again.
+        """
+        if may_be_stale(self.modified):
+            self.etag = None
+            return False
+        return True
+
+    def list_response(self, fragment):
+        """
+        Returns the list page around `fragment`, with validators if it is conditional.
+        """
+        response = render(
+            self.request, self.template_name, {"list_fragment": mark_safe(fragment)}
+        )
+        if self.etag:
+            set_validators(response, self.etag, self.modified)
+        return response
 
     def get_queryset(self):
         """
         Returns a queryset of Todo items for the current logged-in user.
 
-        This method fetches the `cards_per_page` setting from the `UserSettings` model
-        and filters the `Todo` items by the current user.
+        This method fetches the `cards_per_page` setting through
+        `repository.get_user_settings` (cached per user) and filters the `Todo` items
+        by the current user and the `status` filter. With a search query the items
+        are also filtered and ranked by `search.search_todos`. The queryset is ordered
+        by `get_ordering()`.
 
         Returns:
             QuerySet: A queryset of `Todo` items for the logged-in user.
         """
-        self.cards_per_page = UserSettings.objects.get(
-            user=self.request.user
-        ).cards_per_page
-        return Todo.objects.filter(user=self.request.user)
+        self.cards_per_page = get_user_settings(self.request.user).cards_per_page
+        queryset = (
+            Todo.objects.for_user(self.request.user)
+            .for_cards()
+            .filter(**self.status_filters[self.get_status()])
+        )
+        query = self.get_search_query()
+        if query:
+            queryset = search_todos(queryset, query)
+        return queryset.order_by(*self.get_ordering())
+
+    def get_search_query(self):
+        """
+        Returns the search text from the `q` GET parameter, or `""` for no search.
+        """
+        return self.request.GET.get("q", "")[: self.search_max_length].strip()
+
+    def get_status(self):
+        """
+        Returns the `status` GET parameter, or `"all"` if it is missing or unknown.
+        """
+        status = self.request.GET.get("status")
+        return status if status in self.status_filters else "all"
+
+    def get_sort(self):
+        """
+        Returns the `sort` GET parameter if it is allowed, otherwise the default:
+        `"relevance"` for search results and `"newest"` for the plain list.
+        """
+        sort = self.request.GET.get("sort")
+        searching = bool(self.get_search_query())
+        if sort in self.sort_orderings or (sort == "relevance" and searching):
+            return sort
+        return "relevance" if searching else "newest"
+
+    def get_ordering(self):
+        """
+        Returns the ordering of the list, which is also the keyset of keyset pages.
+        """
+        sort = self.get_sort()
+        if sort == "relevance":
+            return self.search_ordering
+        return self.sort_orderings[sort]
 
     def get_data(self):
         """
@@ -125,7 +346,7 @@ class TodoListView(LoginRequiredMixin, ListView):
 
         This method is used by Django to determine the number of items displayed per
         page in the paginated list of `Todo` items. It fetches the value from the GET
-        request or uses the user settings.
+        request or uses the user settings, and stores it only if it changed.
 
         Args:
             queryset (QuerySet): The queryset to paginate.
@@ -137,12 +358,75 @@ class TodoListView(LoginRequiredMixin, ListView):
         set_cards_per_page(self.request.user, self.cards_per_page)
         return self.cards_per_page
 
+    def get_count(self):
+        """
+        Returns the number of Todo items being paginated.
+
+        The value comes from the denormalized `TodoCounter` of the user (the field
+        matching the `status` filter), which replaces a `COUNT(*)` over the user's
+        Todo items. Search results are not counted there, so `None` is returned and
+        the paginator counts them.
+
+        Returns:
+            int: The number of Todo items, or `None` if unknown.
+        """
+        if self.get_search_query():
+            return None
+        counter = get_todo_counter(self.request.user)
+        return getattr(counter, self.status_counts[self.get_status()])
+
+    def get_paginator(
+        self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs
+    ):
+        """
+        Returns a `CountedPaginator` whose count comes from `get_count()`.
+        """
+        return CountedPaginator(
+            queryset,
+            per_page,
+            count=self.get_count(),
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            **kwargs,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginates the queryset according to `pagination_mode`.
+
+        In `"offset"` mode this defers to `ListView`. In `"keyset"` mode the page is
+        located by the opaque `cursor` GET parameter, and an invalid cursor results
+        in a 404 just like an invalid page number.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            page_size (int): The number of items per page.
+
+        Returns:
+            tuple: `(paginator, page, object_list, is_paginated)`.
+        """
+        if self.pagination_mode != "keyset":
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_ordering(),
+            with_count=self.pagination_count,
+            count=self.get_count() if self.pagination_count else None,
+        )
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, *, object_list=None, **kwargs):
         """
         Adds additional context to the template.
 
         This method adds the `cards_per_page` value to the context, so it can be
-        used in the template to display the number of items per page.
+        used in the template to display the number of items per page, and the
+        rendered `cards` of the page (see `cards.render_cards`).
 
         Args:
             object_list (QuerySet): A list of the objects being paginated.
@@ -151,9 +435,70 @@ class TodoListView(LoginRequiredMixin, ListView):
         Returns:
             dict: A dictionary containing the context data, including `cards_per_page`.
         """
-        context = super().get_context_data(**kwargs)
-        context["cards_per_page"] = self.cards_per_page
-        return context
+        queryset = self.object_list if object_list is None else object_list
+        paginator, page, _, _ = self.paginate_queryset(
+            queryset, self.get_paginate_by(queryset)
+        )
+        return self.get_fragment_context(
+            paginator, page, render_cards(page.object_list), **kwargs
+        )
+
+    def get_fragment_context(self, paginator, page, cards, **kwargs):
+        """
+        Returns the context of the list fragment for a page and its rendered cards.
+
+        Args:
+            paginator (Paginator): The paginator of the list.
+            page (Page): The current page.
+            cards (str): The rendered cards of the page.
+            **kwargs: Additional context data.
+
+        Returns:
+            dict: The `ListView` context plus `cards` and `get_list_context()`.
+        """
+        return {
+            "view": self,
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": page.object_list,
+            self.context_object_name: page.object_list,
+            "cards": cards,
+            **self.get_list_context(),
+            **kwargs,
+        }
+
+    def get_list_context(self):
+        """
+        Returns the list settings the template needs besides the page itself.
+
+        `list_params` is the query string that the pagination links append to
+        `page`/`cursor`, so they keep the page size, search, filter and sort.
+
+        Returns:
+            dict: `cards_per_page`, `pagination_mode`, `search_query`, `status`,
+                  `sort` and `list_params`.
+        """
+        query, status, sort = (
+            self.get_search_query(),
+            self.get_status(),
+            self.get_sort(),
+        )
+        params = {"cards_per_page": self.cards_per_page}
+        if query:
+            params["q"] = query
+        if status != "all":
+            params["status"] = status
+        if sort != ("relevance" if query else "newest"):
+            params["sort"] = sort
+        return {
+            "cards_per_page": self.cards_per_page,
+            "pagination_mode": self.pagination_mode,
+            "search_query": query,
+            "status": status,
+            "sort": sort,
+            "list_params": urlencode(params),
+        }
 
 
 @method_decorator(login_required, name="dispatch")
@@ -204,12 +549,31 @@ class TodoUpdateView(UpdateView):
     form_class = TodoUpdateForm
     success_url = reverse_lazy("main")
 
+    def get(self, request, *args, **kwargs):
+        """
+        Handles GET requests, answering with a 304 if the client's copy is current.
+
+        The validators come from the todo's `updated_at`, so the form is only
+        rendered when the todo changed since the client's copy.
+        """
+        self.object = self.get_object()
+        conditional = is_cacheable(request)
+        if conditional:
+            etag = page_etag(request, "todo", self.object.pk, self.object.updated_at)
+            modified = int(self.object.updated_at.timestamp())
+            if response := not_modified(request, etag, modified):
+                return response
+        response = self.render_to_response(self.get_context_data())
+        if conditional:
+            set_validators(response, etag, modified)
+        return response
+
     def get_queryset(self):
-        return Todo.objects.filter(user=self.request.user)
+        return Todo.objects.for_user(self.request.user).for_edit()
 
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        if obj.user != self.request.user:
+        if obj.user_id != self.request.user.pk:
             raise PermissionDenied(
                 "Forbidden. You you have no permission to update this todo."
             )
@@ -219,17 +583,16 @@ class TodoUpdateView(UpdateView):
 @method_decorator(login_required, name="dispatch")
 class TodoDeleteView(DeleteView):
     """
-    A view for updating a Todo item for an authenticated user.
+    A view for deleting a Todo item for an authenticated user.
 
-    This view allows an authenticated user to update an existing Todo item.
-    Only the user who created the Todo item is allowed to update it. If any other
-    user tries to update the Todo item, a `PermissionDenied` error will be raised.
+    This view allows an authenticated user to delete an existing Todo item.
+    Only the user who created the Todo item is allowed to delete it. If any other
+    user tries to delete the Todo item, a `PermissionDenied` error will be raised.
 
     Attributes:
         model (models.Model): The model that the view interacts with, which is `Todo`.
-        template_name (str): The name of the template to render, `todo/update.html`.
-        form_class (forms.Form): The form class used to update an existing Todo item (`TodoUpdateForm`).
-        success_url (str): The URL to redirect to after the form is successfully submitted,
+        template_name (str): The name of the template to render, `todo/delete.html`.
+        success_url (str): The URL to redirect to after the Todo item is deleted,
                             which is the main page (`reverse_lazy("main")`).
 
     Methods:
@@ -246,12 +609,12 @@ class TodoDeleteView(DeleteView):
         Returns a queryset of Todo items for the current logged-in user.
 
         This method filters the Todo items to only include those belonging to
-        the current user.
+        the current user, loading only the fields the page and the delete signals use.
 
         Returns:
             QuerySet: A queryset of `Todo` items for the logged-in user.
         """
-        return Todo.objects.filter(user=self.request.user)
+        return Todo.objects.for_user(self.request.user).for_edit()
 
     def get_object(self, queryset=None):
         """
@@ -270,8 +633,174 @@ class TodoDeleteView(DeleteView):
             PermissionDenied: If the user does not have permission to update the item.
         """
         obj = super().get_object(queryset)
-        if obj.user != self.request.user:
+        if obj.user_id != self.request.user.pk:
             raise PermissionDenied(
                 "Forbidden. You you have no permission to update this todo."
             )
         return obj
+
+
+@method_decorator(login_required, name="dispatch")
+class TodoBulkActionView(View):
+    """
+    A view applying complete, reopen or delete to many Todo items in one request.
+
+    The selected ids are posted from the checkboxes of the Todo list. The action runs
+    as one `UPDATE`/`DELETE ... WHERE user_id = ? AND id IN (...)` per chunk of ids
+    (see `repository.set_todos_completed` and `repository.delete_todos`), so ownership
+    is enforced in SQL: ids of other users' Todo items are simply not matched.
+
+    Attributes:
+        form_class (forms.Form): The form validating the action and ids (`TodoBulkActionForm`).
+        success_url (str): The URL to redirect to when no safe `next` URL is posted.
+        messages (dict): The success message of each action.
+
+    Methods:
+        post(request): Applies the action and redirects back to the list.
+        get_success_url(): Returns the posted `next` URL if it is safe, else `success_url`.
+    """
+
+    form_class = TodoBulkActionForm
+    success_url = reverse_lazy("main")
+    messages = {
+        "complete": "Completed {count} todo(s).",
+        "reopen": "Reopened {count} todo(s).",
+        "delete": "Deleted {count} todo(s).",
+    }
+
+    def post(self, request):
+        """
+        Applies the posted action to the posted ids, then redirects back to the list.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            HttpResponseRedirect: A redirect to the list the form was posted from.
+        """
+        form = self.form_class(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect(self.get_success_url())
+        action, ids = form.cleaned_data["action"], form.cleaned_data["ids"]
+        if action == "delete":
+            count = delete_todos(request.user, ids)
+        else:
+            count = set_todos_completed(request.user, ids, action == "complete")
+        messages.success(request, self.messages[action].format(count=count))
+        return redirect(self.get_success_url())
+
+    def get_success_url(self):
+        next_url = self.request.POST.get("next")
+        if next_url and url_has_allowed_host_and_scheme(
+            next_url,
+            allowed_hosts={self.request.get_host()},
+            require_https=self.request.is_secure(),
+        ):
+            return next_url
+        return str(self.success_url)
+
+
+@method_decorator(login_required, name="dispatch")
+class TodoExportView(View):
+    """
+    A view for downloading all Todo items of the authenticated user.
+
+    The response is streamed from a chunked `iterator()`, so memory use stays flat
+    however many Todo items are exported.
+
+    Attributes:
+        exporters (dict): Maps the `format` GET parameter to an exporter and content type.
+
+    Methods:
+        get(request): Streams the Todo items as NDJSON (default) or CSV.
+    """
+
+    exporters = {
+        "ndjson": (export_ndjson, "application/x-ndjson"),
+        "csv": (export_csv, "text/csv"),
+    }
+
+    def get(self, request):
+        """
+        Streams the user's Todo items in the requested format.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            StreamingHttpResponse: The Todo items as a file attachment.
+        """
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in self.exporters:
+            raise Http404("Unknown export format.")
+        exporter, content_type = self.exporters[export_format]
+        response = StreamingHttpResponse(
+            exporter(Todo.objects.for_user(request.user)),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="todos.{export_format}"'
+        )
+        return response
+
+
+@method_decorator(login_required, name="dispatch")
+class TodoImportView(View):
+    """
+    A view for importing Todo items from an uploaded NDJSON or CSV file.
+
+    The upload is parsed line by line and inserted with batched `bulk_create` in one
+    transaction; every record is validated with the same rules as `TodoForm`.
+
+    Attributes:
+        template_name (str): The name of the template to render, `todo/import.html`.
+        form_class (forms.Form): The upload form (`TodoImportForm`).
+        success_url (str): The URL to redirect to after an import, the main page.
+
+    Methods:
+        get(request): Renders the upload form.
+        post(request): Imports the uploaded file and reports the result as messages.
+    """
+
+    template_name = "todo/import.html"
+    form_class = TodoImportForm
+    success_url = reverse_lazy("main")
+    parsers = {"ndjson": parse_ndjson, "csv": parse_csv}
+
+    def get(self, request):
+        """
+        Renders the upload form.
+        """
+        return render(request, self.template_name, {"form": self.form_class()})
+
+    def post(self, request):
+        """
+        Imports the uploaded file, then redirects to the Todo list.
+
+        Args:
+            request (HttpRequest): The POST request with the uploaded file.
+
+        Returns:
+            HttpResponse: A redirect to the main page, or the form with errors.
+        """
+        form = self.form_class(request.POST, request.FILES)
+        if not form.is_valid():
+            return render(request, self.template_name, {"form": form})
+        parser = self.parsers[form.cleaned_data["format"]]
+        try:
+            # A decoding error can surface after earlier batches were inserted; the
+            # transaction rolls them back so the file is rejected as a whole.
+            with transaction.atomic():
+                result = import_todos(
+                    request.user, parser(decode_lines(form.cleaned_data["file"]))
+                )
+        except UnicodeDecodeError:
+            form.add_error("file", "The file must be UTF-8 encoded.")
+            return render(request, self.template_name, {"form": form})
+        messages.success(request, f"Imported {result.created} todos.")
+        for number, error in result.errors[:10]:
+            messages.warning(request, f"Line {number} skipped: {error}")
+        return redirect(self.success_url)
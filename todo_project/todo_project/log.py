@@ -0,0 +1,119 @@
+"""
+Logging handlers and formatters used by `settings.LOGGING`.
+
+Log records are written as JSON lines to a size-rotated file by a background
+thread: request threads only put records on an in-memory queue
+(`QueuedRotatingFileHandler`), so disk I/O and rotation never delay a response.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+
+# The attributes every `LogRecord` has; anything else was passed with `extra=`.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line.
+
+    The object has `time` (UTC, ISO 8601), `level`, `logger` and `message`, plus
+    `exception` with the traceback if there was one, and every attribute passed
+    with `extra=` (e.g. `timing` from `todo_app.timing`). Values that are not
+    JSON serializable (such as the `request` Django attaches to its errors) are
+    written as their `str()`.
+    """
+
+    def format(self, record):
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        for name, value in vars(record).items():
+            if name not in RECORD_ATTRIBUTES:
+                payload[name] = value
+        return json.dumps(payload, default=str)
+
+
+class QueuedRotatingFileHandler(QueueHandler):
+    """
+    Queues records for a background thread that writes them as JSON lines.
+
+    The thread (a `QueueListener`) owns a `RotatingFileHandler`; the handler
+    itself only enqueues, which never blocks. The listener is started with the
+    handler, restarted in processes forked afterwards (e.g. `gunicorn --preload`
+    workers, which do not inherit threads), and flushed at exit.
+
+    Rotation is per process: with several worker processes on one file, give
+    each its own `filename` or rely on an external rotation.
+
+    Args:
+        filename (str): The log file; its directory is created if needed.
+        maxBytes (int): Rotate when the file would exceed this size.
+        backupCount (int): The number of rotated files kept.
+        level (int): The minimum level enqueued.
+    """
+
+    def __init__(self, filename, maxBytes=10 * 1024 * 1024, backupCount=5, level=0):
+        super().__init__(SimpleQueue())
+        self.setLevel(level)
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self.target = RotatingFileHandler(
+            filename,
+            maxBytes=maxBytes,
+            backupCount=backupCount,
+            encoding="utf-8",
+            delay=True,
+        )
+        self.target.setFormatter(JsonFormatter())
+        self.start_listener()
+        atexit.register(self.stop_listener)
+        os.register_at_fork(after_in_child=self.restart_in_child)
+
+    def start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def stop_listener(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def restart_in_child(self):
+        # The parent's listener thread does not exist in the child, and the queue
+        # may have been forked mid-operation, so both are replaced.
+        self.queue = SimpleQueue()
+        self.start_listener()
+
+    def prepare(self, record):
+        """
+        Returns a copy of `record` that is safe to format on the listener thread.
+
+        Unlike `QueueHandler.prepare`, the message is not pre-formatted with the
+        traceback, so the JSON keeps `message` and `exception` apart, and the
+        `extra=` attributes are kept.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        self.stop_listener()
+        self.target.close()
+        super().close()
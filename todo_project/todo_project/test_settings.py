@@ -0,0 +1,54 @@
+"""
+Django settings for the test suite.
+
+Run the tests with:
+
+    python manage.py test --settings=todo_project.test_settings
+
+They extend `settings.py` with an SQLite database, so the suite needs neither
+PostgreSQL nor the `DATABASE_*` variables. `replica1` is a second connection to
+the same test database: it is not in `TODO_DB_REPLICAS` (so nothing is routed to
+it) until a test enables it with `override_settings`, and then the queries of each
+alias can be told apart.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+for name in (
+    "DATABASE_NAME",
+    "DATABASE_USER",
+    "DATABASE_PASSWORD",
+    "DATABASE_HOST",
+    "DATABASE_PORT",
+):
+    os.environ.setdefault(name, "")
+
+from .settings import *  # noqa: E402,F401,F403
+
+TEST_DATABASE = os.path.join(tempfile.gettempdir(), "todo_test.sqlite3")
+
+DATABASES = {
+    alias: {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": TEST_DATABASE,
+        "TEST": {"NAME": TEST_DATABASE},
+    }
+    for alias in ("default", "replica1")
+}
+TODO_DB_REPLICA_URLS = []
+TODO_DB_REPLICAS = []
+
+# One process serves every request of a test.
+TODO_SHARED_CACHE = True
+
+# Templates link static files without a `collectstatic` manifest.
+STORAGES = {
+    **STORAGES,  # noqa: F405
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
@@ -3,6 +3,8 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
 
+from todo_app.metrics import metrics_view
+
 """
 URL patterns for the project, including routes for the admin interface and 
 third-party apps (e.g., Todo and authentication).
@@ -19,11 +21,17 @@ Path Definitions:
     - /: Includes the URL patterns from the `todo_app` application (todo_app.urls).
 3. **main**:
     - /app_auth/: Includes the URL patterns from the `app_auth` application (app_auth.urls).
-4. **MEDIA_URL**:
+4. **api**:
+    - /api/v1/: Includes version 1 of the JSON API (todo_app.api_urls).
+5. **metrics**:
+    - /internal/metrics: Prometheus metrics, for staff, allowed IPs or the scraper token (todo_app.metrics).
+6. **MEDIA_URL**:
     - MEDIA_URL: Serves media files during development using Django's static files handler.
 """
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("todo_app.urls")),
     path("app_auth/", include("app_auth.urls")),
+    path("api/v1/", include("todo_app.api_urls")),
+    path("internal/metrics", metrics_view, name="metrics"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)